@@ -0,0 +1,144 @@
+import json
+import re
+import time
+from pathlib import Path
+
+import numpy as np
+
+SAMPLE_RATE = 16000
+
+# (model, compute_type, beam_size), most accurate first. Ties in measured WER keep this order.
+CPU_CANDIDATES = [
+    ("large-v3", "int8", 5),
+    ("large-v3-turbo", "int8", 5),
+    ("Systran/faster-distil-whisper-large-v3", "int8", 5),
+    ("Systran/faster-distil-whisper-large-v3", "int8", 1),
+    ("medium.en", "int8", 1),
+    ("small.en", "int8", 1),
+    ("base.en", "int8", 1),
+]
+CUDA_CANDIDATES = [
+    ("large-v3", "float16", 5),
+    ("large-v3", "int8_float16", 5),
+    ("large-v3-turbo", "float16", 5),
+    ("large-v3-turbo", "int8_float16", 1),
+    ("Systran/faster-distil-whisper-large-v3", "int8_float16", 1),
+    ("small.en", "int8_float16", 1),
+]
+
+
+def _words(s: str) -> list[str]:
+    return re.sub(r"[^a-z0-9'\- ]+", " ", (s or "").lower()).split()
+
+
+def word_error_rate(reference: str, hypothesis: str) -> float:
+    """Word-level Levenshtein distance divided by the reference length."""
+    ref, hyp = _words(reference), _words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+    prev = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        cur = [i] + [0] * len(hyp)
+        for j, h in enumerate(hyp, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (r != h))
+        prev = cur
+    return prev[-1] / len(ref)
+
+
+def pick_config(results: list[dict], target_rtf: float = 1.0, headroom: float = 0.3) -> dict | None:
+    """Most accurate result whose real-time factor stays under target_rtf * (1 - headroom).
+
+    `results` are in candidate order; a result without "wer" (no reference text) ranks by
+    that order alone. If nothing is fast enough, the fastest config is returned.
+    """
+    ok = [r for r in results if r.get("rtf") is not None]
+    if not ok:
+        return None
+    limit = target_rtf * (1.0 - headroom)
+    fast = [r for r in ok if r["rtf"] <= limit]
+    if not fast:
+        return min(ok, key=lambda r: r["rtf"])
+    return min(fast, key=lambda r: (r.get("wer", 0.0), results.index(r)))
+
+
+def load_asr_config(path: Path) -> dict:
+    """Calibrated ASR settings, or {} if the file is missing or unreadable."""
+    try:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def save_asr_config(path: Path, cfg: dict) -> None:
+    path = Path(path)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(json.dumps(cfg, indent=2) + "\n", encoding="utf-8")
+    tmp.replace(path)
+
+
+def benchmark(model_id: str, device: str, compute_type: str, beam_size: int,
+              audio: np.ndarray, reference: str | None = None, cpu_threads: int = 0) -> dict:
+    """Time one transcription of `audio` (after a short warm-up) and score it against `reference`.
+
+    cpu_threads is passed to WhisperModel as-is (0 = faster-whisper's default); measure with
+    the count the live pipeline will use, or the RTF does not describe it.
+    """
+    from faster_whisper import WhisperModel
+
+    result = {"model": model_id, "device": device, "compute_type": compute_type, "beam_size": beam_size,
+              "cpu_threads": cpu_threads}
+    try:
+        model = WhisperModel(model_id, device=device, compute_type=compute_type, cpu_threads=cpu_threads)
+        list(model.transcribe(audio[:5 * SAMPLE_RATE], language="en", beam_size=beam_size)[0])
+
+        t0 = time.perf_counter()
+        segments, _info = model.transcribe(audio, language="en", vad_filter=True, beam_size=beam_size)
+        text = " ".join(s.text.strip() for s in segments).strip()
+        elapsed = time.perf_counter() - t0
+    except Exception as e:
+        result["error"] = str(e)
+        result["rtf"] = None
+        return result
+
+    result["rtf"] = elapsed / (len(audio) / SAMPLE_RATE)
+    result["text"] = text
+    if reference is not None:
+        result["wer"] = word_error_rate(reference, text)
+    return result
+
+
+def calibrate(clip_path: Path, device: str, reference_path: Path | None = None,
+              target_rtf: float = 1.0, headroom: float = 0.3,
+              candidates: list[tuple[str, str, int]] | None = None, cpu_threads: int = 0) -> dict | None:
+    """Benchmark every candidate on the reference clip and return the chosen config."""
+    from faster_whisper import decode_audio
+
+    audio = decode_audio(str(clip_path), sampling_rate=SAMPLE_RATE)
+    reference = None
+    if reference_path is not None and Path(reference_path).exists():
+        reference = Path(reference_path).read_text(encoding="utf-8")
+    if candidates is None:
+        candidates = CUDA_CANDIDATES if device == "cuda" else CPU_CANDIDATES
+
+    print(f"[Calibrate] Clip: {clip_path} ({len(audio) / SAMPLE_RATE:.1f}s), "
+          f"reference text: {'yes' if reference is not None else 'no'}, "
+          f"target RTF <= {target_rtf * (1 - headroom):.2f}, cpu_threads={cpu_threads or 'default'}")
+    results = []
+    for model_id, compute_type, beam_size in candidates:
+        r = benchmark(model_id, device, compute_type, beam_size, audio, reference, cpu_threads=cpu_threads)
+        results.append(r)
+        if r["rtf"] is None:
+            print(f"[Calibrate] {model_id} {compute_type} beam={beam_size}: failed ({r['error']})")
+        else:
+            wer = f" WER {r['wer']:.1%}" if "wer" in r else ""
+            print(f"[Calibrate] {model_id} {compute_type} beam={beam_size}: RTF {r['rtf']:.2f}{wer}")
+
+    best = pick_config(results, target_rtf, headroom)
+    if best is None:
+        return None
+    cfg = {k: best[k] for k in ("model", "device", "compute_type", "beam_size", "cpu_threads", "rtf")}
+    if "wer" in best:
+        cfg["wer"] = best["wer"]
+    cfg["calibrated_at"] = time.strftime("%Y-%m-%d %H:%M:%S")
+    return cfg
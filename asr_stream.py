@@ -0,0 +1,90 @@
+import re
+
+# A word is (start_sec, end_sec, text) in absolute stream time.
+Word = tuple[float, float, str]
+
+
+def _norm(w: str) -> str:
+    return re.sub(r"[^A-Za-z0-9']+", "", w).lower()
+
+
+class HypothesisBuffer:
+    """LocalAgreement-2 commit policy for re-decoding a growing audio buffer.
+
+    Each insert() takes the words of the latest decode. The longest prefix that
+    agrees with the previous decode is committed and never revised; the rest stays
+    tentative until the next decode confirms or replaces it.
+    """
+
+    def __init__(self, ngram_max: int = 5):
+        self.ngram_max = ngram_max
+        self.committed_end = 0.0          # end time of the last committed word
+        self.committed: list[Word] = []   # recent committed words (for n-gram dedupe)
+        self.tentative: list[Word] = []
+
+    def reset(self, at: float = 0.0) -> None:
+        self.committed_end = at
+        self.committed = []
+        self.tentative = []
+
+    def insert(self, words: list[Word]) -> list[Word]:
+        # Words that start inside the committed region were already emitted
+        new = [w for w in words if w[0] > self.committed_end - 0.1]
+
+        # The decoder often re-emits the last committed word(s) right at the boundary
+        if new and self.committed and abs(new[0][0] - self.committed_end) < 1.0:
+            for n in range(min(self.ngram_max, len(self.committed), len(new)), 0, -1):
+                tail = [_norm(w[2]) for w in self.committed[-n:]]
+                head = [_norm(w[2]) for w in new[:n]]
+                if tail == head:
+                    new = new[n:]
+                    break
+
+        commit: list[Word] = []
+        prev = self.tentative
+        i = 0
+        while i < len(new) and i < len(prev) and _norm(new[i][2]) == _norm(prev[i][2]):
+            commit.append(new[i])
+            i += 1
+
+        if commit:
+            self.committed_end = commit[-1][1]
+            self.committed = (self.committed + commit)[-self.ngram_max:]
+        self.tentative = new[i:]
+        return commit
+
+    def flush(self) -> list[Word]:
+        """Commit whatever is still tentative (end of utterance)."""
+        out = self.tentative
+        if out:
+            self.committed_end = out[-1][1]
+            self.committed = (self.committed + out)[-self.ngram_max:]
+        self.tentative = []
+        return out
+
+
+def words_text(words: list[Word]) -> str:
+    return " ".join(w[2].strip() for w in words if w[2].strip())
+
+
+class LatencyReport:
+    """Collects latency samples (seconds) and summarizes them on demand."""
+
+    def __init__(self, max_samples: int = 2000):
+        self.max_samples = max_samples
+        self.samples: list[float] = []
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        if len(self.samples) > self.max_samples:
+            del self.samples[:len(self.samples) - self.max_samples]
+
+    def summary(self) -> str:
+        if not self.samples:
+            return "no samples"
+        s = sorted(self.samples)
+
+        def pct(p):
+            return s[min(len(s) - 1, int(p / 100.0 * len(s)))]
+
+        return f"n={len(s)} p50={pct(50):.2f}s p95={pct(95):.2f}s max={s[-1]:.2f}s"
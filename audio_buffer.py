@@ -0,0 +1,107 @@
+import threading
+
+import numpy as np
+
+
+class AudioRingBuffer:
+    """Fixed-capacity float32 ring buffer for one writer thread and one reader thread.
+
+    Samples are addressed by absolute index (0 = first sample ever written). Storage
+    is mirrored (every sample is written at i and i + capacity), so any retained
+    range of up to `capacity` samples is available as a contiguous zero-copy view.
+
+    write() only copies into preallocated storage, so it is safe to call from the
+    PortAudio callback. If the reader falls behind, the oldest unread samples are
+    overwritten and counted in dropped_samples.
+    """
+
+    def __init__(self, capacity: int):
+        self.capacity = int(capacity)
+        if self.capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self._buf = np.zeros(2 * self.capacity, dtype=np.float32)
+        self._written = 0  # absolute number of samples ever written
+        self._read = 0     # absolute index of the next unread sample
+        self._floor = 0    # samples before this index were discarded by clear()
+        self.dropped_samples = 0
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+
+    @property
+    def write_index(self) -> int:
+        return self._written
+
+    @property
+    def read_index(self) -> int:
+        return self._read
+
+    @property
+    def oldest_index(self) -> int:
+        """Absolute index of the oldest sample still retained (read or unread)."""
+        return max(self._written - self.capacity, self._floor)
+
+    def available(self) -> int:
+        with self._lock:
+            return self._written - self._read
+
+    def write(self, x: np.ndarray) -> None:
+        n = len(x)
+        if n == 0:
+            return
+        with self._lock:
+            if n > self.capacity:
+                # Only the newest `capacity` samples can be kept; the rest count as dropped below.
+                self._written += n - self.capacity
+                x = x[-self.capacity:]
+                n = self.capacity
+            cap = self.capacity
+            pos = self._written % cap
+            first = min(n, cap - pos)
+            self._buf[pos:pos + first] = x[:first]
+            self._buf[pos + cap:pos + cap + first] = x[:first]
+            if first < n:
+                self._buf[:n - first] = x[first:]
+                self._buf[cap:cap + n - first] = x[first:]
+            self._written += n
+            oldest = self._written - cap
+            if self._read < oldest:
+                self.dropped_samples += oldest - self._read
+                self._read = oldest
+        self._ready.set()
+
+    def view(self, start: int, stop: int) -> np.ndarray:
+        """Zero-copy view of absolute samples [start, stop).
+
+        The view aliases the ring storage: use it before the next write() from the
+        same thread, or copy it.
+        """
+        if start < self.oldest_index or stop > self._written or start > stop:
+            raise ValueError(
+                f"range [{start}, {stop}) not retained (have [{self.oldest_index}, {self._written}))"
+            )
+        pos = start % self.capacity
+        return self._buf[pos:pos + (stop - start)]
+
+    def advance(self, n: int) -> None:
+        """Mark n unread samples as consumed (they stay available to view() until overwritten)."""
+        with self._lock:
+            self._read = min(self._read + int(n), self._written)
+
+    def clear(self) -> None:
+        """Discard everything written so far, including history kept for view()."""
+        with self._lock:
+            self._read = self._written
+            self._floor = self._written
+
+    def read(self, n: int, timeout: float | None = None) -> np.ndarray | None:
+        """Block until n samples are unread, then return a copy of them (None on timeout)."""
+        n = min(int(n), self.capacity)
+        while True:
+            with self._lock:
+                if self._written - self._read >= n:
+                    out = self.view(self._read, self._read + n).copy()
+                    self._read += n
+                    return out
+                self._ready.clear()
+            if not self._ready.wait(timeout):
+                return None
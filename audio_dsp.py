@@ -0,0 +1,185 @@
+import numpy as np
+
+# One-pole recurrences are evaluated IIR_SLICE samples at a time as a matrix-vector
+# product, which keeps every power of the pole <= 1 (numerically stable) and the
+# cached kernel small enough to stay in cache.
+IIR_SLICE = 128
+
+
+class OnePoleIIR:
+    """Vectorized y[n] = pole * y[n-1] + u[n] with the last output carried between blocks."""
+
+    def __init__(self, pole: float, slice_len: int = IIR_SLICE):
+        self.pole = float(pole)
+        k = np.arange(slice_len)
+        lag = k[:, None] - k[None, :]
+        self._kernel = np.where(lag >= 0, self.pole ** np.maximum(lag, 0), 0.0)
+        self._decay = self.pole ** (k + 1.0)
+
+    def run(self, u: np.ndarray, y_prev: float) -> tuple[np.ndarray, float]:
+        u = np.asarray(u, dtype=np.float64)
+        y = np.empty_like(u)
+        step = len(self._decay)
+        for s in range(0, len(u), step):
+            seg = u[s:s + step]
+            n = len(seg)
+            y[s:s + n] = self._kernel[:n, :n] @ seg + self._decay[:n] * y_prev
+            y_prev = y[s + n - 1]
+        return y, float(y_prev)
+
+
+def _delayed(x: np.ndarray, x_prev: float) -> np.ndarray:
+    d = np.empty(len(x), dtype=np.float64)
+    if len(x):
+        d[0] = x_prev
+        d[1:] = x[:-1]
+    return d
+
+
+def pre_emphasis(x: np.ndarray, coeff: float, x_prev: float) -> tuple[np.ndarray, float]:
+    """y[n] = x[n] - coeff * x[n-1]. Returns (y, new x_prev)."""
+    if not len(x):
+        return x, x_prev
+    y = x - coeff * _delayed(x, x_prev)
+    return y.astype(x.dtype, copy=False), float(x[-1])
+
+
+def high_pass(x: np.ndarray, iir: OnePoleIIR, y_prev: float, x_prev: float) -> tuple[np.ndarray, float, float]:
+    """RC high-pass y[n] = a * (y[n-1] + x[n] - x[n-1]) where a = iir.pole.
+
+    Returns (y, new y_prev, new x_prev).
+    """
+    if not len(x):
+        return x, y_prev, x_prev
+    u = iir.pole * (x - _delayed(x, x_prev))
+    y, y_prev = iir.run(u, y_prev)
+    return y.astype(x.dtype, copy=False), y_prev, float(x[-1])
+
+
+def low_pass(x: np.ndarray, iir: OnePoleIIR, b: float, y_prev: float) -> tuple[np.ndarray, float]:
+    """RC low-pass y[n] = y[n-1] + b * (x[n] - y[n-1]) where iir.pole == 1 - b.
+
+    Returns (y, new y_prev).
+    """
+    if not len(x):
+        return x, y_prev
+    y, y_prev = iir.run(b * np.asarray(x, dtype=np.float64), y_prev)
+    return y.astype(x.dtype, copy=False), y_prev
+
+
+def frame_rms(x: np.ndarray, frame: int) -> np.ndarray:
+    """RMS of each `frame`-sample slice of x (a short tail forms its own frame)."""
+    n_full = len(x) // frame
+    sq = x * x
+    ms = sq[:n_full * frame].reshape(n_full, frame).mean(axis=1)
+    if len(x) > n_full * frame:
+        ms = np.append(ms, sq[n_full * frame:].mean())
+    return np.sqrt(ms + 1e-12)
+
+
+def apply_frame_gain(x: np.ndarray, gain: np.ndarray, frame: int) -> np.ndarray:
+    """Scale each `frame`-sample slice of x by the matching entry of gain."""
+    return x * np.repeat(gain.astype(x.dtype), frame)[:len(x)]
+
+
+class EnergyVAD:
+    """Cheap frame-energy speech detector with a slowly adapting noise floor.
+
+    A frame counts as speech when its RMS exceeds both `threshold` and
+    `ratio` x the running noise floor (tracked from the quietest frames).
+    """
+
+    def __init__(self, sr: int, frame_sec: float = 0.03, threshold: float = 0.01,
+                 ratio: float = 3.0, min_speech_sec: float = 0.15, floor_rise_sec: float = 20.0):
+        self.frame = max(1, int(sr * frame_sec))
+        self.threshold = threshold
+        self.ratio = ratio
+        self.min_speech_frames = max(1, int(round(min_speech_sec / frame_sec)))
+        # Per-frame smoothing for upward floor moves (time constant floor_rise_sec)
+        self.floor_alpha = 1.0 - float(np.exp(-frame_sec / floor_rise_sec))
+        self.noise_floor = 0.0
+
+    def speech_frames(self, x: np.ndarray) -> np.ndarray:
+        """Boolean speech flag per `frame`-sample slice of x (updates the noise floor)."""
+        if not len(x):
+            return np.zeros(0, dtype=bool)
+        rms = frame_rms(x, self.frame)
+        speech = rms > max(self.threshold, self.noise_floor * self.ratio)
+        # Minimum-statistics floor: drop straight to a quieter level, creep up slowly.
+        low = float(np.percentile(rms, 10))
+        if low < self.noise_floor:
+            self.noise_floor = low
+        else:
+            rise = 1.0 - (1.0 - self.floor_alpha) ** len(rms)
+            self.noise_floor += rise * (low - self.noise_floor)
+        return speech
+
+    def has_speech(self, x: np.ndarray) -> bool:
+        return int(self.speech_frames(x).sum()) >= self.min_speech_frames
+
+
+class TransmissionSegmenter:
+    """Split a continuous feed into radio transmissions (key-ups) using EnergyVAD frames.
+
+    feed() takes consecutive audio blocks and returns the absolute sample ranges
+    [start, end) of transmissions that closed during that block: either the
+    channel went quiet for `tail_sec` (squelch tail / energy drop) or the
+    transmission reached `max_sec`. Bursts with less speech than the VAD's
+    min_speech_sec (squelch clicks, static pops) are dropped.
+    """
+
+    def __init__(self, vad: EnergyVAD, sr: int, tail_sec: float = 0.8,
+                 max_sec: float = 30.0, preroll_sec: float = 0.2):
+        self.vad = vad
+        self.frame = vad.frame
+        self.tail = int(tail_sec * sr)
+        self.max_len = int(max_sec * sr)
+        self.preroll = int(preroll_sec * sr)
+        self.pos = 0                  # absolute index of the next sample fed
+        self.start: int | None = None
+        self.speech_end = 0
+        self.speech_frames = 0
+        self._last_end = 0
+        self._partial = np.zeros(0, dtype=np.float32)
+
+    @property
+    def active(self) -> bool:
+        return self.start is not None
+
+    def _close(self, end: int, out: list[tuple[int, int]]) -> None:
+        if self.speech_frames >= self.vad.min_speech_frames:
+            out.append((self.start, end))
+        self._last_end = end
+        self.start = None
+        self.speech_frames = 0
+
+    def feed(self, x: np.ndarray) -> list[tuple[int, int]]:
+        if len(self._partial):
+            x = np.concatenate([self._partial, x])
+        n_full = len(x) // self.frame * self.frame
+        self._partial = x[n_full:].copy()
+        out: list[tuple[int, int]] = []
+        if not n_full:
+            return out
+
+        for is_speech in self.vad.speech_frames(x[:n_full]):
+            f_start = self.pos
+            self.pos += self.frame
+            if is_speech:
+                if self.start is None:
+                    self.start = max(self._last_end, f_start - self.preroll)
+                self.speech_end = self.pos
+                self.speech_frames += 1
+            elif self.start is not None and self.pos - self.speech_end >= self.tail:
+                self._close(self.speech_end, out)
+                continue
+            if self.start is not None and self.pos + self.frame - self.start > self.max_len:
+                self._close(self.pos, out)
+        return out
+
+    def flush(self) -> list[tuple[int, int]]:
+        """Close a transmission still in progress (e.g. at end of input)."""
+        out: list[tuple[int, int]] = []
+        if self.start is not None:
+            self._close(self.speech_end, out)
+        return out
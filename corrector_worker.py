@@ -0,0 +1,224 @@
+"""LocalCorrector hosted in its own process.
+
+The parent talks to `python corrector_worker.py` over stdin/stdout, one JSON object per line:
+  -> {"id": 7, "texts": [...], "deadline": <epoch seconds>}
+  <- {"id": 7, "out": [...]} | {"id": 7, "expired": true} | {"id": 7, "error": "..."}
+The worker announces {"ready": true, "backend": "..."} (or {"error": "..."}) once the
+model is loaded. Requests whose deadline passed while queued are answered "expired"
+without running the model, so a backlog drains instead of growing.
+
+--corrector names the class hosted ("module:Class", default local_corrector:LocalCorrector);
+anything with LocalCorrector's constructor, correct_batch(), cache and decode_stats() works.
+"""
+import argparse
+import importlib
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+
+def parse_cpus(spec: str) -> set[int]:
+    """'2,3' or '4-7' or '0,2-3' -> set of CPU indexes."""
+    cpus: set[int] = set()
+    for part in (spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            lo, hi = part.split("-", 1)
+            cpus.update(range(int(lo), int(hi) + 1))
+        else:
+            cpus.add(int(part))
+    return cpus
+
+
+def thread_env(threads: int) -> dict[str, str]:
+    """Environment that caps the math libraries' thread pools (read when they load)."""
+    n = str(max(1, threads))
+    return {"OMP_NUM_THREADS": n, "MKL_NUM_THREADS": n, "OPENBLAS_NUM_THREADS": n}
+
+
+class CorrectorProcess:
+    """Parent-side handle: same correct_batch() as LocalCorrector, run in a child process.
+
+    At most max_pending requests are in flight; correct_batch() gives up after `timeout`
+    seconds and returns its inputs unchanged, as does every call once the worker has died.
+    With start_timeout=None the constructor returns at once and calls return their inputs
+    until the worker has loaded the model; `ready` resolves with its hello (or the error).
+    """
+
+    def __init__(self, model_dir: str, backend: str = "auto", cache_size: int = 2048, max_batch: int = 16,
+                 threads: int = 1, cpus: str = "", timeout: float = 1.5, max_pending: int = 4,
+                 start_timeout: float | None = 180.0, decoding: str = "tiered",
+                 corrector: str = "local_corrector:LocalCorrector"):
+        self.timeout = timeout
+        self.backend = backend
+        self.timeouts = 0
+        self.rejected = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self._decode_stats: dict = {}
+        self._next_id = 0
+        self._pending: dict[int, Future] = {}
+        self._slots = threading.BoundedSemaphore(max(1, max_pending))
+        self._lock = threading.Lock()
+        self.ready: Future = Future()
+        self.alive = False
+        self._closed = False
+
+        cmd = [
+            sys.executable, "-u", str(Path(__file__).resolve()),
+            "--model-dir", model_dir, "--backend", backend, "--cache-size", str(cache_size),
+            "--max-batch", str(max_batch), "--threads", str(threads), "--cpus", cpus,
+            "--decoding", decoding, "--corrector", corrector,
+        ]
+        self.proc = subprocess.Popen(
+            cmd, stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True, encoding="utf-8",
+            env={**os.environ, **thread_env(threads)},
+        )
+        threading.Thread(target=self._read_loop, name="corrector-reader", daemon=True).start()
+        if start_timeout is not None:
+            try:
+                self.ready.result(timeout=start_timeout)
+            except Exception:
+                self.close()
+                raise
+
+    def _read_loop(self) -> None:
+        for line in self.proc.stdout:
+            try:
+                msg = json.loads(line)
+            except ValueError:
+                continue
+            if "id" not in msg:
+                if msg.get("ready"):
+                    self.backend = msg.get("backend", self.backend)
+                    self.alive = not self._closed
+                    self.ready.set_result(msg)
+                else:
+                    self.ready.set_exception(RuntimeError(msg.get("error", "worker failed to start")))
+                continue
+            with self._lock:
+                fut = self._pending.pop(msg["id"], None)
+            self.cache_hits = msg.get("cache_hits", self.cache_hits)
+            self.cache_misses = msg.get("cache_misses", self.cache_misses)
+            self._decode_stats = msg.get("decode", self._decode_stats)
+            if fut is None:
+                continue
+            if "out" in msg:
+                fut.set_result(msg["out"])
+            else:
+                fut.set_exception(RuntimeError(msg.get("error", "request expired")))
+
+        # stdout closed: the worker is gone
+        self.alive = False
+        if not self.ready.done():
+            self.ready.set_exception(RuntimeError(f"worker exited with code {self.proc.wait()}"))
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        for fut in pending.values():
+            fut.set_exception(RuntimeError("corrector worker exited"))
+
+    def correct_batch(self, raws: list[str]) -> list[str]:
+        if not self.alive or not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            return list(raws)
+        try:
+            fut: Future = Future()
+            with self._lock:
+                self._next_id += 1
+                req_id = self._next_id
+                self._pending[req_id] = fut
+            req = {"id": req_id, "texts": list(raws), "deadline": time.time() + self.timeout}
+            try:
+                self.proc.stdin.write(json.dumps(req) + "\n")
+                self.proc.stdin.flush()
+            except (OSError, ValueError):
+                self.alive = False
+                return list(raws)
+            try:
+                return fut.result(timeout=self.timeout)
+            except Exception:
+                self.timeouts += 1
+                with self._lock:
+                    self._pending.pop(req_id, None)
+                return list(raws)
+        finally:
+            self._slots.release()
+
+    def decode_stats(self) -> dict:
+        """LocalCorrector.decode_stats() as of the worker's latest reply."""
+        return dict(self._decode_stats)
+
+    def close(self) -> None:
+        self._closed = True
+        self.alive = False
+        try:
+            self.proc.stdin.close()
+            self.proc.wait(timeout=5)
+        except Exception:
+            self.proc.kill()
+
+
+def serve(args) -> None:
+    # Protocol lines own the real stdout; anything the libraries print goes to stderr
+    out = sys.stdout
+    sys.stdout = sys.stderr
+
+    def send(msg: dict) -> None:
+        out.write(json.dumps(msg) + "\n")
+        out.flush()
+
+    cpus = parse_cpus(args.cpus)
+    if cpus and hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, cpus)
+
+    try:
+        module, _, name = args.corrector.partition(":")
+        corrector_cls = getattr(importlib.import_module(module), name or "LocalCorrector")
+        corrector = corrector_cls(
+            model_dir=args.model_dir, cache_size=args.cache_size, max_batch=args.max_batch,
+            backend=args.backend, threads=args.threads, decoding=args.decoding,
+        )
+    except Exception as e:
+        send({"error": str(e)})
+        return
+    print(f"[CorrectorWorker] {args.model_dir} ({corrector.backend}), {args.threads} threads"
+          f"{f', cpus {sorted(cpus)}' if cpus else ''}")
+    send({"ready": True, "backend": corrector.backend})
+
+    for line in sys.stdin:
+        try:
+            req = json.loads(line)
+        except ValueError:
+            continue
+        resp = {"id": req.get("id")}
+        if time.time() > req.get("deadline", float("inf")):
+            resp["expired"] = True
+        else:
+            try:
+                resp["out"] = corrector.correct_batch(req["texts"])
+            except Exception as e:
+                resp["error"] = str(e)
+        resp["cache_hits"] = corrector.cache.hits
+        resp["cache_misses"] = corrector.cache.misses
+        resp["decode"] = corrector.decode_stats()
+        send(resp)
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--model-dir", required=True)
+    ap.add_argument("--backend", default="auto")
+    ap.add_argument("--cache-size", type=int, default=2048)
+    ap.add_argument("--max-batch", type=int, default=16)
+    ap.add_argument("--threads", type=int, default=1)
+    ap.add_argument("--cpus", default="")
+    ap.add_argument("--decoding", default="tiered")
+    ap.add_argument("--corrector", default="local_corrector:LocalCorrector")
+    serve(ap.parse_args())
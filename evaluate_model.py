@@ -1,5 +1,7 @@
+import argparse
 import json
 import re
+import time
 from pathlib import Path
 from difflib import SequenceMatcher
 
@@ -8,6 +10,7 @@ from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
 from peft import PeftModel
 
 # Change this to "model_corrector" or "model_corrector_focus" depending on which you trained
+# (or pass --model-dir; --backend ct2 evaluates a CTranslate2 export from export_corrector.py)
 MODEL_DIR = "model_corrector_focus"
 
 FORBIDDEN_PATTERNS = [r"\$"]
@@ -133,8 +136,24 @@ class Corrector:
         return normalize(pred)
 
 
-def main():
-      # Prefer val_focus.jsonl from prep_data.py, fallback to val.jsonl
+class CT2Corrector:
+    """Same interface as Corrector, backed by LocalCorrector's CTranslate2 path (the one main_6 runs)."""
+
+    def __init__(self, model_dir: str):
+        from local_corrector import LocalCorrector
+
+        self.local = LocalCorrector(model_dir, cache_size=0, backend="ct2")
+
+    def correct(self, text: str) -> str:
+        return self.local.generate_batch([normalize(text)])[0]
+
+
+def load_corrector(model_dir: str, backend: str = "torch"):
+    return CT2Corrector(model_dir) if backend == "ct2" else Corrector(model_dir)
+
+
+def load_val_rows() -> list[dict]:
+    # Prefer val_focus.jsonl from prep_data.py, fallback to val.jsonl
     val_path = Path("val_focus.jsonl") if Path("val_focus.jsonl").exists() else Path("val.jsonl")
     if not val_path.exists():
         raise FileNotFoundError("val.jsonl not found in current folder.")
@@ -147,20 +166,24 @@ def main():
 
     if not rows:
         raise ValueError("val.jsonl is empty")
+    return rows
 
-    corrector = Corrector(MODEL_DIR)
 
+def evaluate(corrector, rows: list[dict], preview: int = 8) -> dict:
+    """Score corrector on rows; returns the summary numbers plus every prediction."""
     total = 0
     accepted = 0
     sum_sim_raw = 0.0
     sum_sim_used = 0.0
-    preview = 8
+    preds = []
+    t0 = time.perf_counter()
 
     for i, r in enumerate(rows):
         raw = r["input"]
         target = r["target"]
 
         pred = corrector.correct(raw)
+        preds.append(pred)
         ok = safety_accept(raw, pred)
 
         sim_raw = similarity(normalize(raw).lower(), normalize(target).lower())
@@ -189,11 +212,32 @@ def main():
             print(f"USED:   {used}  ({flag})")
             print(f"sim(raw,target)={sim_raw:.3f}  sim(used,target)={sim_used:.3f}")
 
+    return {
+        "total": total,
+        "accepted": accepted,
+        "sim_raw": sum_sim_raw / total,
+        "sim_used": sum_sim_used / total,
+        "sec_per_row": (time.perf_counter() - t0) / total,
+        "preds": preds,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--model-dir", default=MODEL_DIR)
+    ap.add_argument("--backend", choices=("torch", "ct2"), default="torch")
+    args = ap.parse_args()
+
+    rows = load_val_rows()
+    res = evaluate(load_corrector(args.model_dir, args.backend), rows)
+    total = res["total"]
+
     print("\n" + "=" * 70)
     print(f"VAL rows: {total}")
-    print(f"Accepted (safe+better): {accepted}/{total} ({accepted/total*100:.1f}%)")
-    print(f"Avg similarity RAW→TARGET:  {sum_sim_raw/total:.3f}")
-    print(f"Avg similarity USED→TARGET: {sum_sim_used/total:.3f}")
+    print(f"Accepted (safe+better): {res['accepted']}/{total} ({res['accepted']/total*100:.1f}%)")
+    print(f"Avg similarity RAW→TARGET:  {res['sim_raw']:.3f}")
+    print(f"Avg similarity USED→TARGET: {res['sim_used']:.3f}")
+    print(f"Latency: {res['sec_per_row'] * 1000:.1f} ms/line ({args.backend})")
 
 
 if __name__ == "__main__":
@@ -0,0 +1,99 @@
+import argparse
+import shutil
+import sys
+import time
+from pathlib import Path
+
+import torch
+from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+from peft import PeftModel
+
+import evaluate_model
+
+BASE_MODEL = "t5-small"
+ADAPTER_DIR = "model_corrector_focus"
+OUT_DIR = "model_corrector_focus_ct2"
+# Largest drop in avg USED->TARGET similarity the export may show against the PyTorch model
+PARITY_TOLERANCE = 0.005
+
+
+def dir_size_mb(path: Path) -> float:
+    return sum(f.stat().st_size for f in path.rglob("*") if f.is_file()) / 1e6
+
+
+def merge_adapter(adapter_dir: Path, merged_dir: Path) -> None:
+    """Fold the LoRA weights into the base model so inference runs plain T5 layers."""
+    tokenizer = AutoTokenizer.from_pretrained(str(adapter_dir))
+    if (adapter_dir / "adapter_config.json").exists():
+        base = AutoModelForSeq2SeqLM.from_pretrained(BASE_MODEL)
+        model = PeftModel.from_pretrained(base, str(adapter_dir)).merge_and_unload()
+    else:
+        model = AutoModelForSeq2SeqLM.from_pretrained(str(adapter_dir))
+    model.save_pretrained(str(merged_dir))
+    tokenizer.save_pretrained(str(merged_dir))
+
+
+def convert(merged_dir: Path, out_dir: Path, quantization: str) -> None:
+    import ctranslate2
+
+    ctranslate2.converters.TransformersConverter(str(merged_dir)).convert(
+        str(out_dir), quantization=quantization, force=True,
+    )
+    # LocalCorrector loads the tokenizer from the same directory
+    AutoTokenizer.from_pretrained(str(merged_dir)).save_pretrained(str(out_dir))
+
+
+def parity_check(adapter_dir: Path, out_dir: Path) -> bool:
+    """Run evaluate_model.py's scoring on both models and compare."""
+    rows = evaluate_model.load_val_rows()
+    results = {}
+    for name, model_dir, backend in (("torch", adapter_dir, "torch"), ("ct2", out_dir, "ct2")):
+        t0 = time.perf_counter()
+        corrector = evaluate_model.load_corrector(str(model_dir), backend)
+        load_sec = time.perf_counter() - t0
+        res = evaluate_model.evaluate(corrector, rows, preview=0)
+        res["load_sec"] = load_sec
+        results[name] = res
+        print(
+            f"[Parity] {name:<5} load {load_sec:5.1f}s | {res['sec_per_row'] * 1000:7.1f} ms/line | "
+            f"accepted {res['accepted']}/{res['total']} | USED->TARGET {res['sim_used']:.3f}"
+        )
+
+    ref, new = results["torch"], results["ct2"]
+    same = sum(a == b for a, b in zip(ref["preds"], new["preds"]))
+    print(f"[Parity] identical predictions: {same}/{ref['total']} ({same / ref['total'] * 100:.1f}%)")
+    print(f"[Parity] speedup: {ref['sec_per_row'] / new['sec_per_row']:.1f}x per line, "
+          f"{ref['load_sec'] / max(new['load_sec'], 1e-9):.1f}x load")
+    ok = new["sim_used"] >= ref["sim_used"] - PARITY_TOLERANCE
+    print(f"[Parity] {'PASS' if ok else 'FAIL'} (tolerance {PARITY_TOLERANCE})")
+    return ok
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Merge the LoRA adapter and export an int8 CTranslate2 corrector")
+    ap.add_argument("--adapter-dir", default=ADAPTER_DIR)
+    ap.add_argument("--out", default=OUT_DIR)
+    ap.add_argument("--quantization", default="int8", help="CTranslate2 weight type (int8, int8_float32, float32)")
+    ap.add_argument("--check", action="store_true", help="compare against the PyTorch model on the val set")
+    args = ap.parse_args()
+
+    adapter_dir, out_dir = Path(args.adapter_dir), Path(args.out)
+    if not adapter_dir.exists():
+        raise FileNotFoundError(f"{adapter_dir} not found")
+    merged_dir = out_dir.with_name(out_dir.name + "_merged")
+
+    torch.set_grad_enabled(False)
+    t0 = time.perf_counter()
+    merge_adapter(adapter_dir, merged_dir)
+    convert(merged_dir, out_dir, args.quantization)
+    shutil.rmtree(merged_dir, ignore_errors=True)
+    print(f"Exported {out_dir} ({args.quantization}, {dir_size_mb(out_dir):.1f} MB) "
+          f"in {time.perf_counter() - t0:.1f}s")
+    print(f"Use it with: LOCAL_MODEL_DIR={out_dir}")
+
+    if args.check and not parity_check(adapter_dir, out_dir):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
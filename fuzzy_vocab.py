@@ -0,0 +1,89 @@
+from itertools import combinations
+
+
+def levenshtein(a: str, b: str, max_dist: int = 2) -> int:
+    """Edit distance, or max_dist + 1 as soon as it is known to exceed max_dist."""
+    if a == b:
+        return 0
+    if abs(len(a) - len(b)) > max_dist:
+        return max_dist + 1
+    if not a or not b:
+        return max(len(a), len(b))
+    prev = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        cur = [i]
+        # early exit tracking
+        best_row = max_dist + 1
+        for j, cb in enumerate(b, 1):
+            ins = cur[j - 1] + 1
+            dele = prev[j] + 1
+            sub = prev[j - 1] + (ca != cb)
+            v = ins if ins < dele else dele
+            v = sub if sub < v else v
+            cur.append(v)
+            if v < best_row:
+                best_row = v
+        prev = cur
+        if best_row > max_dist:
+            return max_dist + 1
+    return prev[-1]
+
+
+def _deletes(word: str, max_distance: int) -> set[str]:
+    """Every string reachable from `word` by deleting up to max_distance characters."""
+    out = {word}
+    for n in range(1, min(max_distance, len(word)) + 1):
+        for idx in combinations(range(len(word)), n):
+            out.add("".join(c for i, c in enumerate(word) if i not in idx))
+    return out
+
+
+class DeletionIndex:
+    """SymSpell-style lookup of the closest vocabulary word within a small edit distance.
+
+    Each word is filed under every string its deletions (up to max_distance) produce. Two
+    words within distance k always share such a string, so a lookup only expands the
+    deletions of the query and verifies the few words filed under them, instead of
+    comparing against the whole vocabulary. Ties go to the word added first.
+    """
+
+    def __init__(self, words=(), max_distance: int = 1):
+        self.max_distance = max_distance
+        self.words: list[str] = []
+        self._rank: dict[str, int] = {}
+        self._by_delete: dict[str, list[int]] = {}
+        for w in words:
+            self.add(w)
+
+    def __len__(self) -> int:
+        return len(self.words)
+
+    def __contains__(self, word: str) -> bool:
+        return word in self._rank
+
+    def add(self, word: str) -> None:
+        if word in self._rank:
+            return
+        rank = self._rank[word] = len(self.words)
+        self.words.append(word)
+        for d in _deletes(word, self.max_distance):
+            self._by_delete.setdefault(d, []).append(rank)
+
+    def lookup(self, term: str, max_distance: int | None = None) -> tuple[str, int] | None:
+        """(word, distance) of the nearest word within max_distance, or None."""
+        k = self.max_distance if max_distance is None else min(max_distance, self.max_distance)
+        if term in self._rank:
+            return term, 0
+        seen: set[int] = set()
+        best = None
+        for d in _deletes(term, k):
+            for rank in self._by_delete.get(d, ()):
+                if rank in seen:
+                    continue
+                seen.add(rank)
+                dist = levenshtein(term, self.words[rank], max_dist=k)
+                if dist <= k and (best is None or (dist, rank) < best):
+                    best = (dist, rank)
+        if best is None:
+            return None
+        return self.words[best[1]], best[0]
@@ -0,0 +1,84 @@
+import json
+import time
+from collections import deque
+from pathlib import Path
+
+
+class LatencyTracer:
+    """Per-stage duration samples (seconds) kept in fixed-size rings.
+
+    Call sites take `t0 = tracer.start()` and later `tracer.stop("stage", t0)`; record()
+    takes a duration measured elsewhere (e.g. queue wait from a block's timestamp).
+    Timestamps come from time.perf_counter(), so they are monotonic.
+    """
+
+    enabled = True
+
+    def __init__(self, max_samples: int = 4096):
+        self.max_samples = max_samples
+        self.stages: dict[str, deque] = {}
+
+    def start(self) -> float:
+        return time.perf_counter()
+
+    def stop(self, stage: str, t0: float) -> None:
+        self.record(stage, time.perf_counter() - t0)
+
+    def record(self, stage: str, seconds: float) -> None:
+        ring = self.stages.get(stage)
+        if ring is None:
+            ring = self.stages[stage] = deque(maxlen=self.max_samples)
+        ring.append(seconds)
+
+    def summary(self) -> dict[str, dict]:
+        out = {}
+        # list(): the capture callback may add a stage from another thread
+        for stage, ring in list(self.stages.items()):
+            s = sorted(ring)
+            if not s:
+                continue
+
+            def pct(p):
+                return s[min(len(s) - 1, int(p / 100.0 * len(s)))]
+
+            out[stage] = {"n": len(s), "p50": pct(50), "p95": pct(95), "p99": pct(99), "max": s[-1]}
+        return out
+
+    def summary_lines(self) -> list[str]:
+        return [
+            f"{stage:<18} n={v['n']:<5} p50={v['p50'] * 1000:8.2f}ms p95={v['p95'] * 1000:8.2f}ms "
+            f"p99={v['p99'] * 1000:8.2f}ms max={v['max'] * 1000:8.2f}ms"
+            for stage, v in self.summary().items()
+        ]
+
+    def dump(self, path: Path) -> None:
+        """Write the summary plus the raw samples still in each ring as JSON."""
+        data = {
+            "summary": self.summary(),
+            "samples": {stage: list(ring) for stage, ring in list(self.stages.items())},
+        }
+        Path(path).write_text(json.dumps(data, indent=1) + "\n", encoding="utf-8")
+
+
+class NullTracer:
+    """Drop-in for LatencyTracer when tracing is off: every call is a no-op."""
+
+    enabled = False
+
+    def start(self) -> float:
+        return 0.0
+
+    def stop(self, stage: str, t0: float) -> None:
+        pass
+
+    def record(self, stage: str, seconds: float) -> None:
+        pass
+
+    def summary(self) -> dict[str, dict]:
+        return {}
+
+    def summary_lines(self) -> list[str]:
+        return []
+
+    def dump(self, path: Path) -> None:
+        pass
@@ -1,12 +1,24 @@
 import re
+import time
 from pathlib import Path
 from difflib import SequenceMatcher
 
-import torch
-from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
-from peft import PeftModel
+from transformers import AutoTokenizer
+
+from micro_batch import LRUCache, length_batches
 
 MODEL_DIR_DEFAULT = "model_corrector_focus"
+BACKENDS = ("auto", "torch", "ct2")
+# "tiered": greedy decode first and run beam search only when greedy proposes an edit that
+# would pass _accept(); "beam": always beam search
+DECODING_MODES = ("tiered", "beam")
+
+# Decoding settings shared by both backends (and evaluate_model.py)
+MAX_INPUT_TOKENS = 128
+MAX_NEW_TOKENS = 64
+NUM_BEAMS = 4
+REPETITION_PENALTY = 1.2
+NO_REPEAT_NGRAM_SIZE = 3
 
 FORBIDDEN_PATTERNS = [r"\$"]
 NON_ENGLISH_BLOCKLIST = re.compile(r"\b(stimme|bitte|danke|bonjour|hola)\b", re.IGNORECASE)
@@ -75,14 +87,52 @@ def safety_accept(raw: str, pred: str) -> bool:
 
     return True
 
+def detect_backend(model_dir: str) -> str:
+    """'ct2' for a CTranslate2 export (see export_corrector.py), else 'torch'."""
+    return "ct2" if (Path(model_dir) / "model.bin").exists() else "torch"
+
+
 class LocalCorrector:
-    def __init__(self, model_dir: str = MODEL_DIR_DEFAULT):
+    def __init__(self, model_dir: str = MODEL_DIR_DEFAULT, cache_size: int = 2048, max_batch: int = 16,
+                 backend: str = "auto", threads: int = 0, decoding: str = "tiered"):
+        if backend not in BACKENDS:
+            raise ValueError(f"unknown backend {backend!r} (expected one of {', '.join(BACKENDS)})")
+        if decoding not in DECODING_MODES:
+            raise ValueError(f"unknown decoding {decoding!r} (expected one of {', '.join(DECODING_MODES)})")
         self.model_dir = model_dir
+        self.backend = detect_backend(model_dir) if backend == "auto" else backend
         self.tokenizer = None
         self.model = None
-        self._load()
+        self.max_batch = max_batch
+        # intra-op threads for generate(); 0 keeps the library default (usually every core)
+        self.threads = threads
+        # normalized input -> accepted output; radio traffic repeats itself a lot
+        self.cache = LRUCache(cache_size)
+        self.decoding = decoding
+        # lines decoded per path, and total seconds spent decoding them
+        self.paths = {"greedy_unchanged": 0, "greedy_rejected": 0, "beam": 0}
+        self.decode_sec = 0.0
+        if self.backend == "ct2":
+            self._load_ct2()
+        else:
+            self._load()
+
+    def _load_ct2(self):
+        # int8 CTranslate2 export: no torch import, merged weights, no LoRA layers at inference
+        import ctranslate2
+
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_dir)
+        self.model = ctranslate2.Translator(
+            self.model_dir, device="cpu", compute_type="int8", intra_threads=self.threads,
+        )
 
     def _load(self):
+        import torch
+        from transformers import AutoModelForSeq2SeqLM
+
+        if self.threads:
+            torch.set_num_threads(self.threads)
+
         model_path = Path(self.model_dir)
         # allow relative paths
         if not model_path.exists():
@@ -93,6 +143,8 @@ class LocalCorrector:
 
         adapter_cfg = model_path / "adapter_config.json"
         if adapter_cfg.exists():
+            from peft import PeftModel
+
             base = AutoModelForSeq2SeqLM.from_pretrained("t5-small")
             self.model = PeftModel.from_pretrained(base, str(model_path))
         else:
@@ -100,29 +152,57 @@ class LocalCorrector:
 
         self.model.eval()
 
-    @torch.inference_mode()
-    def _generate(self, text: str) -> str:
-        inputs = self.tokenizer([text], return_tensors="pt", truncation=True, max_length=128)
-        out = self.model.generate(
-            **inputs,
-            max_new_tokens=64,
-            num_beams=4,
-            repetition_penalty=1.2,
-            no_repeat_ngram_size=3,
-            do_sample=False,
-        )
-        return normalize(self.tokenizer.decode(out[0], skip_special_tokens=True))
+    def generate_batch(self, texts: list[str], num_beams: int = NUM_BEAMS) -> list[str]:
+        """Raw model output (no safety checks) for each input, in input order.
 
-    def correct(self, raw: str) -> str:
-        raw_n = normalize(raw)
-        if not raw_n:
-            return raw_n
+        The torch backend runs one generate() per group of similar-length inputs;
+        num_beams=1 is greedy decoding.
+        """
+        if self.backend == "ct2":
+            return self._generate_batch_ct2(texts, num_beams)
 
-        try:
-            pred = self._generate(raw_n)
-        except Exception:
-            return raw_n
+        import torch
+
+        ids = self.tokenizer(texts, truncation=True, max_length=MAX_INPUT_TOKENS)["input_ids"]
+        out: list[str] = [""] * len(texts)
+        with torch.inference_mode():
+            for group in length_batches([len(x) for x in ids], self.max_batch):
+                inputs = self.tokenizer.pad({"input_ids": [ids[i] for i in group]}, return_tensors="pt")
+                gen = self.model.generate(
+                    **inputs,
+                    max_new_tokens=MAX_NEW_TOKENS,
+                    num_beams=num_beams,
+                    repetition_penalty=REPETITION_PENALTY,
+                    no_repeat_ngram_size=NO_REPEAT_NGRAM_SIZE,
+                    do_sample=False,
+                )
+                for i, text in zip(group, self.tokenizer.batch_decode(gen, skip_special_tokens=True)):
+                    out[i] = normalize(text)
+        return out
+
+    def _generate_batch_ct2(self, texts: list[str], num_beams: int) -> list[str]:
+        # CTranslate2 works on token strings and pads/sorts its own batches
+        ids = self.tokenizer(texts, truncation=True, max_length=MAX_INPUT_TOKENS)["input_ids"]
+        results = self.model.translate_batch(
+            [self.tokenizer.convert_ids_to_tokens(x) for x in ids],
+            max_batch_size=self.max_batch,
+            beam_size=num_beams,
+            max_decoding_length=MAX_NEW_TOKENS,
+            repetition_penalty=REPETITION_PENALTY,
+            no_repeat_ngram_size=NO_REPEAT_NGRAM_SIZE,
+        )
+        return [
+            normalize(self.tokenizer.decode(
+                self.tokenizer.convert_tokens_to_ids(r.hypotheses[0]), skip_special_tokens=True,
+            ))
+            for r in results
+        ]
+
+    def _generate(self, text: str) -> str:
+        return self.generate_batch([text])[0]
 
+    @staticmethod
+    def _accept(raw_n: str, pred: str) -> str:
         if not safety_accept(raw_n, pred):
             return raw_n
 
@@ -131,3 +211,54 @@ class LocalCorrector:
             return raw_n
 
         return pred
+
+    def _decode(self, todo: list[str]) -> dict[str, str]:
+        """Accepted output for each (normalized, unique) line, via the configured decoding."""
+        if self.decoding == "beam":
+            self.paths["beam"] += len(todo)
+            return {n: self._accept(n, p) for n, p in zip(todo, self.generate_batch(todo))}
+
+        # Most lines come back unchanged or fail the gates; those never need beam search
+        done = {}
+        escalate = []
+        for n, greedy in zip(todo, self.generate_batch(todo, num_beams=1)):
+            if greedy == n:
+                self.paths["greedy_unchanged"] += 1
+                done[n] = n
+            elif self._accept(n, greedy) == n:
+                self.paths["greedy_rejected"] += 1
+                done[n] = n
+            else:
+                escalate.append(n)
+        if escalate:
+            self.paths["beam"] += len(escalate)
+            for n, pred in zip(escalate, self.generate_batch(escalate)):
+                done[n] = self._accept(n, pred)
+        return done
+
+    def decode_stats(self) -> dict:
+        """Per-path line counts plus the average decode latency per line, in ms."""
+        lines = sum(self.paths.values())
+        return {**self.paths, "avg_ms": self.decode_sec / lines * 1000 if lines else 0.0}
+
+    def correct_batch(self, raws: list[str]) -> list[str]:
+        """correct() for many lines: cached lines are answered directly, the rest share
+        padding-aware generate() batches. A failed batch returns its inputs unchanged."""
+        norm = [normalize(r) for r in raws]
+        out: list[str | None] = [n if not n else self.cache.get(n) for n in norm]
+        todo = list(dict.fromkeys(n for n, o in zip(norm, out) if o is None))
+        if todo:
+            t0 = time.perf_counter()
+            try:
+                done = self._decode(todo)
+            except Exception:
+                done = {n: n for n in todo}  # unchanged, and not cached
+            else:
+                for n, used in done.items():
+                    self.cache.put(n, used)
+            self.decode_sec += time.perf_counter() - t0
+            out = [o if o is not None else done[n] for n, o in zip(norm, out)]
+        return out
+
+    def correct(self, raw: str) -> str:
+        return self.correct_batch([raw])[0]
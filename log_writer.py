@@ -0,0 +1,151 @@
+import os
+import queue
+import threading
+import time
+from pathlib import Path
+
+# "os": write + flush to the OS, never fsync (fastest; a power cut can lose recent lines)
+# "group": fsync at most every commit_ms, and right away for urgent lines (default)
+# "sync": append() returns once its line is fsynced; concurrent lines share the fsync
+DURABILITY_LEVELS = ("os", "group", "sync")
+
+
+class GroupCommitWriter:
+    """Appends text to log files from one background thread.
+
+    Files stay open, queued lines are written in arrival order and each drained batch is
+    flushed to the OS, so readers see new lines promptly; fsync is batched per durability.
+    """
+
+    def __init__(self, durability: str = "group", commit_ms: float = 200.0, max_queue: int = 10000):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"unknown durability {durability!r} (expected one of {', '.join(DURABILITY_LEVELS)})")
+        self.durability = durability
+        self.commit_sec = commit_ms / 1000.0
+        self.writes = 0
+        self.batches = 0
+        self.fsyncs = 0
+        self._q: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._files: dict[Path, object] = {}
+        self._dirty: set[Path] = set()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def append(self, path: Path, text: str, urgent: bool = False) -> None:
+        """Queue text for path; urgent lines are fsynced with their batch (unless durability is "os")."""
+        if self._closed:
+            raise RuntimeError("GroupCommitWriter is closed")
+        done = threading.Event() if self.durability == "sync" else None
+        self._q.put((Path(path), text, urgent, done))
+        if done is not None:
+            done.wait()
+
+    def flush(self) -> None:
+        """Block until everything queued so far is written and fsynced."""
+        if self._closed:
+            return  # close() has already written and fsynced everything
+        done = threading.Event()
+        self._q.put((None, "", True, done))
+        done.wait()
+
+    def close(self) -> None:
+        """Write and fsync what is queued, then close the files."""
+        if self._closed:
+            return
+        self._closed = True
+        self._q.put(None)
+        self._thread.join()
+
+    def _file(self, path: Path):
+        f = self._files.get(path)
+        if f is None:
+            f = self._files[path] = path.open("a", encoding="utf-8")
+        return f
+
+    def _commit(self) -> None:
+        for path in self._dirty:
+            try:
+                os.fsync(self._files[path].fileno())
+                self.fsyncs += 1
+            except OSError:
+                pass
+        self._dirty.clear()
+
+    def _write_batch(self, batch: list, waiters: list) -> tuple[bool, bool]:
+        """Write one drained batch; returns (commit now, stop). Never raises: a bad line is
+        reported and skipped so the thread keeps serving (and releasing) everyone else."""
+        commit_now = stop = False
+        touched = set()
+        for item in batch:
+            if item is None:
+                stop = commit_now = True
+                continue
+            path, text, urgent, done = item
+            if done is not None:
+                waiters.append(done)
+                commit_now = True
+            commit_now = commit_now or (urgent and self.durability != "os")
+            if path is None:
+                continue
+            try:
+                self._file(path).write(text)
+            except Exception as e:
+                print(f"[LogWriter] {path}: {e}")
+                continue
+            touched.add(path)
+            self.writes += 1
+        for path in touched:
+            try:
+                self._files[path].flush()
+            except Exception as e:
+                print(f"[LogWriter] {path}: {e}")
+        self._dirty |= touched
+        if batch:
+            self.batches += 1
+        return commit_now, stop
+
+    def _drain(self, batch: list) -> list:
+        while True:
+            try:
+                batch.append(self._q.get_nowait())
+            except queue.Empty:
+                return batch
+
+    def _run(self) -> None:
+        last_commit = time.monotonic()
+        stop = False
+        while not stop:
+            timeout = None
+            if self._dirty and self.durability != "os":
+                timeout = max(0.0, last_commit + self.commit_sec - time.monotonic())
+            try:
+                batch = self._drain([self._q.get(timeout=timeout)])
+            except queue.Empty:
+                batch = []
+
+            waiters = []
+            try:
+                commit_now, stop = self._write_batch(batch, waiters)
+                due = time.monotonic() - last_commit >= self.commit_sec
+                if self._dirty and (commit_now or (due and self.durability != "os")):
+                    self._commit()
+                    last_commit = time.monotonic()
+            finally:
+                for done in waiters:
+                    done.set()
+
+        # Lines that raced with close(): write them too rather than strand their waiters
+        waiters = []
+        try:
+            self._write_batch(self._drain([]), waiters)
+            self._commit()
+        finally:
+            for done in waiters:
+                done.set()
+        for f in self._files.values():
+            try:
+                f.close()
+            except OSError:
+                pass
+        self._files.clear()
@@ -1,12 +1,18 @@
 import os
+import argparse
 import asyncio
+import atexit
 import json
 import queue
+import threading
 import time
 from pathlib import Path
 import re
 import html as htmlmod
 from collections import deque
+from concurrent.futures import TimeoutError as FutureTimeout
+from functools import lru_cache
+from typing import NamedTuple
 from urllib.parse import quote
 import ctypes.util
 portaudio_path = "/nix/store/x44kh3nk8qzjyhs0127x8lv761qg3mx3-portaudio-190700_20210406/lib/libportaudio.so.2"
@@ -19,9 +25,29 @@ if os.path.exists(portaudio_path):
     ctypes.util.find_library = _patched_find_library
 
 import numpy as np
-import sounddevice as sd
-from faster_whisper import WhisperModel
+try:
+    import sounddevice as sd
+except (ImportError, OSError):  # no PortAudio / sound card: --replay still works
+    sd = None
+from faster_whisper import BatchedInferencePipeline, WhisperModel, decode_audio
+from corrector_worker import CorrectorProcess
 from local_corrector import LocalCorrector
+from asr_calibrate import calibrate, load_asr_config, save_asr_config
+from asr_stream import HypothesisBuffer, LatencyReport, words_text
+from audio_buffer import AudioRingBuffer
+from fuzzy_vocab import DeletionIndex
+from latency_trace import LatencyTracer, NullTracer
+from log_writer import GroupCommitWriter
+from micro_batch import MicroBatcher
+from output_stage import OutputStage
+from overlay_server import OverlayServer, overlay_page
+from prep_data import extract_example, normalize_line, split_blocks
+from radio_tokens import RadioScanner, normalize_phonetic_token
+from transcript_rules import MISRECOGNITION_FIXES, RewriteEngine
+from replay import VirtualClock, WallClock, replay_blocks
+from skip_gate import SkipGate
+from transcript_store import TranscriptStore
+from audio_dsp import OnePoleIIR, EnergyVAD, TransmissionSegmenter, pre_emphasis, high_pass, low_pass, frame_rms, apply_frame_gain
 
 # =============================================================================
 # CONFIG
@@ -63,13 +89,79 @@ Return ONLY the cleaned transcript text. No explanations, no quotes, no prefixes
 
 # Local model corrector (trained on your logs)
 LOCAL_MODEL_DIR = os.environ.get('LOCAL_MODEL_DIR', 'model_corrector_focus')
+# "auto" picks CTranslate2 for an export_corrector.py output dir, PyTorch (+ LoRA adapter) otherwise
+LOCAL_MODEL_BACKEND = os.environ.get("LOCAL_MODEL_BACKEND", "auto")
+LOCAL_MODEL_BATCH = int(os.environ.get("LOCAL_MODEL_BATCH", "16"))                 # lines per generate()
+LOCAL_MODEL_BATCH_WAIT_MS = float(os.environ.get("LOCAL_MODEL_BATCH_WAIT_MS", "5"))  # wait to fill a batch
+LOCAL_MODEL_CACHE_SIZE = int(os.environ.get("LOCAL_MODEL_CACHE_SIZE", "2048"))
+# "tiered" tries greedy decoding first and only beam-searches plausible edits; "beam" always beams
+LOCAL_MODEL_DECODING = os.environ.get("LOCAL_MODEL_DECODING", "tiered")
+# Run the local model on an output thread so a burst of traffic does not stall the ASR loop
+LOCAL_MODEL_ASYNC = os.environ.get("LOCAL_MODEL_ASYNC", "1") == "1"
+# Host the model in its own process (corrector_worker.py) so generate() never competes with
+# Whisper for the GIL; "0" loads it in-process as before
+LOCAL_MODEL_PROCESS = os.environ.get("LOCAL_MODEL_PROCESS", "1") == "1"
+# Per-line deadline: a correction that is not back in time is dropped and the regex-only
+# text is used (what OPENAI_TIMEOUT was for)
+LOCAL_MODEL_TIMEOUT = float(os.environ.get("LOCAL_MODEL_TIMEOUT", "1.5"))
+LOCAL_MODEL_MAX_PENDING = int(os.environ.get("LOCAL_MODEL_MAX_PENDING", "64"))  # queued lines before shedding
+# Split the cores between Whisper and the corrector instead of letting both grab all of them
+CPU_COUNT = os.cpu_count() or 4
+LOCAL_MODEL_THREADS = int(os.environ.get("LOCAL_MODEL_THREADS", str(max(1, CPU_COUNT // 4))))
+LOCAL_MODEL_CPUS = os.environ.get("LOCAL_MODEL_CPUS", "")  # e.g. "6-7": pin the worker process (Linux)
+
+
+def _corrector_worker_started(ready) -> None:
+    if ready.exception():
+        print(f"[WARN] LocalCorrector worker failed to start: {ready.exception()}")
+    else:
+        print(
+            f"[INFO] LocalCorrector loaded: {LOCAL_MODEL_DIR} ({local_corrector.backend}, "
+            f"worker process, {LOCAL_MODEL_THREADS} threads)"
+        )
+
+
 try:
-    local_corrector = LocalCorrector(model_dir=LOCAL_MODEL_DIR)
-    print(f"[INFO] LocalCorrector loaded: {LOCAL_MODEL_DIR}")
+    if LOCAL_MODEL_PROCESS:
+        # The worker loads the model in the background; until it is ready, lines keep
+        # their regex-only text instead of holding up startup
+        local_corrector = CorrectorProcess(
+            model_dir=LOCAL_MODEL_DIR, cache_size=LOCAL_MODEL_CACHE_SIZE, max_batch=LOCAL_MODEL_BATCH,
+            backend=LOCAL_MODEL_BACKEND, threads=LOCAL_MODEL_THREADS, cpus=LOCAL_MODEL_CPUS,
+            timeout=LOCAL_MODEL_TIMEOUT, max_pending=LOCAL_MODEL_MAX_PENDING, decoding=LOCAL_MODEL_DECODING,
+            start_timeout=None,
+        )
+        atexit.register(local_corrector.close)
+        local_corrector.ready.add_done_callback(_corrector_worker_started)
+    else:
+        local_corrector = LocalCorrector(
+            model_dir=LOCAL_MODEL_DIR, cache_size=LOCAL_MODEL_CACHE_SIZE, max_batch=LOCAL_MODEL_BATCH,
+            backend=LOCAL_MODEL_BACKEND, threads=LOCAL_MODEL_THREADS, decoding=LOCAL_MODEL_DECODING,
+        )
+        print(
+            f"[INFO] LocalCorrector loaded: {LOCAL_MODEL_DIR} ({local_corrector.backend}, "
+            f"in-process, {LOCAL_MODEL_THREADS} threads)"
+        )
 except Exception as e:
     local_corrector = None
     print(f"[WARN] LocalCorrector not available: {e}")
 
+local_batcher = MicroBatcher(
+    local_corrector.correct_batch, max_batch=LOCAL_MODEL_BATCH,
+    max_wait_ms=LOCAL_MODEL_BATCH_WAIT_MS, name="local-model", max_pending=LOCAL_MODEL_MAX_PENDING,
+) if local_corrector else None
+local_model_stats = {"timeouts": 0, "shed": 0, "gated": 0, "gate_checked": 0}
+
+# Learned pre-filter (python main_6.py --train-gate): skip lines the model is predicted to
+# leave unchanged. LOCAL_MODEL_GATE_RECALL is the share of edited lines it must still let through.
+LOCAL_MODEL_GATE = os.environ.get("LOCAL_MODEL_GATE", "1") == "1"
+LOCAL_MODEL_GATE_FILE = Path(os.environ.get("LOCAL_MODEL_GATE_FILE", "skip_gate.json"))
+LOCAL_MODEL_GATE_RECALL = float(os.environ.get("LOCAL_MODEL_GATE_RECALL", "0.95"))
+skip_gate = SkipGate.load(LOCAL_MODEL_GATE_FILE) if LOCAL_MODEL_GATE and local_batcher else None
+if skip_gate:
+    print(f"[INFO] Local model skip gate loaded: {LOCAL_MODEL_GATE_FILE}")
+ASYNC_UTTERANCES = LOCAL_MODEL_ASYNC and local_batcher is not None
+
 
 TRAINING_MODE = True
 # -------------------------
@@ -193,7 +285,38 @@ KEYTERMS = [
 MAX_KEYTERMS = 30  # Re-enabled with safe limit
 
 
-audio_q: "queue.Queue[bytes]" = queue.Queue()
+# (perf_counter when queued, audio); None = end of input (replay). Not size-limited itself:
+# the hop loop empties it into its fixed-size ring every pass, and that ring is where an
+# ASR backlog is capped (oldest audio dropped and reported).
+audio_q: "queue.Queue[tuple[float, np.ndarray] | None]" = queue.Queue()
+
+# -------------------------
+# Capture -> DSP handoff
+# -------------------------
+# The PortAudio callback only copies raw float32 blocks into RAW_RING; the DSP
+# stage pulls DSP_BATCH_BLOCKS blocks at a time, runs RadioTuner and puts
+# float32 arrays on audio_q for the ASR loop.
+AUDIO_BLOCKSIZE = 800
+DSP_BATCH_BLOCKS = 4
+RAW_RING_SEC = 5.0
+
+# Pipeline time. Live capture uses the wall clock; --replay swaps in a VirtualClock
+# that the ASR stage advances by the audio it consumes, so runs are deterministic.
+clock = WallClock()
+capture_done = threading.Event()   # set by the replay feeder after the last block
+REPLAY_MAX_QUEUED = 8              # max-speed replay: DSP blocks allowed to wait for ASR
+
+# -------------------------
+# Latency tracing
+# -------------------------
+# Per-stage durations (DSP, audio_q wait, transcribe, post-process, local model, decoders,
+# writers, capture -> final caption). Summaries print with the ASR stats and are dumped to
+# TRACE_FILE on exit. When disabled the tracer is a NullTracer whose methods do nothing.
+TRACE_LATENCY = os.environ.get("TRACE_LATENCY", "0") == "1"
+TRACE_FILE = Path(os.environ.get("TRACE_FILE", "latency_trace.json"))
+tracer = LatencyTracer() if TRACE_LATENCY else NullTracer()
+if TRACE_LATENCY:
+    atexit.register(tracer.dump, TRACE_FILE)
 
 # -------------------------
 # Logging fallback when finals never arrive
@@ -245,6 +368,11 @@ OBS_LOWER_THIRD_HTML = OBS_DIR / "lower_third.html"
 UNRECOGNIZED_TERMS_LOG = OBS_DIR / "unrecognized_terms.log"
 OBS_ALERTS_HTML = OBS_DIR / "alerts.html"
 
+# Every finished utterance is also stored in this SQLite database (indexed by time,
+# callsign, code and plate); the text/HTML logs above can be rebuilt from it with
+# --rebuild-views. Set TRANSCRIPT_DB="" to turn it off.
+TRANSCRIPT_DB = os.environ.get("TRANSCRIPT_DB", str(OBS_DIR / "transcripts.db"))
+
 SILENCE_GAP_SECONDS = 4.0
 TS_FORMAT = "%Y-%m-%d %H:%M:%S"
 
@@ -265,6 +393,13 @@ LOWER_THIRD_MAX_BLOCKS = 6
 # Full HTML log keeps more history
 FULL_HTML_MAX_BLOCKS = 100
 
+# Push-based overlays: point OBS Browser Sources at http://OVERLAY_HOST:OVERLAY_PORT/lower_third
+# (or /full, /live). Pages load once and receive new lines over a WebSocket instead of
+# reloading the HTML files every 1.5 s; the files are still written for the file-based setup.
+OVERLAY_SERVER = os.environ.get("OVERLAY_SERVER", "1") == "1"
+OVERLAY_HOST = os.environ.get("OVERLAY_HOST", "127.0.0.1")
+OVERLAY_PORT = int(os.environ.get("OVERLAY_PORT", "8765"))
+
 # =============================================================================
 # 10 / 11 CODES (meaning annotations)
 # =============================================================================
@@ -678,7 +813,11 @@ PATTERN_LOCATIONS = re.compile(
 # =============================================================================
 # CALLSIGN REGEX RULES
 # =============================================================================
-NUM_WORDS = r"(?:\d{1,4}|one|won|two|to|too|three|four|for|ford|forth|five|six|seven|eight|ate|nine|ten)"
+CALLSIGN_NUMBER_WORDS = [
+    "one", "won", "two", "to", "too", "three", "four", "for", "ford", "forth",
+    "five", "six", "seven", "eight", "ate", "nine", "ten",
+]
+NUM_WORDS = r"(?:\d{1,4}|" + "|".join(CALLSIGN_NUMBER_WORDS) + ")"
 
 CALLSIGN_SPACED = re.compile(
     r"\b(" + "|".join(PHONETIC_UNITS) + r")\s+(" + NUM_WORDS + r")\b",
@@ -726,23 +865,12 @@ CALLSIGN_MULTI = re.compile(
 # =============================================================================
 # Heuristic rule from user: patrol officers identify themselves with a callsign
 # (e.g., "Boy 12", "Charles 3", "King 5") before speaking; dispatch does not.
-LEADING_CALLSIGN = re.compile(
-    r"^\s*(?:" + "|".join(PHONETIC_UNITS) + r")\s*(?:" + NUM_WORDS + r")\b",
-    re.IGNORECASE,
-)
-
-LEADING_CALLSIGN_JOINED = re.compile(
-    r"^\s*(?:" + "|".join(PHONETIC_UNITS) + r")(\d{2,4})\b",
-    re.IGNORECASE,
-)
-
 def classify_speaker(text: str) -> str:
     """Return 'O' for officer or 'D' for dispatch."""
     if not text:
         return "D"
-    t = text.strip()
-    # If the line begins with a callsign, treat as officer.
-    if LEADING_CALLSIGN.search(t) or LEADING_CALLSIGN_JOINED.search(t):
+    # If the line begins with a callsign ("Boy 12", "Adam12"), treat as officer.
+    if radio_scanner.starts_with_callsign(radio_scanner.scan(text)):
         return "O"
     return "D"
 
@@ -874,6 +1002,9 @@ def annotate_codes(text: str) -> str:
     """
     if not text:
         return text
+    # Every code form needs a digit or a spoken "ten"/"eleven"
+    if not radio_scanner.has_code(radio_scanner.scan(text)):
+        return text
 
     text = convert_joined_numeric_codes(text)
     text = convert_spoken_codes_to_numeric(text)
@@ -1114,16 +1245,6 @@ PHONETIC_TO_LETTER = {
 def _clean_token(t: str) -> str:
     return t.strip().strip(",.;:!?()[]{}\"'<> ")
 
-def normalize_phonetic_token(tok: str) -> str:
-    t = tok.lower().strip()
-    t = t.replace(".", "").replace(",", "").replace(";", "").replace(":", "")
-    t = t.replace("x ray", "xray").replace("x-ray", "xray")
-    return t
-
-def is_number_token(tok: str) -> bool:
-    t = tok.lower().strip()
-    return re.fullmatch(r"(?:\d{1,4}|one|won|two|to|too|three|four|for|ford|forth|five|six|seven|eight|ate|nine|ten)", t, re.IGNORECASE) is not None
-
 class InfoLookupDecoder:
     def __init__(self, window_seconds: float = 14.0, min_letters_per_word: int = 3):
         self.window_seconds = window_seconds
@@ -1145,19 +1266,17 @@ class InfoLookupDecoder:
                 self.words.append(w)
 
     def _extract_letters(self, transcript: str) -> list[str]:
-        raw = re.split(r"\s+", transcript.strip())
+        tokens = radio_scanner.scan(transcript)
         out: list[str] = []
         i = 0
-        while i < len(raw):
-            tok = normalize_phonetic_token(raw[i])
-            if tok in PHONETIC_TO_LETTER:
+        while i < len(tokens):
+            tok = tokens[i]
+            if tok.letter:
                 # skip callsigns like "Adam 12"
-                if i + 1 < len(raw):
-                    nxt = normalize_phonetic_token(raw[i + 1])
-                    if is_number_token(nxt):
-                        i += 2
-                        continue
-                out.append(PHONETIC_TO_LETTER[tok])
+                if i + 1 < len(tokens) and tokens[i + 1].unit_number:
+                    i += 2
+                    continue
+                out.append(tok.letter)
             i += 1
         return out
 
@@ -1259,6 +1378,16 @@ NUMBER_WORD_TO_DIGIT = {
     "nine": "9", "niner": "9",
 }
 
+# Shared word tagger for speaker classification, the noise filter, code annotation and
+# the decoders. "Echo" is also an ordinary word, so alone it only counts before a number.
+radio_scanner = RadioScanner(
+    unit_words=PHONETIC_UNITS + ["Xray"],
+    unit_number_words=CALLSIGN_NUMBER_WORDS,
+    letters=PHONETIC_TO_LETTER,
+    digits=NUMBER_WORD_TO_DIGIT,
+    weak_units=["Echo"],
+)
+
 
 # =============================================================================
 # 10-27 / 10-28 / 10-29 REQUEST FORMATTER (STRICTLY GATED)
@@ -1405,22 +1534,22 @@ class PlateDLDecoder:
         self.collected_tokens = []
 
     def _extract_alphanumeric_tokens(self, transcript: str) -> list[str]:
-        raw = re.split(r"\s+", transcript.strip())
+        tokens = radio_scanner.scan(transcript)
         out: list[str] = []
         i = 0
-        while i < len(raw):
-            tok = normalize_phonetic_token(raw[i])
-            if tok in PHONETIC_TO_LETTER:
-                if i + 1 < len(raw):
-                    nxt = normalize_phonetic_token(raw[i + 1])
-                    if is_number_token(nxt) and len(nxt) <= 2:
+        while i < len(tokens):
+            tok = tokens[i]
+            if tok.letter:
+                if i + 1 < len(tokens):
+                    nxt = tokens[i + 1]
+                    if nxt.unit_number and len(nxt.norm) <= 2:
                         i += 2
                         continue
-                out.append(tok)
-            elif tok in NUMBER_WORD_TO_DIGIT:
-                out.append(tok)
-            elif tok.isdigit() and len(tok) <= 4:
-                out.append(tok)
+                out.append(tok.norm)
+            elif tok.digit is not None:
+                out.append(tok.norm)
+            elif tok.norm.isdigit() and len(tok.norm) <= 4:
+                out.append(tok.norm)
             i += 1
         return out
 
@@ -1488,14 +1617,16 @@ def atomic_write(path: Path, text: str, retries: int = 20, delay: float = 0.03)
     except Exception:
         pass
 
-def append_flush_fsync(path: Path, line: str) -> None:
-    with path.open("a", encoding="utf-8") as f:
-        f.write(line)
-        f.flush()
-        try:
-            os.fsync(f.fileno())
-        except OSError:
-            pass
+# Log appends go through one background writer with open file handles. "group" fsyncs at
+# most every LOG_COMMIT_MS (and at once for alert lines), "sync" waits for the fsync like the
+# old per-line writes, "os" never fsyncs. Everything queued is flushed on exit.
+LOG_DURABILITY = os.environ.get("LOG_DURABILITY", "group")
+LOG_COMMIT_MS = float(os.environ.get("LOG_COMMIT_MS", "200"))
+log_writer = GroupCommitWriter(LOG_DURABILITY, LOG_COMMIT_MS)
+atexit.register(log_writer.close)
+
+def append_log(path: Path, text: str, urgent: bool = False) -> None:
+    log_writer.append(path, text, urgent)
 
 def contains_alert(text: str) -> bool:
     if not text or PATTERN_ALERTS is None:
@@ -1513,9 +1644,7 @@ def is_probably_noise(text: str) -> bool:
     # Keep anything that looks like a real code, unit/callsign, or our decoders.
     if re.search(r"\b(10-|11-|CODE\s*\d|PC\b|VC\b|H\s*&\s*S|HS\b|Plate:|DL#:)\b", text, re.IGNORECASE):
         return False
-    if CALLSIGN_SPACED.search(text) or CALLSIGN_JOINED.search(text) or CALLSIGN_MULTI.search(text):
-        return False
-    if re.search(r"\b(?:Adam|Boy|Charles|David|Edward|Frank|George|Henry|Ida|John|King|Lincoln|Mary|Nora|Ocean|Paul|Queen|Robert|Sam|Tom|Union|Victor|William|X-?ray|Yellow|Zebra)\b", text, re.IGNORECASE):
+    if radio_scanner.mentions_unit(radio_scanner.scan(text)):
         return False
 
     compact = re.sub(r"\s+", "", text)
@@ -1625,14 +1754,16 @@ class OBSCaptionWriter:
             return
         self.last_live = text
         atomic_write(OBS_LIVE_FILE, text)
+        if overlay:
+            overlay.publish_live(text)
 
-    def write_final(self, text: str):
+    def write_final(self, text: str, urgent: bool = False, at: float | None = None):
         text = text.strip()
         if not text:
             return
         atomic_write(OBS_FINAL_FILE, text)
-        ts = time.strftime(TS_FORMAT)
-        append_flush_fsync(OBS_CAPTION_LOG_FILE, f"[{ts}] {text}\n")
+        ts = time.strftime(TS_FORMAT, time.localtime(at))
+        append_log(OBS_CAPTION_LOG_FILE, f"[{ts}] {text}\n", urgent=urgent)
 
 
     def write_training_block(
@@ -1642,11 +1773,12 @@ class OBSCaptionWriter:
         final: str,
         decoded_lookup: str | None = None,
         decoded_plate_dl: str | None = None,
+        path: Path | None = None,
     ):
         """Append a training block in the exact format expected by prep_data.py.
 
         This writes to INCOMING_BLOCKS_FILE (project root) so run_pipeline.py can import it
-        without you manually copying from caption_log.txt.
+        without you manually copying from caption_log.txt. `path` overrides the file.
         """
         raw = (raw or "").strip()
         enhanced = (enhanced or "").strip()
@@ -1666,84 +1798,11 @@ class OBSCaptionWriter:
         block = "\n".join(lines) + "\n"
 
 
-        append_flush_fsync(INCOMING_BLOCKS_FILE, block)
+        append_log(path or INCOMING_BLOCKS_FILE, block)
 
 
-class FullTranscriptLogger:
-    def __init__(self, txt_path: Path, html_path: Path, lower_third_path: Path, gap_seconds: float):
-        self.txt_path = txt_path
-        self.html_path = html_path
-        self.lower_third_path = lower_third_path
-        self.gap_seconds = gap_seconds
-        self.last_write_time: float | None = None
-        self.blocks: list[dict] = []
-        self.max_blocks = 500
-        self._write_html()
-
-    def _ts(self) -> str:
-        return time.strftime(TS_FORMAT)
-
-    def add_entry(self, text: str, kind: str = "final", lookup_decoded: str | None = None, plate_dl_decoded: str | None = None):
-        text = text.strip()
-        if not text:
-            return
-
-        now = time.time()
-        
-        # Check if "break" is in the text - indicates pause between broadcasts
-        has_break = bool(re.search(r'\bbreak\b', text, re.IGNORECASE))
-        
-        start_new_entry = (
-            self.last_write_time is None
-            or (now - self.last_write_time) >= self.gap_seconds
-            or has_break
-        )
-
-        if start_new_entry:
-            append_flush_fsync(self.txt_path, f"[{self._ts()}] {text}\n")
-        else:
-            append_flush_fsync(self.txt_path, f"    {text}\n")
-
-        if lookup_decoded:
-            append_flush_fsync(self.txt_path, f"    INFO LOOKUP: {lookup_decoded}\n")
-
-        if plate_dl_decoded:
-            append_flush_fsync(self.txt_path, f"    {plate_dl_decoded}\n")
-
-        if start_new_entry or not self.blocks:
-            self.blocks.append({"ts": self._ts(), "lines": [], "lookups": []})
-
-        line_to_store = text + (" [partial]" if kind == "partial" else "")
-        self.blocks[-1]["lines"].append(line_to_store)
-
-        if plate_dl_decoded:
-            self.blocks[-1]["lookups"].append(plate_dl_decoded)
-
-        if lookup_decoded:
-            self.blocks[-1]["lookups"].append(lookup_decoded)
-
-        if len(self.blocks) > self.max_blocks:
-            self.blocks = self.blocks[-self.max_blocks:]
-
-        self.last_write_time = now
-        self._write_html()
-
-    def _write_html(self):
-        # Write full HTML log (all blocks)
-        self._write_html_file(self.html_path, self.blocks[-FULL_HTML_MAX_BLOCKS:] if len(self.blocks) > FULL_HTML_MAX_BLOCKS else self.blocks, is_lower_third=False)
-        
-        # Write OBS lower-third overlay (limited blocks)
-        if LOWER_THIRD_MODE:
-            lower_blocks = self.blocks[-LOWER_THIRD_MAX_BLOCKS:] if len(self.blocks) > LOWER_THIRD_MAX_BLOCKS else self.blocks
-            self._write_html_file(self.lower_third_path, lower_blocks, is_lower_third=True)
-
-    def _write_html_file(self, path: Path, blocks: list, is_lower_third: bool = False):
-        parts = []
-        parts.append("<!doctype html>")
-        parts.append("<html><head><meta charset='utf-8'>")
-        
-        if is_lower_third:
-            parts.append("""
+# <style> ... </head><body> of the two transcript pages (also used by the overlay server)
+LOWER_THIRD_HEAD = """
 <style>
   :root {
     --bg: rgba(0,0,0,0.55);
@@ -1820,9 +1879,9 @@ class FullTranscriptLogger:
   .line{animation:fadeIn 0.3s ease-in;}
 </style>
 </head><body>
-""".strip())
-        else:
-            parts.append("""
+""".strip()
+
+FULL_LOG_HEAD = """
 <style>
   :root {
     --bg: #1a1a2e;
@@ -1888,24 +1947,121 @@ class FullTranscriptLogger:
   .line{animation:fadeIn 0.3s ease-in;}
 </style>
 </head><body>
-""".strip())
+""".strip()
 
-        parts.append("<div class='stage'>")
-        parts.append("<div class='stack' id='stack'>")
 
-        for idx, b in enumerate(blocks):
-            age = "old" if idx < len(blocks) - 1 else "new"
-            parts.append(f"<div class='block' data-age='{age}'>")
-            parts.append(f"<div class='ts'>{htmlmod.escape(b['ts'])}</div>")
+class FullTranscriptLogger:
+    def __init__(self, txt_path: Path, html_path: Path, lower_third_path: Path, gap_seconds: float):
+        self.txt_path = txt_path
+        self.html_path = html_path
+        self.lower_third_path = lower_third_path
+        self.gap_seconds = gap_seconds
+        self.last_write_time: float | None = None
+        self.blocks: list[dict] = []
+        self.max_blocks = 500
+        # Each block caches its rendered HTML ("html", None when stale) under a "rev" that
+        # bumps on every change; a page whose (seq, rev) list matches its last write is skipped.
+        self._next_seq = 0
+        self._page_sigs: dict[Path, tuple] = {}
+        self.html_writes = 0
+        self.html_skips = 0
+
+    def _ts(self, at: float | None = None) -> str:
+        return time.strftime(TS_FORMAT, time.localtime(at))
+
+    def add_entry(self, text: str, kind: str = "final", lookup_decoded: str | None = None, plate_dl_decoded: str | None = None,
+                  at: float | None = None, write_html: bool = True):
+        """at: the entry's unix time (default: now).
+        write_html=False leaves the pages for a later _write_html() call."""
+        text = text.strip()
+        if not text:
+            return
 
-            for line in b["lines"]:
-                parts.append(f"<div class='line' title='[{htmlmod.escape(b['ts'])}]'>{highlight_to_html(line)}</div>")
+        now = clock.now() if at is None else at
+        
+        # Check if "break" is in the text - indicates pause between broadcasts
+        has_break = bool(re.search(r'\bbreak\b', text, re.IGNORECASE))
+        
+        start_new_entry = (
+            self.last_write_time is None
+            or (now - self.last_write_time) >= self.gap_seconds
+            or has_break
+        )
+
+        entry = [f"[{self._ts(at)}] {text}\n" if start_new_entry else f"    {text}\n"]
+        if lookup_decoded:
+            entry.append(f"    INFO LOOKUP: {lookup_decoded}\n")
+        if plate_dl_decoded:
+            entry.append(f"    {plate_dl_decoded}\n")
+        append_log(self.txt_path, "".join(entry))
+
+        if start_new_entry or not self.blocks:
+            self.blocks.append({"seq": self._next_seq, "rev": 0, "html": None, "ts": self._ts(at), "lines": [], "lookups": []})
+            self._next_seq += 1
+
+        line_to_store = text + (" [partial]" if kind == "partial" else "")
+        self.blocks[-1]["lines"].append(line_to_store)
+
+        if plate_dl_decoded:
+            self.blocks[-1]["lookups"].append(plate_dl_decoded)
+
+        if lookup_decoded:
+            self.blocks[-1]["lookups"].append(lookup_decoded)
+
+        self.blocks[-1]["rev"] += 1
+        self.blocks[-1]["html"] = None
+        if overlay:
+            overlay.publish_block(self.blocks[-1]["seq"], self._block_html(self.blocks[-1]))
+
+        if len(self.blocks) > self.max_blocks:
+            self.blocks = self.blocks[-self.max_blocks:]
+
+        self.last_write_time = now
+        if write_html:
+            self._write_html()
 
+    def _write_html(self):
+        # Write full HTML log (all blocks)
+        self._write_html_file(self.html_path, self.blocks[-FULL_HTML_MAX_BLOCKS:] if len(self.blocks) > FULL_HTML_MAX_BLOCKS else self.blocks, is_lower_third=False)
+        
+        # Write OBS lower-third overlay (limited blocks)
+        if LOWER_THIRD_MODE:
+            lower_blocks = self.blocks[-LOWER_THIRD_MAX_BLOCKS:] if len(self.blocks) > LOWER_THIRD_MAX_BLOCKS else self.blocks
+            self._write_html_file(self.lower_third_path, lower_blocks, is_lower_third=True)
+
+    @staticmethod
+    def _block_html(b: dict) -> str:
+        """Inner HTML of a block, rendered once per revision."""
+        if b["html"] is None:
+            ts = htmlmod.escape(b["ts"])
+            parts = [f"<div class='ts'>{ts}</div>"]
+            for line in b["lines"]:
+                parts.append(f"<div class='line' title='[{ts}]'>{highlight_to_html(line)}</div>")
             for decoded in b.get("lookups", []):
                 parts.append(
                     f"<div class='lookupline'><span class='hl lookup'>INFO LOOKUP:</span> {htmlmod.escape(decoded)}</div>"
                 )
+            b["html"] = "\n".join(parts)
+        return b["html"]
 
+    def _write_html_file(self, path: Path, blocks: list, is_lower_third: bool = False):
+        sig = tuple((b["seq"], b["rev"]) for b in blocks)
+        if self._page_sigs.get(path) == sig:
+            self.html_skips += 1
+            return
+        parts = []
+        parts.append("<!doctype html>")
+        parts.append("<html><head><meta charset='utf-8'>")
+        
+        parts.append(LOWER_THIRD_HEAD if is_lower_third else FULL_LOG_HEAD)
+
+        parts.append("<div class='stage'>")
+        parts.append("<div class='stack' id='stack'>")
+
+        for idx, b in enumerate(blocks):
+            age = "old" if idx < len(blocks) - 1 else "new"
+            parts.append(f"<div class='block' data-age='{age}'>")
+            parts.append(self._block_html(b))
             parts.append("</div>")
 
         parts.append("</div></div>")
@@ -1929,6 +2085,14 @@ class FullTranscriptLogger:
 
         parts.append("</body></html>")
         atomic_write(path, "\n".join(parts))
+        self._page_sigs[path] = sig
+        self.html_writes += 1
+
+overlay = OverlayServer(OVERLAY_HOST, OVERLAY_PORT, keep_blocks=FULL_HTML_MAX_BLOCKS) if OVERLAY_SERVER else None
+if overlay:
+    overlay.add_page("/lower_third", overlay_page(LOWER_THIRD_HEAD, max_blocks=LOWER_THIRD_MAX_BLOCKS))
+    overlay.add_page("/full", overlay_page(FULL_LOG_HEAD, max_blocks=FULL_HTML_MAX_BLOCKS, pin_bottom=True))
+    overlay.add_page("/live", overlay_page(LOWER_THIRD_HEAD, live=True))
 
 obs_writer = OBSCaptionWriter()
 full_logger = FullTranscriptLogger(FULL_LOG_FILE, FULL_LOG_HTML_FILE, OBS_LOWER_THIRD_HTML, SILENCE_GAP_SECONDS)
@@ -1937,8 +2101,10 @@ full_logger = FullTranscriptLogger(FULL_LOG_FILE, FULL_LOG_HTML_FILE, OBS_LOWER_
 # RADIO TUNER DSP
 # =============================================================================
 class RadioTuner:
-    def __init__(self, sr: int):
+    def __init__(self, sr: int, frame: int = AUDIO_BLOCKSIZE):
         self.sr = sr
+        # Gate/AGC levels are measured per capture block, whatever the DSP batch size.
+        self.frame = frame
         self.hp_y = 0.0
         self.hp_x_prev = 0.0
         self.lp_y = 0.0
@@ -1951,63 +2117,37 @@ class RadioTuner:
         self.hp_a = rc_hp / (rc_hp + dt)
         rc_lp = 1.0 / (2.0 * np.pi * max(1.0, LP_HZ))
         self.lp_b = dt / (rc_lp + dt)
+        self._hp_iir = OnePoleIIR(self.hp_a)
+        self._lp_iir = OnePoleIIR(1.0 - self.lp_b)
 
     def pre_emphasis(self, x: np.ndarray) -> np.ndarray:
         if not PREEMPH_ENABLED:
             return x
-        y = np.empty_like(x)
-        prev = self.pre_x_prev
-        a = PREEMPH
-        for i in range(len(x)):
-            xi = x[i]
-            y[i] = xi - a * prev
-            prev = xi
-        self.pre_x_prev = float(prev)
+        y, self.pre_x_prev = pre_emphasis(x, PREEMPH, self.pre_x_prev)
         return y
 
     def high_pass(self, x: np.ndarray) -> np.ndarray:
-        y = np.empty_like(x)
-        a = self.hp_a
-        y_prev = self.hp_y
-        x_prev = self.hp_x_prev
-        for i in range(len(x)):
-            xi = x[i]
-            yi = a * (y_prev + xi - x_prev)
-            y[i] = yi
-            y_prev = yi
-            x_prev = xi
-        self.hp_y = float(y_prev)
-        self.hp_x_prev = float(x_prev)
+        y, self.hp_y, self.hp_x_prev = high_pass(x, self._hp_iir, self.hp_y, self.hp_x_prev)
         return y
 
     def low_pass(self, x: np.ndarray) -> np.ndarray:
-        y = np.empty_like(x)
-        b = self.lp_b
-        y_prev = self.lp_y
-        for i in range(len(x)):
-            xi = x[i]
-            y_prev = y_prev + b * (xi - y_prev)
-            y[i] = y_prev
-        self.lp_y = float(y_prev)
+        y, self.lp_y = low_pass(x, self._lp_iir, self.lp_b, self.lp_y)
         return y
 
     def noise_gate(self, x: np.ndarray) -> np.ndarray:
-        if not GATE_ENABLED:
+        if not GATE_ENABLED or not len(x):
             return x
-        rms = float(np.sqrt(np.mean(x * x) + 1e-12))
-        if rms < GATE_RMS:
-            return x * GATE_ATTENUATION
-        return x
+        rms = frame_rms(x, self.frame)
+        gain = np.where(rms < GATE_RMS, GATE_ATTENUATION, 1.0)
+        return apply_frame_gain(x, gain, self.frame)
 
     def agc(self, x: np.ndarray) -> np.ndarray:
-        if not AGC_ENABLED:
-            return x
-        rms = float(np.sqrt(np.mean(x * x) + 1e-12))
-        if rms <= 1e-6:
+        if not AGC_ENABLED or not len(x):
             return x
-        gain = AGC_TARGET_RMS / rms
-        gain = float(np.clip(gain, AGC_MIN_GAIN, AGC_MAX_GAIN))
-        return x * gain
+        rms = frame_rms(x, self.frame)
+        gain = np.clip(AGC_TARGET_RMS / rms, AGC_MIN_GAIN, AGC_MAX_GAIN)
+        gain[rms <= 1e-6] = 1.0
+        return apply_frame_gain(x, gain, self.frame)
 
     def limiter(self, x: np.ndarray) -> np.ndarray:
         if not LIMIT_ENABLED:
@@ -2032,159 +2172,41 @@ class RadioTuner:
         return np.clip(x, -1.0, 1.0)
 
 tuner = RadioTuner(SAMPLE_RATE)
+raw_ring = AudioRingBuffer(int(RAW_RING_SEC * SAMPLE_RATE))
 
 def audio_callback(indata, frames, time_info, status):
     if status:
         pass
-    x = indata[:, 0].astype(np.float32)
-    x = tuner.process(x)
-    pcm16 = (x * 32767.0).astype(np.int16).tobytes()
-    audio_q.put(pcm16)
+    t0 = tracer.start()
+    raw_ring.write(indata[:, 0])
+    tracer.stop("capture", t0)
+
+def dsp_run_forever():
+    """Pull raw capture audio from raw_ring in batches, run RadioTuner, hand float32 to the ASR loop."""
+    batch = AUDIO_BLOCKSIZE * DSP_BATCH_BLOCKS
+    reported_drops = 0
+    while True:
+        x = raw_ring.read(batch, timeout=0.25)
+        if x is None:
+            if capture_done.is_set():
+                rest = raw_ring.available()
+                if rest:
+                    audio_q.put((time.perf_counter(), tuner.process(raw_ring.read(rest))))
+                audio_q.put(None)
+                return
+            continue
+        t0 = tracer.start()
+        y = tuner.process(x)
+        tracer.stop("dsp", t0)
+        audio_q.put((time.perf_counter(), y))
+        if raw_ring.dropped_samples != reported_drops:
+            reported_drops = raw_ring.dropped_samples
+            print(f"[DSP] capture ring overflow: {reported_drops / SAMPLE_RATE:.2f}s of audio dropped so far")
 
 # =============================================================================
 # POST-PROCESS PIPELINE
 # =============================================================================
 
-# Common misrecognitions to fix
-MISRECOGNITION_FIXES = [
-    (r'\bfour\b', '4'),
-    (r'\bfive\b', '5'),
-    (r'\bsix\b', '6'),
-    (r'\bseven\b', '7'),
-    (r'\beight\b', '8'),
-    (r'\bnine\b', '9'),
-    (r'\bwon\b', '1'),
-    (r'\btoo\b', '2'),
-    (r'\btree\b', '3'),
-    (r'\bcharking\b', 'Charles King'),
-    (r'\bfour fifteen\b', '415'),
-    (r'\bfour\s+fifty\s+nine\b', '459'),
-
-    # 10-4 variations (very common)
-    (r'\bgo for it\b', '10-4'),
-    (r'\bgo for for\b', '10-4'),
-    (r'\bgo 4\b', '10-4'),
-    (r'\bten-four\b', '10-4'),
-    (r'\bten four\b', '10-4'),
-    (r'\b104\b', '10-4'),
-    (r'\bcopy that\b', '10-4'),
-    
-    # Plus sign prefix fixes (+104 -> 10-4)
-    (r'\+1\s*0?\s*4\b', '10-4'),
-    (r'\+1\s*0?\s*7\b', '10-7'),
-    (r'\+1\s*0?\s*8\b', '10-8'),
-    (r'\+1\s*0?\s*9\b', '10-9'),
-    (r'\+1\s*0?\s*14\b', '10-14'),
-    (r'\+1\s*0?\s*22\b', '10-22'),
-    (r'\+1\s*0?\s*28\b', '10-28'),
-    (r'\+1\s*0?\s*29\b', '10-29'),
-    (r'\+1\s*0?\s*62\b', '10-62'),
-    (r'\+1\s*0?\s*97\b', '10-97'),
-    (r'\+1\s*0?\s*98\b', '10-98'),
-    
-    # Decimal fixes (0.4 -> 10-4, 0.14 -> 10-14)
-    (r'\b0\.1\b', '10-1'),
-    (r'\b0\.3\b', '10-3'),
-    (r'\b0\.4\b', '10-4'),
-    (r'\b0\.7\b', '10-7'),
-    (r'\b0\.14\b', '10-14'),
-    
-    # Joined numbers (108 -> 10-8, 1097 -> 10-97, etc.)
-    (r'\b108\b', '10-8'),
-    (r'\b1022\b', '10-22'),
-    (r'\b1028\b', '10-28'),
-    (r'\b1029\b', '10-29'),
-    (r'\b1031\b', '10-31'),
-    (r'\b1062\b', '10-62'),
-    (r'\b1086\b', '11-86'),
-    (r'\b1097\b', '10-97'),
-    (r'\b1098\b', '10-98'),
-    (r'\b11098\b', '11-98'),
-    (r'\b1186\b', '11-86'),
-    (r'\b1199\b', '11-99'),
-    
-    # Context-aware code detection ("put me at 97" = 10-97, "will be 49" = 10-49)
-    (r'\bput me (?:at|on)\s+97\b', '10-97'),
-    (r'\bput me (?:at|on)\s+98\b', '10-98'),
-    (r'\bshow me\s+97\b', '10-97'),
-    (r'\bshow me\s+98\b', '10-98'),
-    (r'\bshow me\s+8\b', '10-8'),
-    (r'\bshow me\s+7\b', '10-7'),
-    (r'\b(?:will be|be)\s+49\b', '10-49'),
-    (r'\b(?:will be|be)\s+97\b', '10-97'),
-    (r'\b(?:will be|be)\s+98\b', '10-98'),
-    (r"\b(?:I'?m\s+)?going\s+49\b", '10-49'),
-    (r'\b49\s+(?:to|from|south|north|east|west)\b', '10-49'),
-    
-    # Standalone codes after unit callsigns (e.g., "charles 7 49" -> 10-49)
-    (r'\b49\s+from\b', '10-49 from'),
-    
-    # "tonight" misheard as 10-8
-    (r'\btonight\b(?=\s*\.?\s*$)', '10-8'),
-    
-    # 11-86 traffic stop variations
-    (r'\b11\s*86\b', '11-86'),
-    (r'\b11-86\b', '11-86'),
-    
-    # 5150 (mental health hold) - very common
-    (r'\bfifty\s*one\s*fifty\b', '5150'),
-    (r'\b51\s*50\b', '5150'),
-    (r'\bfive\s*one\s*five\s*zero\b', '5150'),
-    
-    # 11-99 officer needs help
-    (r'\beleven\s*ninety\s*nine\b', '11-99'),
-    (r'\beleven\s*99\b', '11-99'),
-    
-    # Common spoken code patterns
-    (r'\bcode\s*three\b', 'Code 3'),
-    (r'\bcode\s*four\b', 'Code 4'),
-    (r'\bcode\s*five\b', 'Code 5'),
-    (r'\bcode\s*six\b', 'Code 6'),
-    (r'\bcode\s*seven\b', 'Code 7'),
-    
-    # PC codes spoken
-    (r'\bfour\s*fifty\s*nine\b', '459'),
-    (r'\btwo\s*eleven\b', '211'),
-    (r'\bone\s*eighty\s*seven\b', '187'),
-    (r'\bfour\s*fifteen\b', '415'),
-    
-    # Phonetic homophones (Deepgram mishears)
-    (r'\bvector\b', 'Victor'),
-    (r'\bkan\b', 'King'),
-    (r'\bcharking\b', 'Charles King'),
-    (r'\bshutty\b', 'Charlie'),
-    (r'\bcharlie\b', 'Charles'),
-    (r'\benvoy\b', 'Edward'),
-    
-    # "ford" after phonetics = 4 (e.g., "charles ford" = "Charles 4")
-    (r'\b(Adam|Boy|Charles|David|Edward|Frank|George|Henry|Ida|John|King|Lincoln|Mary|Nora|Ocean|Paul|Queen|Robert|Sam|Tom|Union|Victor|William|Zebra)\s+ford\b', r'\1 4'),
-    (r'\b(Adam|Boy|Charles|David|Edward|Frank|George|Henry|Ida|John|King|Lincoln|Mary|Nora|Ocean|Paul|Queen|Robert|Sam|Tom|Union|Victor|William|Zebra)\s+for\b(?=\s+\d)', r'\1'),
-    
-    # Common abbreviations/terms
-    (r'\bR\.?P\.?\b', 'RP'),  # Reporting Party
-    (r'\bR\.?O\.?\b', 'RO'),  # Registered Owner
-    (r'\bB\.?O\.?L\.?\b', 'BOL'),  # Be On Lookout
-    (r'\bB\.?O\.?L\.?O\.?\b', 'BOLO'),
-    (r'\bA\.?D\.?W\.?\b', 'ADW'),  # Assault Deadly Weapon
-    (r'\bD\.?U\.?I\.?\b', 'DUI'),
-    (r'\bG\.?O\.?A\.?\b', 'GOA'),  # Gone On Arrival
-    (r'\bA\.?T\.?L\.?\b', 'ATL'),  # Attempt To Locate
-    (r'\bU\.?T\.?L\.?\b', 'UTL'),  # Unable To Locate
-    (r'\bD\.?V\.?\b', 'DV'),  # Domestic Violence
-    (r'\bP\.?D\.?\b', 'PD'),  # Police Department
-    (r'\bA\.?P\.?S\.?\b', 'APS'),  # Adult Protective Services
-    
-    # Direction abbreviations
-    (r'\bnorth\s*bound\b', 'NB'),
-    (r'\bsouth\s*bound\b', 'SB'),
-    (r'\beast\s*bound\b', 'EB'),
-    (r'\bwest\s*bound\b', 'WB'),
-    
-    # Clean up trailing periods after numbers (e.g., "97." -> "10-97")
-    (r'\b(29|49|97|98)\.\s*$', r'10-\1'),
-]
-
-
 mistake_counter = {}
 
 def track_misrecognition_fix(pattern):
@@ -2206,11 +2228,12 @@ PHONETIC_PATTERN = re.compile(
     re.IGNORECASE
 )
 
+# MISRECOGNITION_FIXES (transcript_rules.py) compiled once into grouped single-pass regexes
+misrecognition_engine = RewriteEngine(MISRECOGNITION_FIXES)
+
 def fix_misrecognitions(text: str) -> str:
     """Fix common speech recognition errors"""
-    for pattern, replacement in MISRECOGNITION_FIXES:
-        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
-    return text
+    return misrecognition_engine.apply(text)
 
 def separate_phonetic_letters(text: str) -> str:
     """Separate phonetic letters that run together like 'CharlesQueenLincoln' -> 'Charles Queen Lincoln'"""
@@ -2220,20 +2243,13 @@ def separate_phonetic_letters(text: str) -> str:
         text = PHONETIC_PATTERN.sub(r'\1 \2', text)
     return text
 
+DIGIT_THEN_PHONETIC = re.compile(r'(\d)(' + '|'.join(PHONETIC_UNITS) + r')', re.IGNORECASE)
+PHONETIC_THEN_DIGIT = re.compile(r'(' + '|'.join(PHONETIC_UNITS) + r')(\d)', re.IGNORECASE)
+
 def separate_phonetics_from_numbers(text: str) -> str:
     """Separate phonetics from adjacent numbers like '5ZebraHenry' -> '5 Zebra Henry' or 'Zebra336' -> 'Zebra 336'"""
-    pattern = re.compile(
-        r'(\d)(' + '|'.join(PHONETIC_UNITS) + r')',
-        re.IGNORECASE
-    )
-    text = pattern.sub(r'\1 \2', text)
-    
-    pattern2 = re.compile(
-        r'(' + '|'.join(PHONETIC_UNITS) + r')(\d)',
-        re.IGNORECASE
-    )
-    text = pattern2.sub(r'\1 \2', text)
-    return text
+    text = DIGIT_THEN_PHONETIC.sub(r'\1 \2', text)
+    return PHONETIC_THEN_DIGIT.sub(r'\1 \2', text)
 
 # Pattern: phonetic name followed by combined numbers (with or without space)
 # e.g., "lincoln3104" or "charles 497" -> split after unit number
@@ -2285,63 +2301,53 @@ RECENT_CALLSIGNS_MAX = 5
 recent_callsigns = deque(maxlen=RECENT_CALLSIGNS_MAX)  # stores strings like "Charles 3"
 recent_unit_by_number: dict[str, str] = {}  # "3" -> "Charles"
 
-# Simple Levenshtein distance (tiny + fast for short tokens)
-def _levenshtein(a: str, b: str, max_dist: int = 2) -> int:
-    if a == b:
-        return 0
-    if abs(len(a) - len(b)) > max_dist:
-        return max_dist + 1
-    if not a or not b:
-        return max(len(a), len(b))
-    prev = list(range(len(b) + 1))
-    for i, ca in enumerate(a, 1):
-        cur = [i]
-        # early exit tracking
-        best_row = max_dist + 1
-        for j, cb in enumerate(b, 1):
-            ins = cur[j - 1] + 1
-            dele = prev[j] + 1
-            sub = prev[j - 1] + (ca != cb)
-            v = ins if ins < dele else dele
-            v = sub if sub < v else v
-            cur.append(v)
-            if v < best_row:
-                best_row = v
-        prev = cur
-        if best_row > max_dist:
-            return max_dist + 1
-    return prev[-1]
-
 _PHONETIC_CANON = {p.lower(): p for p in PHONETIC_UNITS}
 _PHONETIC_KEYS = list(_PHONETIC_CANON.keys())
+_phonetic_index = DeletionIndex(_PHONETIC_KEYS, max_distance=1)
+
+# Optional second vocabulary (single words from KEYTERMS and LOCATIONS) for longer tokens
+# only; short words sit too close to ordinary English ("cop" -> "copy").
+FUZZY_EXTRA_VOCAB = os.environ.get("FUZZY_EXTRA_VOCAB", "0") == "1"
+FUZZY_EXTRA_MIN_LEN = int(os.environ.get("FUZZY_EXTRA_MIN_LEN", "6"))
+FUZZY_TOKEN_CACHE_SIZE = 8192
+
+_EXTRA_CANON: dict[str, str] = {}
+for _term in KEYTERMS + LOCATIONS:
+    for _w in _term.split():
+        if re.fullmatch(r"[A-Za-z][A-Za-z-]*", _w) and len(_w) >= FUZZY_EXTRA_MIN_LEN:
+            _EXTRA_CANON.setdefault(_w.lower(), _w)
+for _w in _PHONETIC_CANON:
+    _EXTRA_CANON.pop(_w, None)
+_extra_index = DeletionIndex(_EXTRA_CANON, max_distance=1)
+
+@lru_cache(maxsize=FUZZY_TOKEN_CACHE_SIZE)
+def _fuzzy_fix_token(tok: str) -> str:
+    alpha = re.sub(r"[^A-Za-z-]", "", tok)
+    raw = alpha.lower()
+    if not raw or raw in _PHONETIC_CANON:
+        return tok
+    canon = None
+    # only consider plausible phonetic-ish tokens
+    if 2 <= len(raw) <= 8:
+        hit = _phonetic_index.lookup(raw)
+        if hit is not None:
+            canon = _PHONETIC_CANON[hit[0]]
+    if canon is None and FUZZY_EXTRA_VOCAB and len(raw) >= FUZZY_EXTRA_MIN_LEN and raw not in _EXTRA_CANON:
+        hit = _extra_index.lookup(raw)
+        # leave plurals alone ("patrols" is not a typo of "patrol")
+        if hit is not None and raw != hit[0] + "s" and raw + "s" != hit[0]:
+            canon = _EXTRA_CANON[hit[0]]
+    if canon is None:
+        return tok
+    # replace only the alpha chunk, preserve punctuation around it
+    return re.sub(re.escape(alpha), canon, tok, flags=re.IGNORECASE)
 
 def fuzzy_fix_phonetics(text: str) -> str:
     """Fix near-miss phonetic tokens (e.g., 'boi' -> 'Boy')."""
     if not text:
         return text
     tokens = re.split(r"(\s+)", text)  # keep whitespace
-    for i, tok in enumerate(tokens):
-        if tok.isspace():
-            continue
-        raw = re.sub(r"[^A-Za-z-]", "", tok).lower()
-        if not raw or raw in _PHONETIC_CANON:
-            continue
-        # only consider plausible phonetic-ish tokens
-        if not (2 <= len(raw) <= 8):
-            continue
-        best = None
-        best_d = 3
-        for cand in _PHONETIC_KEYS:
-            d = _levenshtein(raw, cand, max_dist=1)
-            if d < best_d:
-                best_d = d
-                best = cand
-                if d == 0:
-                    break
-        if best is not None and best_d <= 1:
-            # replace only the alpha chunk, preserve punctuation around it
-            tokens[i] = re.sub(re.escape(re.sub(r"[^A-Za-z-]", "", tok)), _PHONETIC_CANON[best], tok, flags=re.IGNORECASE) if re.search(r"[A-Za-z-]", tok) else tok
-    return "".join(tokens)
+    return "".join(tok if tok.isspace() else _fuzzy_fix_token(tok) for tok in tokens)
 
 def _extract_callsigns(text: str) -> list[str]:
     out = []
@@ -2360,17 +2366,19 @@ def update_callsign_memory(text: str) -> None:
         if len(parts) == 2:
             recent_unit_by_number[str(parts[1])] = parts[0]
 
-def fix_short_responses(text: str) -> str:
+def fix_short_responses(text: str, unit_by_number: dict[str, str] | None = None) -> str:
     """If a line starts with a bare unit number, try to restore missing phonetic from recent context."""
     if not text:
         return text
+    if unit_by_number is None:
+        unit_by_number = recent_unit_by_number
     t = text.strip()
     # e.g., "3 good night" or "3, good night"
     m = re.match(r"^(?P<num>\d{1,2})(?P<rest>\b.*)$", t)
     if m:
         num = m.group("num")
         rest = m.group("rest").lstrip()
-        unit = recent_unit_by_number.get(num)
+        unit = unit_by_number.get(num)
         if unit and not re.match(r"^(?:10|11)\s*[- ]?\d", t):  # don't touch actual 10/11 codes
             return f"{unit} {num} {rest}".strip()
     return text
@@ -2393,7 +2401,7 @@ def log_unrecognized_terms(raw_text: str, processed_text: str, decoded_plate_dl:
 
         if unknowns:
             line = f"[{ts}] {', '.join(sorted(set(unknowns)))} | RAW: {raw_text} | OUT: {processed_text}\n"
-            append_flush_fsync(UNRECOGNIZED_TERMS_LOG, line)
+            append_log(UNRECOGNIZED_TERMS_LOG, line)
     except Exception:
         pass
 
@@ -2456,13 +2464,17 @@ def _extract_codes(text: str) -> set[str]:
         found.add(normalize_code_key(m.group(0)))
     return found
 
-def _is_openai_output_safe(raw_in: str, out: str) -> bool:
-    """Reject hallucinated codes or large content additions."""
+def _is_openai_output_safe(raw_in: str, out: str, out_processed: str | None = None) -> bool:
+    """Reject hallucinated codes or large content additions.
+
+    raw_in is the already post-processed model input; out_processed is
+    post_process_transcript(out) when the caller has it.
+    """
     if not out:
         return False
 
-    raw_codes = _extract_codes(post_process_transcript(raw_in))
-    out_codes = _extract_codes(post_process_transcript(out))
+    raw_codes = _extract_codes(raw_in)
+    out_codes = _extract_codes(out_processed if out_processed is not None else post_process_transcript(out))
 
     # Do not allow OpenAI to introduce new codes not present in input.
     if not out_codes.issubset(raw_codes):
@@ -2478,55 +2490,101 @@ def _is_openai_output_safe(raw_in: str, out: str) -> bool:
 
 def enhance_with_local_model(text: str) -> str:
     """Use the locally trained model to lightly clean up radio text (guarded)."""
+    return local_model_result(text, submit_local_model(text))[0]
+
+def submit_local_model(text: str):
+    """Queue text for the local model's next batch; None if the line should not be rewritten."""
     if not text or len(text.strip()) < 5:
-        return text
+        return None
 
     # Reuse the existing heuristic gate (originally for OpenAI) to avoid rewriting short/ambiguous lines.
     if not _should_use_openai(text):
-        return text
+        return None
 
-    if not local_corrector:
-        return text
+    if not local_batcher:
+        return None
+
+    if skip_gate:
+        local_model_stats["gate_checked"] += 1
+        if not skip_gate.should_run(text):
+            local_model_stats["gated"] += 1
+            return None
 
     try:
-        enhanced = (local_corrector.correct(text) or "").strip()
-        if not enhanced:
-            return text
+        return local_batcher.submit(text)
+    except queue.Full:
+        local_model_stats["shed"] += 1
+        return None
 
-        # Keep the same safety policy: do not introduce new radio codes.
-        if _is_openai_output_safe(text, enhanced):
-            return enhanced
+def local_model_result(text: str, future) -> tuple[str, str]:
+    """Wait for a submit_local_model() result and apply the output safety checks.
 
-        return text
+    `text` is already post-processed. Returns (enhanced, final): when the model's output is
+    used, final is post_process_transcript(enhanced) (shared with the safety check);
+    otherwise both are `text`, which needs no second rule pass.
+    """
+    if future is None:
+        return text, text
+
+    try:
+        enhanced = (future.result(timeout=LOCAL_MODEL_TIMEOUT) or "").strip()
+        if not enhanced or enhanced == text:
+            return text, text
+
+        t0 = tracer.start()
+        final = post_process_transcript(enhanced)
+        tracer.stop("post_process_2", t0)
+        # Keep the same safety policy: do not introduce new radio codes.
+        if _is_openai_output_safe(text, enhanced, final):
+            return enhanced, final
+
+        return text, text
+    except FutureTimeout:
+        future.cancel()  # still queued: drop it from its batch
+        local_model_stats["timeouts"] += 1
+        return text, text
     except Exception as e:
         print(f"[LOCAL MODEL ERROR] {e} - using original text")
-        return text
+        return text, text
 
-def post_process_transcript(text: str) -> str:
-    if not text:
-        return text
+# Scanner traffic repeats itself ("10-4", "copy", unit callsigns), so the text-only
+# stages of post_process_transcript are memoized by input text.
+POST_PROCESS_CACHE_SIZE = 4096
+
+@lru_cache(maxsize=POST_PROCESS_CACHE_SIZE)
+def _normalize_transcript(text: str) -> str:
     # Fuzzy phonetic recovery first (helps downstream rules)
     text = fuzzy_fix_phonetics(text)
     text = fix_misrecognitions(text)
     text = separate_phonetic_letters(text)
     text = separate_phonetics_from_numbers(text)
     text = split_callsign_from_code(text)
-    text = fix_tom_to_to(text)
-
-    # Context-aware restoration for short responses
-    text = fix_short_responses(text)
+    return fix_tom_to_to(text)
 
+@lru_cache(maxsize=POST_PROCESS_CACHE_SIZE)
+def _annotate_transcript(text: str) -> str:
     text = annotate_im_shorthand(text)
     text = annotate_codes(text)
     text = annotate_pc_codes(text)
     text = annotate_vc_codes(text)
     text = annotate_hs_codes(text)
     text = annotate_status_31(text)
-    text = annotate_case_numbers(text)
+    return annotate_case_numbers(text)
 
-    # Update callsign memory after all formatting
-    update_callsign_memory(text)
-    return text
+def post_process_transcript(text: str, unit_by_number: dict[str, str] | None = None) -> str:
+    """Rule-based cleanup and code annotation. Reads callsign memory but never updates it;
+    call update_callsign_memory() once per finished utterance."""
+    if not text:
+        return text
+    text = _normalize_transcript(text)
+    # Context-aware restoration for short responses
+    text = fix_short_responses(text, unit_by_number)
+    return _annotate_transcript(text)
+
+def post_process_cache_stats() -> tuple[int, int]:
+    """(hits, misses) across the memoized post-process stages since startup."""
+    a, b = _normalize_transcript.cache_info(), _annotate_transcript.cache_info()
+    return a.hits + b.hits, a.misses + b.misses
 
 # =============================================================================
 # WEBSOCKET TASKS
@@ -2537,114 +2595,171 @@ def post_process_transcript(text: str) -> str:
 # LOCAL ASR (faster-whisper) — replaces Deepgram
 # =============================================================================
 
-ASR_MODEL_ID = os.environ.get("ASR_MODEL_ID", "large-v3")  # or "large-v3-turbo"
 ASR_DEVICE = os.environ.get("ASR_DEVICE", "cpu")  # cpu or cuda
-ASR_COMPUTE_TYPE = os.environ.get("ASR_COMPUTE_TYPE", "float32")  # cpu: int8; cuda: float16/int8_float16
+
+# Written by `python main_6.py --calibrate`; explicit env vars still win over it
+ASR_CONFIG_FILE = Path(os.environ.get("ASR_CONFIG_FILE", "asr_config.json"))
+_asr_cfg = load_asr_config(ASR_CONFIG_FILE)
+if _asr_cfg.get("device") != ASR_DEVICE:
+    _asr_cfg = {}
+
+ASR_MODEL_ID = os.environ.get("ASR_MODEL_ID", _asr_cfg.get("model", "large-v3"))  # or "large-v3-turbo"
+ASR_COMPUTE_TYPE = os.environ.get("ASR_COMPUTE_TYPE", _asr_cfg.get("compute_type", "float32"))  # cpu: int8; cuda: float16/int8_float16
+# Whisper's CPU threads: the cores the local model is not using (0 = faster-whisper's default)
+ASR_CPU_THREADS = int(os.environ.get(
+    "ASR_CPU_THREADS", str(max(1, CPU_COUNT - LOCAL_MODEL_THREADS) if local_corrector else 0)
+))
+if _asr_cfg.get("cpu_threads", ASR_CPU_THREADS) != ASR_CPU_THREADS:
+    print(
+        f"[WARN] {ASR_CONFIG_FILE} was calibrated with cpu_threads={_asr_cfg['cpu_threads']}, "
+        f"running with {ASR_CPU_THREADS}; its RTF may not hold (re-run --calibrate)"
+    )
 
 ASR_CHUNK_SEC = float(os.environ.get("ASR_CHUNK_SEC", "4"))
 ASR_OVERLAP_SEC = float(os.environ.get("ASR_OVERLAP_SEC", "1"))
-ASR_BEAM_SIZE = int(os.environ.get("ASR_BEAM_SIZE", "5"))
+ASR_BEAM_SIZE = int(os.environ.get("ASR_BEAM_SIZE", str(_asr_cfg.get("beam_size", 5))))
+
+# --calibrate inputs: a representative recording and (optionally) its hand transcript
+ASR_CALIBRATE_CLIP = Path(os.environ.get("ASR_CALIBRATE_CLIP", "calibration.wav"))
+ASR_CALIBRATE_REF = Path(os.environ.get("ASR_CALIBRATE_REF", str(ASR_CALIBRATE_CLIP.with_suffix(".txt"))))
+ASR_CALIBRATE_TARGET_RTF = float(os.environ.get("ASR_CALIBRATE_TARGET_RTF", "1.0"))
+ASR_CALIBRATE_HEADROOM = float(os.environ.get("ASR_CALIBRATE_HEADROOM", "0.3"))  # keep RTF 30% under target
 
 # Controls utterance finalization
 ASR_SILENCE_SEC = float(os.environ.get("ASR_SILENCE_SEC", str(SILENCE_GAP_SECONDS)))
 
+# Energy pre-VAD: hops with no speech energy never reach model.transcribe
+ASR_VAD_GATE = os.environ.get("ASR_VAD_GATE", "1") != "0"
+ASR_VAD_RMS = float(os.environ.get("ASR_VAD_RMS", "0.01"))          # absolute speech floor (post-AGC)
+ASR_VAD_MIN_SPEECH_SEC = float(os.environ.get("ASR_VAD_MIN_SPEECH_SEC", "0.15"))
+ASR_STATS_EVERY_SEC = 60.0
+
+# "hop": fixed ASR_CHUNK_SEC windows with overlap stitching
+# "transmission": one transcription per key-up, cut at the squelch tail
+# "stream": re-decode a growing buffer and commit the prefix two decodes agree on
+ASR_SEGMENT_MODE = os.environ.get("ASR_SEGMENT_MODE", "hop")
+ASR_TX_TAIL_SEC = float(os.environ.get("ASR_TX_TAIL_SEC", "0.8"))      # quiet time that ends a transmission
+ASR_TX_MAX_SEC = float(os.environ.get("ASR_TX_MAX_SEC", "20"))         # cap for stuck/open mics
+ASR_TX_PREROLL_SEC = float(os.environ.get("ASR_TX_PREROLL_SEC", "0.2"))
+
+# Backlog catch-up (hop mode): once ASR_CATCHUP_HOPS hops are waiting, decode up to
+# ASR_CATCHUP_MAX_HOPS of them in one batched faster-whisper call instead of hop by hop
+ASR_CATCHUP_HOPS = int(os.environ.get("ASR_CATCHUP_HOPS", "3"))
+ASR_CATCHUP_MAX_HOPS = int(os.environ.get("ASR_CATCHUP_MAX_HOPS", "8"))
+ASR_CATCHUP_BATCH_SIZE = int(os.environ.get("ASR_CATCHUP_BATCH_SIZE", "8"))
+
+ASR_STREAM_INTERVAL_SEC = float(os.environ.get("ASR_STREAM_INTERVAL_SEC", "1.0"))  # re-decode cadence
+ASR_STREAM_TRIM_SEC = float(os.environ.get("ASR_STREAM_TRIM_SEC", "10"))   # trim at a committed segment past this
+ASR_STREAM_MAX_SEC = float(os.environ.get("ASR_STREAM_MAX_SEC", "25"))     # force-commit past this (Whisper sees 30 s)
+
+# Seconds of audio sent to / kept away from the ASR model since startup
+asr_stats = {"transcribed_sec": 0.0, "skipped_sec": 0.0, "catchup_batches": 0, "catchup_sec": 0.0}
+
+
+def _print_asr_stats():
+    total = asr_stats["transcribed_sec"] + asr_stats["skipped_sec"]
+    if total <= 0:
+        return
+    print(
+        f"[LocalASR] VAD gate: transcribed {asr_stats['transcribed_sec']:.0f}s, "
+        f"skipped {asr_stats['skipped_sec']:.0f}s ({asr_stats['skipped_sec'] / total * 100:.0f}% of audio)"
+    )
+    if asr_stats["catchup_batches"]:
+        print(
+            f"[LocalASR] Catch-up: {asr_stats['catchup_batches']} batched decodes "
+            f"covering {asr_stats['catchup_sec']:.0f}s of backlog"
+        )
+    hits, misses = post_process_cache_stats()
+    if hits + misses:
+        print(f"[PostProcess] cache: {hits} hits / {hits + misses} lookups ({hits / (hits + misses) * 100:.0f}%)")
+    if local_batcher and local_batcher.batches:
+        if LOCAL_MODEL_PROCESS:
+            hits, lookups = local_corrector.cache_hits, local_corrector.cache_hits + local_corrector.cache_misses
+        else:
+            hits, lookups = local_corrector.cache.hits, local_corrector.cache.hits + local_corrector.cache.misses
+        print(
+            f"[LocalModel] {local_batcher.items} lines in {local_batcher.batches} batches "
+            f"({local_batcher.items / local_batcher.batches:.1f}/batch), "
+            f"cache {hits} hits / {lookups} lookups, "
+            f"{local_model_stats['timeouts']} past deadline, {local_model_stats['shed']} shed"
+        )
+        if local_model_stats["gate_checked"]:
+            print(
+                f"[LocalModel] skip gate: {local_model_stats['gated']} of {local_model_stats['gate_checked']} lines skipped "
+                f"({local_model_stats['gated'] / local_model_stats['gate_checked'] * 100:.0f}%)"
+            )
+        dec = local_corrector.decode_stats()
+        if dec:
+            print(
+                f"[LocalModel] {LOCAL_MODEL_DECODING} decoding: {dec['greedy_unchanged']} greedy unchanged, "
+                f"{dec['greedy_rejected']} greedy rejected, {dec['beam']} beam | {dec['avg_ms']:.1f} ms/line"
+            )
+    if output_stage.submitted:
+        for line in output_stage.summary_lines():
+            print(f"[Output] {line}")
+    for line in tracer.summary_lines():
+        print(f"[Trace] {line}")
 
-def _bytes_to_float32_pcm(pcm16_bytes: bytes) -> np.ndarray:
-    a = np.frombuffer(pcm16_bytes, dtype=np.int16)
-    return (a.astype(np.float32) / 32768.0).copy()
 
+def _take_block(item) -> np.ndarray:
+    """Unpack an audio_q item and record how long it waited in the queue."""
+    t_queued, block = item
+    tracer.record("queue_wait", time.perf_counter() - t_queued)
+    return block
 
-def _norm_words(s: str):
-    # Normalize for overlap matching: lowercase, strip punctuation
-    if not s:
-        return []
-    words = []
-    for w in s.split():
-        w2 = re.sub(r"[^A-Za-z0-9']+", "", w).lower()
-        if w2:
-            words.append(w2)
-    return words
 
-def _word_overlap_delta(prev: str, curr: str) -> str:
-    """Return only the new tail of curr compared to prev using word overlap (normalized).
+def process_utterance_text(raw_text: str, now: float, captured_at: float | None = None):
+    """Run the exact same post-process pipeline used for Deepgram utterances.
 
-    This prevents repeating the same chunk over and over when chunking with overlap.
+    captured_at: perf_counter() when the utterance's newest audio left the DSP stage,
+    used to trace capture -> final caption latency.
     """
-    prev = (prev or "").strip()
-    curr = (curr or "").strip()
-    if not curr:
-        return ""
-    if not prev:
-        return curr
+    job = _begin_utterance(raw_text, now, captured_at)
+    if job is not None:
+        _finish_utterance(*job)
 
-    # If identical after normalization, no delta
-    pw_n = _norm_words(prev)
-    cw_n = _norm_words(curr)
-    if pw_n and cw_n and pw_n == cw_n:
-        return ""
-
-    pw = prev.split()
-    cw = curr.split()
-
-    # Find best overlap of normalized word suffix/prefix, but slice using original cw
-    max_k = min(len(pw_n), len(cw_n))
-    best = 0
-    for k in range(1, max_k + 1):
-        if pw_n[-k:] == cw_n[:k]:
-            best = k
-
-    if best > 0:
-        return " ".join(cw[best:]).strip()
 
-    # If curr (normalized) is fully contained in prev (normalized), treat as no new info
-    prev_n_join = " ".join(pw_n)
-    curr_n_join = " ".join(cw_n)
-    if curr_n_join and curr_n_join in prev_n_join:
-        return ""
-
-    # Otherwise return curr (as-is)
-    return curr
-
-    pw = prev.split()
-    cw = curr.split()
-    max_k = min(len(pw), len(cw))
-    best = 0
-    for k in range(1, max_k + 1):
-        if pw[-k:] == cw[:k]:
-            best = k
-    if best > 0:
-        return " ".join(cw[best:]).strip()
-    # If curr is a substring of prev, no new info
-    if curr in prev:
-        return ""
-    return curr
+def _begin_utterance(raw_text: str, now: float, captured_at: float | None = None,
+                     unit_by_number: dict[str, str] | None = None) -> tuple | None:
+    """First post-process pass; hands the line to the local model without waiting for it.
 
-
-def process_utterance_text(raw_text: str, now: float):
-    """Run the exact same post-process pipeline used for Deepgram utterances."""
+    unit_by_number overrides the callsign memory (see utterance_worker_run)."""
     raw_text = (raw_text or "").strip()
     if not raw_text:
-        return
+        return None
 
-    combined = raw_text
+    t_start = time.perf_counter()  # not tracer.start(): the transcript store keeps per-utterance latencies
 
     # First pass: basic regex processing
-    combined_processed = post_process_transcript(combined)
+    t0 = tracer.start()
+    combined_processed = post_process_transcript(raw_text, unit_by_number)
+    tracer.stop("post_process_1", t0)
 
-    # Second pass: local model enhancement
-    combined_enhanced = enhance_with_local_model(combined_processed)
+    return raw_text, combined_processed, submit_local_model(combined_processed), now, captured_at, t_start
 
-    # Third pass: re-apply regex rules / formatting
-    combined_final = post_process_transcript(combined_enhanced)
+
+def _finish_utterance(combined: str, combined_processed: str, local_future, now: float,
+                      captured_at: float | None, t_start: float):
+    # Second pass: local model enhancement. The rules run again only on text the model
+    # changed; otherwise the first pass already produced the final text.
+    t0 = tracer.start()
+    combined_enhanced, combined_final = local_model_result(combined_processed, local_future)
+    tracer.stop("local_model", t0)
 
     # Drop obvious ASR garbage
     if is_probably_noise(combined_final):
         return
 
+    # Learn callsigns from the finished utterance (once, after all formatting)
+    update_callsign_memory(combined_final)
+
+    t0 = tracer.start()
     decoded_lookup = lookup_decoder.process_final(combined, now)
     decoded_plate_dl = plate_dl_decoder.process_final(combined, now)
+    tracer.stop("decoders", t0)
 
     # Speaker tagging (skip if formatted 10-27/28/29 block)
+    speaker_tag = None
     if not (combined_final.strip().startswith("10-") and "\n" in combined_final):
         speaker_tag = classify_speaker(combined_final)
         combined_final = f"[{speaker_tag}] {combined_final}"
@@ -2654,53 +2769,228 @@ def process_utterance_text(raw_text: str, now: float):
 
     alert = contains_alert(combined)
     caption_text = f"🚨 {combined_final}" if alert else combined_final
+    # Set here rather than in write_utterance so it stays ordered with the ASR loops' partials
+    output_stage.set_live(caption_text)
+    output_stage.submit(UtteranceRecord(
+        combined, combined_enhanced, combined_final, caption_text, alert, speaker_tag,
+        decoded_lookup, decoded_plate_dl, now, captured_at, t_start, time.perf_counter(),
+    ))
 
-    append_flush_fsync(OBS_CAPTION_LOG_FILE, f"    [RAW] {combined}\n")
-    append_flush_fsync(OBS_CAPTION_LOG_FILE, f"    [ENHANCED] {combined_enhanced}\n")
-    append_flush_fsync(OBS_CAPTION_LOG_FILE, f"    [FINAL] {combined_final}\n")
 
-    if TRAINING_MODE:
-        print("=== TRAINING MODE ===")
-        print(f"[RAW] {combined}")
-        print(f"[ENHANCED] {combined_enhanced}")
-        print(f"[FINAL] {combined_final}")
-        obs_writer.write_training_block(combined, combined_enhanced, combined_final, decoded_lookup=decoded_lookup, decoded_plate_dl=decoded_plate_dl)
-        if decoded_lookup:
-            print(f"[DECODED LOOKUP] {decoded_lookup}")
-        if decoded_plate_dl:
-            print(f"[DECODED PLATE/DL] {decoded_plate_dl}")
-        print("=" * 50)
-
-    print(f"\r{' ' * 120}\r{combined_final}")
-    obs_writer.write_final(caption_text)
-    obs_writer.update_live(caption_text)
-    full_logger.add_entry(combined_final, kind="final", lookup_decoded=decoded_lookup, plate_dl_decoded=decoded_plate_dl)
+# =============================================================================
+# ASYNC OUTPUT STAGE
+# =============================================================================
+# Finished utterances are written (caption log, training block, final caption, full log
+# HTML, overlay pushes) by a task on main()'s event loop instead of the thread that ran
+# ASR / the local model. OUTPUT_QUEUE_SIZE records may wait; past that the producer blocks
+# and the wait is counted. Live caption updates are coalesced: only the newest is written.
+OUTPUT_QUEUE_SIZE = int(os.environ.get("OUTPUT_QUEUE_SIZE", "64"))
 
-    # Pinned alert area
-    if re.search(r"\b(10\s*[- ]?33|11\s*[- ]?99|10-33|11-99)\b", combined_final, re.IGNORECASE):
-        alert_html = """<!doctype html><html><head><meta charset='utf-8'>
+ALERT_PAGE_HTML = """<!doctype html><html><head><meta charset='utf-8'>
 <style>body{margin:0;background:black;color:#ff3b3b;font-family:Arial,sans-serif;font-weight:800}
 .wrap{padding:16px} .big{font-size:48px;letter-spacing:1px}
 .small{font-size:18px;color:#fff;margin-top:8px;opacity:.9}
 </style></head><body><div class='wrap'>
 <div class='big'>ALERT</div>
-<div class='small'>{}</div>
-</div></body></html>""".format(htmlmod.escape(combined_final))
-        atomic_write(ALERTS_HTML, alert_html)
+<div class='small'>%(text)s</div>
+</div></body></html>"""
+
+
+class UtteranceRecord(NamedTuple):
+    raw: str
+    enhanced: str
+    final: str
+    caption: str                 # final, with the alert marker when alert is set
+    alert: bool
+    speaker: str | None
+    decoded_lookup: str | None
+    decoded_plate_dl: str | None
+    now: float                   # clock.now() when the utterance was finalized
+    captured_at: float | None    # perf_counter() when the newest audio left the DSP stage
+    t_start: float               # perf_counter() when post-processing began
+    submitted_at: float          # perf_counter() when handed to the output stage
+
+
+def write_utterance(rec: UtteranceRecord):
+    """Write one finished utterance everywhere it goes (runs on the output stage)."""
+    t_write = time.perf_counter()
+    tracer.record("output_queue", t_write - rec.submitted_at)
+    t0 = tracer.start()
+    if rec.alert and overlay:
+        overlay.publish_alert(highlight_to_html(rec.final))
+
+    append_log(
+        OBS_CAPTION_LOG_FILE,
+        f"    [RAW] {rec.raw}\n    [ENHANCED] {rec.enhanced}\n    [FINAL] {rec.final}\n",
+        urgent=rec.alert,
+    )
 
+    if TRAINING_MODE:
+        print("=== TRAINING MODE ===")
+        print(f"[RAW] {rec.raw}")
+        print(f"[ENHANCED] {rec.enhanced}")
+        print(f"[FINAL] {rec.final}")
+        obs_writer.write_training_block(rec.raw, rec.enhanced, rec.final, decoded_lookup=rec.decoded_lookup, decoded_plate_dl=rec.decoded_plate_dl)
+        if rec.decoded_lookup:
+            print(f"[DECODED LOOKUP] {rec.decoded_lookup}")
+        if rec.decoded_plate_dl:
+            print(f"[DECODED PLATE/DL] {rec.decoded_plate_dl}")
+        print("=" * 50)
+
+    print(f"\r{' ' * 120}\r{rec.final}")
+    # Stamped with the utterance's own time, as --rebuild-views does from the transcript store
+    obs_writer.write_final(rec.caption, urgent=rec.alert, at=rec.now)
+    full_logger.add_entry(rec.final, kind="final", lookup_decoded=rec.decoded_lookup, plate_dl_decoded=rec.decoded_plate_dl,
+                          at=rec.now)
+
+    # Pinned alert area
+    if re.search(r"\b(10\s*[- ]?33|11\s*[- ]?99|10-33|11-99)\b", rec.final, re.IGNORECASE):
+        atomic_write(OBS_ALERTS_HTML, ALERT_PAGE_HTML % {"text": htmlmod.escape(rec.final)})
+
+    tracer.stop("writers", t0)
+    tracer.stop("utterance_total", rec.t_start)
+    t_end = time.perf_counter()
+    if rec.captured_at is not None:
+        tracer.record("capture_to_final", t_end - rec.captured_at)
+
+    if transcript_store:
+        latencies = {
+            "process": rec.submitted_at - rec.t_start,
+            "output_queue": t_write - rec.submitted_at,
+            "write": t_end - t_write,
+        }
+        if rec.captured_at is not None:
+            latencies["capture_to_final"] = t_end - rec.captured_at
+        plates = re.findall(r"(?:Plate|DL#):\s*(\S+)", rec.decoded_plate_dl or "")
+        transcript_store.add(
+            rec.now, rec.raw, rec.enhanced, rec.final, speaker=rec.speaker, alert=rec.alert,
+            decoded_lookup=rec.decoded_lookup, decoded_plate_dl=rec.decoded_plate_dl,
+            latencies={k: round(v * 1000, 2) for k, v in latencies.items()},
+            codes=sorted(_extract_codes(rec.final)), callsigns=_extract_callsigns(rec.final), plates=plates,
+        )
+
+
+transcript_store: TranscriptStore | None = None  # opened by run_sources() / run_rebuild_views()
+
+
+def open_transcript_store() -> TranscriptStore | None:
+    """TRANSCRIPT_DB, opened on first use so that importing this module creates no files."""
+    global transcript_store
+    if transcript_store is None and TRANSCRIPT_DB:
+        transcript_store = TranscriptStore(TRANSCRIPT_DB)
+        atexit.register(transcript_store.close)
+    return transcript_store
+
+output_stage = OutputStage(write_utterance, obs_writer.update_live, maxsize=OUTPUT_QUEUE_SIZE)
+
+
+# =============================================================================
+# UTTERANCE OUTPUT STAGE
+# =============================================================================
+# ASR loops hand finished utterances over with submit_utterance(). With the local model
+# loaded they are finished on utterance_worker_run()'s thread; utterances that pile up
+# while the model is busy reach it together and share one batch.
+utterance_q: "queue.Queue[tuple[str, float, float | None] | None]" = queue.Queue()
+
+def submit_utterance(raw_text: str, now: float, captured_at: float | None = None):
+    if ASYNC_UTTERANCES:
+        utterance_q.put((raw_text, now, captured_at))
+    else:
+        process_utterance_text(raw_text, now, captured_at=captured_at)
+
+
+def utterance_worker_run():
+    """Finish queued utterances in arrival order until the None end-of-input marker."""
+    while True:
+        items = [utterance_q.get()]
+        while items[-1] is not None:
+            try:
+                items.append(utterance_q.get_nowait())
+            except queue.Empty:
+                break
+        # Submit every line to the local model first, then wait for them in order. A line
+        # begun before the ones ahead of it finished could not see the callsigns they add
+        # to the memory, so it is begun with a copy that already holds the callsigns of
+        # their first-pass text; if the real memory disagrees once they are finished, the
+        # line is begun again so the result matches one-at-a-time processing.
+        memory = dict(recent_unit_by_number)
+        jobs = []
+        for item in items:
+            if item is None:
+                continue
+            seen = dict(memory)
+            job = _begin_utterance(*item, unit_by_number=seen)
+            if job is not None:
+                jobs.append((item, seen, job))
+                for cs in _extract_callsigns(job[1]):
+                    parts = cs.split()
+                    if len(parts) == 2:
+                        memory[parts[1]] = parts[0]
+        for item, seen, job in jobs:
+            normalized = _normalize_transcript(job[0])
+            if fix_short_responses(normalized, seen) != fix_short_responses(normalized):
+                if job[2] is not None:
+                    job[2].cancel()
+                job = _begin_utterance(*item)
+            _finish_utterance(*job)
+        if items[-1] is None:
+            return
 
-def local_asr_run_forever():
-    """Consume mic audio from audio_q, transcribe via faster-whisper, segment by silence, and feed pipeline.
+
+def _transcribe_text(model, audio: np.ndarray) -> str:
+    t0 = tracer.start()
+    try:
+        segments, _info = model.transcribe(
+            audio,
+            language="en",
+            vad_filter=True,
+            beam_size=ASR_BEAM_SIZE,
+        )
+        return " ".join(seg.text.strip() for seg in segments).strip()
+    except Exception as e:
+        print(f"[LocalASR] Transcribe error: {e}")
+        return ""
+    finally:
+        tracer.stop("transcribe", t0)
+
+
+def _transcribe_words(model, audio: np.ndarray, offset_sec: float, **kwargs):
+    """Transcribe with word timestamps; returns ([(start, end, word)], [segment end]) in absolute seconds.
+
+    `model` may be a WhisperModel or a BatchedInferencePipeline (pass batch_size=... for the latter).
+    """
+    words = []
+    seg_ends = []
+    t0 = tracer.start()
+    try:
+        segments, _info = model.transcribe(
+            audio,
+            language="en",
+            vad_filter=True,
+            beam_size=ASR_BEAM_SIZE,
+            word_timestamps=True,
+            **kwargs,
+        )
+        for seg in segments:
+            seg_ends.append(offset_sec + seg.end)
+            for w in seg.words or []:
+                words.append((offset_sec + w.start, offset_sec + w.end, w.word))
+    except Exception as e:
+        print(f"[LocalASR] Transcribe error: {e}")
+    tracer.stop("transcribe", t0)
+    return words, seg_ends
+
+
+def _asr_hop_loop(model):
+    """Fixed ASR_CHUNK_SEC hops transcribed with ASR_OVERLAP_SEC of overlap.
 
     Key properties:
     - Uses a hop+overlap audio window so we *consume* new audio and do not re-transcribe the same samples.
-    - Uses word-overlap delta to avoid repeating text across overlapping windows.
+    - De-duplicates overlapping windows by absolute audio time: words in a window's trailing
+      overlap are deferred to the next window (which hears them with more context), and words
+      whose midpoint falls in the already-committed region are discarded.
     - Finalizes an utterance only after ASR_SILENCE_SEC of no *new* text.
     """
-    print(f"[LocalASR] Loading model: {ASR_MODEL_ID} (device={ASR_DEVICE}, compute={ASR_COMPUTE_TYPE})")
-    model = WhisperModel(ASR_MODEL_ID, device=ASR_DEVICE, compute_type=ASR_COMPUTE_TYPE)
-    print("[LocalASR] Model loaded.")
-
     hop_samples = int(ASR_CHUNK_SEC * SAMPLE_RATE)
     overlap_samples = int(ASR_OVERLAP_SEC * SAMPLE_RATE)
     if overlap_samples < 0:
@@ -2708,95 +2998,437 @@ def local_asr_run_forever():
     if hop_samples <= 0:
         hop_samples = int(4 * SAMPLE_RATE)
 
-    # Audio consumption buffers
-    pending = np.zeros(0, dtype=np.float32)           # unprocessed new audio
-    overlap_buf = np.zeros(0, dtype=np.float32)       # last overlap_samples of previously processed audio
+    # Unread audio plus the overlap history behind it. Each pass moves everything waiting
+    # on audio_q into the ring, so the ring is what bounds the backlog: when the loop stalls
+    # the oldest unread audio is overwritten and counted in ring.dropped_samples.
+    max_pending = int((ASR_CHUNK_SEC + ASR_OVERLAP_SEC) * SAMPLE_RATE * 10)
+    ring = AudioRingBuffer(max_pending + overlap_samples)
+    reported_drops = 0
+
+    vad = EnergyVAD(SAMPLE_RATE, threshold=ASR_VAD_RMS, min_speech_sec=ASR_VAD_MIN_SPEECH_SEC)
+    batched = BatchedInferencePipeline(model=model)
+    next_stats_time = clock.now() + ASR_STATS_EVERY_SEC
 
     # Rolling text state
-    prev_chunk_text = ""
+    committed_until = 0.0   # absolute seconds of audio already turned into text
+    tail_words = []         # words in the current overlap region, re-decoded by the next window
     utterance = ""
-    last_speech_time = time.time()
+    last_speech_time = clock.now()
+    block_t = speech_t = time.perf_counter()   # DSP hand-off time of the newest block / newest text
+    end_of_input = False
 
     while True:
-        # Pull audio from the queue (non-blocking-ish)
-        try:
-            pcm16 = audio_q.get(timeout=0.25)
-            f32 = _bytes_to_float32_pcm(pcm16)
-            pending = np.concatenate([pending, f32])
-            # Prevent unbounded growth if something stalls
-            max_pending = int((ASR_CHUNK_SEC + ASR_OVERLAP_SEC) * SAMPLE_RATE * 10)
-            if len(pending) > max_pending:
-                pending = pending[-max_pending:]
-        except Exception:
-            pass
-
-        now = time.time()
-
-        # Finalize on silence (no new delta for a bit)
-        if utterance and (now - last_speech_time) >= ASR_SILENCE_SEC:
-            process_utterance_text(utterance, now)
+        # Wait briefly for audio, then take everything else already queued
+        if not end_of_input:
+            try:
+                item = audio_q.get(timeout=0.25)
+                while item is not None:
+                    block_t = item[0]
+                    block = _take_block(item)
+                    ring.write(block)
+                    clock.advance(len(block))
+                    item = audio_q.get_nowait()
+                end_of_input = True
+            except queue.Empty:
+                pass
+
+        if ring.dropped_samples != reported_drops:
+            reported_drops = ring.dropped_samples
+            print(f"[LocalASR] ASR fell behind: {reported_drops / SAMPLE_RATE:.2f}s of audio dropped so far")
+
+        now = clock.now()
+
+        # Finalize on silence (no new delta for a bit). Not while whole hops are still
+        # waiting: after a stall the clock has run ahead of the audio decoded so far.
+        if ((utterance or tail_words) and (now - last_speech_time) >= ASR_SILENCE_SEC
+                and ring.available() < hop_samples):
+            utterance = (utterance + " " + words_text(tail_words)).strip()
+            tail_words = []
+            if utterance:
+                submit_utterance(utterance, now, captured_at=speech_t)
             utterance = ""
-            prev_chunk_text = ""
-            overlap_buf = np.zeros(0, dtype=np.float32)
-            pending = np.zeros(0, dtype=np.float32)
-            obs_writer.update_live("")
+            ring.clear()
+            output_stage.set_live("")
 
         # Not enough new audio yet for a hop
-        if len(pending) < hop_samples:
+        if ring.available() < hop_samples:
+            if end_of_input:
+                break
             continue
 
-        # Consume exactly one hop, but transcribe with overlap
-        hop = pending[:hop_samples]
-        pending = pending[hop_samples:]
+        # Consume one hop (or a batch of hops when catching up), but transcribe with overlap
+        # (zero-copy view of the ring; nothing writes to it until the next loop iteration)
+        backlog_hops = ring.available() // hop_samples
+        n_hops = min(backlog_hops, ASR_CATCHUP_MAX_HOPS) if backlog_hops >= ASR_CATCHUP_HOPS else 1
+        hop_start = ring.read_index
+        window_start = max(hop_start - overlap_samples, ring.oldest_index)
+        window_end = hop_start + n_hops * hop_samples
+        window_end_sec = window_end / SAMPLE_RATE
+        window = ring.view(window_start, window_end)
+        ring.advance(n_hops * hop_samples)
+
+        if now >= next_stats_time:
+            _print_asr_stats()
+            next_stats_time = now + ASR_STATS_EVERY_SEC
+
+        # Dead air: decide on the new hop only, the overlap was already judged last time
+        if n_hops == 1 and ASR_VAD_GATE and not vad.has_speech(window[-hop_samples:]):
+            asr_stats["skipped_sec"] += hop_samples / SAMPLE_RATE
+            # No follow-up decode of the overlap region: keep what the last window heard there
+            if tail_words:
+                utterance = (utterance + " " + words_text(tail_words)).strip()
+                tail_words = []
+            committed_until = max(committed_until, window_end_sec)
+            continue
+        asr_stats["transcribed_sec"] += n_hops * hop_samples / SAMPLE_RATE
 
-        if overlap_samples > 0:
-            # ensure overlap_buf is the right size
-            if len(overlap_buf) > overlap_samples:
-                overlap_buf = overlap_buf[-overlap_samples:]
-            window = np.concatenate([overlap_buf, hop])
+        if n_hops > 1:
+            t0 = time.time()
+            words, _seg_ends = _transcribe_words(
+                batched, window, window_start / SAMPLE_RATE, batch_size=ASR_CATCHUP_BATCH_SIZE,
+            )
+            elapsed = time.time() - t0
+            audio_sec = len(window) / SAMPLE_RATE
+            asr_stats["catchup_batches"] += 1
+            asr_stats["catchup_sec"] += audio_sec
+            print(
+                f"[LocalASR] Catch-up: backlog {backlog_hops} hops ({backlog_hops * hop_samples / SAMPLE_RATE:.0f}s), "
+                f"decoded {n_hops} hops / {audio_sec:.1f}s (batch_size={ASR_CATCHUP_BATCH_SIZE}) "
+                f"in {elapsed:.1f}s, RTF {elapsed / audio_sec:.2f}"
+            )
         else:
-            window = hop
+            words, _seg_ends = _transcribe_words(model, window, window_start / SAMPLE_RATE)
+        cutoff = window_end_sec - overlap_samples / SAMPLE_RATE
+        fresh = [w for w in words if (w[0] + w[1]) / 2 >= committed_until]
+        delta = words_text([w for w in fresh if (w[0] + w[1]) / 2 < cutoff])
+        tail_words = [w for w in fresh if (w[0] + w[1]) / 2 >= cutoff]
+        committed_until = max(committed_until, cutoff)
+
+        if not fresh:
+            continue
 
-        # Update overlap for next time
-        if overlap_samples > 0:
-            overlap_buf = window[-overlap_samples:].copy()
+        # Append delta to current utterance
+        if delta:
+            utterance = (utterance + " " + delta).strip() if utterance else delta
+        last_speech_time = now
+        speech_t = block_t
 
-        # Transcribe this window
-        try:
-            segments, _info = model.transcribe(
-                window,
-                language="en",
-                vad_filter=True,
-                beam_size=ASR_BEAM_SIZE,
-            )
-            chunk_text = " ".join(seg.text.strip() for seg in segments).strip()
-        except Exception as e:
-            print(f"[LocalASR] Transcribe error: {e}")
-            chunk_text = ""
+        # Live preview (committed text + words still awaiting the next window)
+        live = (utterance + " " + words_text(tail_words)).strip()
+        if len(live) > LIVE_MAX_CHARS:
+            live = "…" + live[-LIVE_MAX_CHARS:]
+        output_stage.set_live(live)
+
+    # End of input (replay): finalize whatever is still open
+    utterance = (utterance + " " + words_text(tail_words)).strip()
+    if utterance:
+        submit_utterance(utterance, clock.now(), captured_at=speech_t)
+    output_stage.set_live("")
 
-        if not chunk_text:
-            continue
 
-        # Compute delta vs previous chunk to reduce duplication
-        delta = _word_overlap_delta(prev_chunk_text, chunk_text)
-        prev_chunk_text = chunk_text
+def _asr_transmission_loop(model):
+    """One transcription per radio transmission (key-up), cut by TransmissionSegmenter.
 
-        if not delta:
+    No overlap is re-transcribed and no text stitching is needed; each transmission is
+    finalized as its own utterance as soon as its squelch tail (ASR_TX_TAIL_SEC) is seen.
+    """
+    # Must hold the longest transmission plus its pre-roll
+    ring = AudioRingBuffer(int((ASR_TX_MAX_SEC + ASR_TX_PREROLL_SEC + 5.0) * SAMPLE_RATE))
+    vad = EnergyVAD(SAMPLE_RATE, threshold=ASR_VAD_RMS, min_speech_sec=ASR_VAD_MIN_SPEECH_SEC)
+    segmenter = TransmissionSegmenter(
+        vad, SAMPLE_RATE,
+        tail_sec=ASR_TX_TAIL_SEC,
+        max_sec=ASR_TX_MAX_SEC,
+        preroll_sec=ASR_TX_PREROLL_SEC,
+    )
+    next_stats_time = clock.now() + ASR_STATS_EVERY_SEC
+    block_t = time.perf_counter()
+
+    while True:
+        try:
+            item = audio_q.get(timeout=0.25)
+        except queue.Empty:
             continue
+        if item is None:
+            block = None
+            spans = segmenter.flush()
+        else:
+            block_t = item[0]
+            block = _take_block(item)
+            # The segmenter consumes every sample in order; the ring only keeps history for view()
+            ring.write(block)
+            ring.advance(len(block))
+            clock.advance(len(block))
+            asr_stats["skipped_sec"] += len(block) / SAMPLE_RATE
+            spans = segmenter.feed(block)
+
+        for start, end in spans:
+            start = max(start, ring.oldest_index)
+            asr_stats["skipped_sec"] -= (end - start) / SAMPLE_RATE
+            asr_stats["transcribed_sec"] += (end - start) / SAMPLE_RATE
+            text = _transcribe_text(model, ring.view(start, end))
+            if text:
+                submit_utterance(text, clock.now(), captured_at=block_t)
+
+        if block is None:
+            return
+        now = clock.now()
+        if now >= next_stats_time:
+            _print_asr_stats()
+            next_stats_time = now + ASR_STATS_EVERY_SEC
 
-        # Append delta to current utterance
-        utterance = (utterance + " " + delta).strip() if utterance else delta
-        last_speech_time = now
 
-        # Live preview
-        live = utterance
+def _asr_stream_loop(model):
+    """Streaming captions: re-decode the open utterance every ASR_STREAM_INTERVAL_SEC (LocalAgreement-2).
+
+    Words are committed once two consecutive decodes agree on them and go straight to the
+    live caption; the decode buffer is trimmed at committed segment ends. The utterance is
+    finalized after ASR_SILENCE_SEC without a new commit. Commit latency (audio time of a
+    word's end -> wall time it was committed) is reported with the periodic stats.
+    """
+    interval = max(1, int(ASR_STREAM_INTERVAL_SEC * SAMPLE_RATE))
+    ring = AudioRingBuffer(int((ASR_STREAM_MAX_SEC + 10.0) * SAMPLE_RATE))
+    vad = EnergyVAD(SAMPLE_RATE, threshold=ASR_VAD_RMS, min_speech_sec=ASR_VAD_MIN_SPEECH_SEC)
+    hyp = HypothesisBuffer()
+    latency = LatencyReport()
+    preroll = int(ASR_TX_PREROLL_SEC * SAMPLE_RATE)
+
+    buf_start = 0                   # absolute sample where the decode buffer begins
+    utterance = ""
+    last_commit_time = clock.now()
+    last_write_time = time.time()   # wall time: commit latency measures real processing delay
+    next_stats_time = clock.now() + ASR_STATS_EVERY_SEC
+    block_t = speech_t = time.perf_counter()
+
+    while True:
+        try:
+            item = audio_q.get(timeout=0.25)
+            if item is None:
+                break
+            block_t = item[0]
+            block = _take_block(item)
+            ring.write(block)
+            clock.advance(len(block))
+            last_write_time = time.time()
+        except queue.Empty:
+            pass
+
+        now = clock.now()
+
+        if (utterance or hyp.tentative) and (now - last_commit_time) >= ASR_SILENCE_SEC:
+            final = (utterance + " " + words_text(hyp.flush())).strip()
+            if final:
+                submit_utterance(final, now, captured_at=speech_t)
+            utterance = ""
+            buf_start = ring.write_index
+            ring.clear()
+            hyp.reset(buf_start / SAMPLE_RATE)
+            output_stage.set_live("")
+
+        if now >= next_stats_time:
+            _print_asr_stats()
+            print(f"[LocalASR] Commit latency: {latency.summary()}")
+            next_stats_time = now + ASR_STATS_EVERY_SEC
+
+        if ring.available() < interval:
+            continue
+
+        new_audio = ring.view(ring.read_index, ring.write_index)
+        ring.advance(len(new_audio))
+        if ASR_VAD_GATE and not hyp.tentative and not vad.has_speech(new_audio):
+            asr_stats["skipped_sec"] += len(new_audio) / SAMPLE_RATE
+            if not utterance:
+                # Nothing open: keep only a pre-roll of silence in the decode buffer
+                buf_start = max(buf_start, ring.write_index - preroll)
+            continue
+        asr_stats["transcribed_sec"] += len(new_audio) / SAMPLE_RATE
+
+        buf_start = max(buf_start, ring.oldest_index)
+        words, seg_ends = _transcribe_words(model, ring.view(buf_start, ring.write_index), buf_start / SAMPLE_RATE)
+        committed = hyp.insert(words)
+
+        now = clock.now()
+        if committed:
+            audio_now = ring.write_index / SAMPLE_RATE
+            wall_delay = time.time() - last_write_time
+            for w in committed:
+                latency.add(wall_delay + (audio_now - w[1]))
+            utterance = (utterance + " " + words_text(committed)).strip()
+            last_commit_time = now
+            speech_t = block_t
+
+        live = (utterance + " " + words_text(hyp.tentative)).strip()
         if len(live) > LIVE_MAX_CHARS:
             live = "…" + live[-LIVE_MAX_CHARS:]
-        obs_writer.update_live(live)
+        output_stage.set_live(live)
+
+        # Keep the re-decoded buffer short
+        buf_len = ring.write_index - buf_start
+        if buf_len > ASR_STREAM_TRIM_SEC * SAMPLE_RATE:
+            cut = max((e for e in seg_ends if e <= hyp.committed_end), default=None)
+            if cut is not None:
+                buf_start = max(buf_start, int(cut * SAMPLE_RATE))
+            elif buf_len > ASR_STREAM_MAX_SEC * SAMPLE_RATE:
+                utterance = (utterance + " " + words_text(hyp.flush())).strip()
+                buf_start = ring.write_index
+                last_commit_time = now
+
+    # End of input (replay): commit whatever is still tentative
+    final = (utterance + " " + words_text(hyp.flush())).strip()
+    if final:
+        submit_utterance(final, clock.now(), captured_at=speech_t)
+    print(f"[LocalASR] Commit latency: {latency.summary()}")
+    output_stage.set_live("")
+
+
+def run_calibration(cpu_threads: int = ASR_CPU_THREADS):
+    """Benchmark candidate ASR configs on ASR_CALIBRATE_CLIP and persist the pick to ASR_CONFIG_FILE.
+
+    cpu_threads should be what the live pipeline gives Whisper (ASR_CPU_THREADS).
+    """
+    if not ASR_CALIBRATE_CLIP.exists():
+        print(f"[Calibrate] Reference clip not found: {ASR_CALIBRATE_CLIP} (set ASR_CALIBRATE_CLIP)")
+        return
+    cfg = calibrate(
+        ASR_CALIBRATE_CLIP,
+        ASR_DEVICE,
+        reference_path=ASR_CALIBRATE_REF,
+        target_rtf=ASR_CALIBRATE_TARGET_RTF,
+        headroom=ASR_CALIBRATE_HEADROOM,
+        cpu_threads=cpu_threads,
+    )
+    if cfg is None:
+        print("[Calibrate] No candidate could be loaded; config unchanged")
+        return
+    save_asr_config(ASR_CONFIG_FILE, cfg)
+    print(
+        f"[Calibrate] Selected {cfg['model']} ({cfg['compute_type']}, beam={cfg['beam_size']}, "
+        f"{cfg['cpu_threads'] or 'default'} threads, RTF {cfg['rtf']:.2f}) -> {ASR_CONFIG_FILE}"
+    )
+
+
+def run_gate_training(recall: float = LOCAL_MODEL_GATE_RECALL):
+    """Fit the local-model skip gate on the [RAW]/[ENHANCED] training blocks and save it.
+
+    A pair counts as edited when the model's output differs from what the regex pass alone
+    makes of the RAW line; only lines that pass _should_use_openai() are used.
+    """
+    text = "\n".join(
+        p.read_text(encoding="utf-8", errors="ignore")
+        for p in (Path("pasted.txt"), INCOMING_BLOCKS_FILE) if p.exists()
+    )
+    pairs = []
+    for block in split_blocks(text):
+        ex = extract_example(block)
+        if not ex:
+            continue
+        processed = post_process_transcript(ex["input"])
+        if _should_use_openai(processed):
+            pairs.append((processed, normalize_line(ex["target"]).lower() != normalize_line(processed).lower()))
+    if not any(edited for _, edited in pairs):
+        print(f"[Gate] Need edited [RAW]/[ENHANCED] pairs in pasted.txt or {INCOMING_BLOCKS_FILE}; found {len(pairs)} lines")
+        return
+    gate, report = SkipGate.fit(pairs, recall=recall)
+    gate.save(LOCAL_MODEL_GATE_FILE)
+    print(
+        f"[Gate] {len(pairs)} lines ({sum(e for _, e in pairs)} edited). Cross-validated: recall "
+        f"{report['recall'] * 100:.1f}% (target {recall * 100:.0f}%), skip rate {report['skip_rate'] * 100:.1f}% "
+        f"-> {LOCAL_MODEL_GATE_FILE}"
+    )
+
+
+def parse_local_time(text: str) -> float:
+    """'YYYY-MM-DD' or 'YYYY-MM-DD HH:MM:SS' (local time) -> unix time."""
+    for fmt in (TS_FORMAT, "%Y-%m-%d"):
+        try:
+            return time.mktime(time.strptime(text, fmt))
+        except ValueError:
+            pass
+    raise argparse.ArgumentTypeError(f"expected YYYY-MM-DD[ HH:MM:SS], got {text!r}")
+
+
+def run_rebuild_views(out_dir: Path, since: float | None = None, until: float | None = None,
+                      callsign: str | None = None, code: str | None = None):
+    """Regenerate caption_log.txt, the full transcript log (text + HTML pages) and the
+    training blocks from TRANSCRIPT_DB into out_dir, optionally for a time range / callsign / code."""
+    store = open_transcript_store()
+    if not store:
+        print("[Store] TRANSCRIPT_DB is disabled; nothing to rebuild from")
+        return
+    rows = store.query(since=since, until=until, callsign=callsign,
+                       code=normalize_code_key(code) if code else None)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    caption_log = out_dir / OBS_CAPTION_LOG_FILE.name
+    blocks_file = out_dir / "incoming_blocks.txt"
+    paths = [out_dir / FULL_LOG_FILE.name, out_dir / FULL_LOG_HTML_FILE.name, out_dir / OBS_LOWER_THIRD_HTML.name]
+    for path in (caption_log, blocks_file, paths[0]):
+        path.write_text("", encoding="utf-8")
+
+    logger = FullTranscriptLogger(*paths, SILENCE_GAP_SECONDS)
+    for u in rows:
+        ts = time.strftime(TS_FORMAT, time.localtime(u.ts))
+        caption = f"🚨 {u.final}" if u.alert else u.final
+        append_log(
+            caption_log,
+            f"    [RAW] {u.raw}\n    [ENHANCED] {u.enhanced}\n    [FINAL] {u.final}\n[{ts}] {caption}\n",
+        )
+        obs_writer.write_training_block(u.raw, u.enhanced, u.final, decoded_lookup=u.decoded_lookup,
+                                        decoded_plate_dl=u.decoded_plate_dl, path=blocks_file)
+        logger.add_entry(u.final, lookup_decoded=u.decoded_lookup, plate_dl_decoded=u.decoded_plate_dl,
+                         at=u.ts, write_html=False)
+    logger._write_html()
+    log_writer.flush()
+    print(f"[Store] Rebuilt {len(rows)} of {store.count()} utterances into {out_dir}")
+
+
+def local_asr_run_forever():
+    """Consume DSP audio from audio_q, transcribe via faster-whisper, and feed the post-process pipeline."""
+    print(
+        f"[LocalASR] Loading model: {ASR_MODEL_ID} (device={ASR_DEVICE}, compute={ASR_COMPUTE_TYPE}, "
+        f"beam={ASR_BEAM_SIZE}{', calibrated' if _asr_cfg else ''})"
+    )
+    model = WhisperModel(
+        ASR_MODEL_ID, device=ASR_DEVICE, compute_type=ASR_COMPUTE_TYPE, cpu_threads=ASR_CPU_THREADS,
+    )
+    print(f"[LocalASR] Model loaded. Segmentation mode: {ASR_SEGMENT_MODE}")
+
+    if ASR_SEGMENT_MODE == "transmission":
+        _asr_transmission_loop(model)
+    elif ASR_SEGMENT_MODE == "stream":
+        _asr_stream_loop(model)
+    else:
+        _asr_hop_loop(model)
+    # Only reached when a replay runs out of audio
+    if ASYNC_UTTERANCES:
+        utterance_q.put(None)
+    _print_asr_stats()
+
+
+def replay_file(path: Path, speed: float | None):
+    """Feed a recording through audio_callback as if it came from the sound card.
+
+    Appends enough silence for the last utterance to finalize, then signals end of input.
+    """
+    audio = decode_audio(str(path), sampling_rate=SAMPLE_RATE)
+    tail_sec = ASR_SILENCE_SEC + max(ASR_CHUNK_SEC, ASR_TX_TAIL_SEC) + 1.0
+    print(f"[Replay] {path}: {len(audio) / SAMPLE_RATE:.1f}s at {f'{speed:g}x' if speed else 'max speed'}")
+
+    def write(block):
+        audio_callback(block[:, None], len(block), None, None)
+
+    def ready():
+        return raw_ring.available() + AUDIO_BLOCKSIZE <= raw_ring.capacity and audio_q.qsize() < REPLAY_MAX_QUEUED
+
+    t0 = time.perf_counter()
+    n = replay_blocks(audio, AUDIO_BLOCKSIZE, write, SAMPLE_RATE, speed=speed, tail_sec=tail_sec, ready=ready)
+    capture_done.set()
+    elapsed = time.perf_counter() - t0
+    print(f"[Replay] Fed {n / SAMPLE_RATE:.1f}s of audio in {elapsed:.1f}s ({n / SAMPLE_RATE / max(elapsed, 1e-9):.1f}x real time)")
 
 
 # =============================================================================
-async def main():
+async def main(replay: Path | None = None, speed: float | None = 1.0):
+    full_logger._write_html()  # start from empty pages, not the last run's blocks
     atomic_write(OBS_LIVE_FILE, "")
     atomic_write(OBS_FINAL_FILE, "")
     if not FULL_LOG_FILE.exists():
@@ -2805,9 +3437,69 @@ async def main():
         atomic_write(FULL_LOG_HTML_FILE, "<!doctype html><html><body></body></html>")
     if not OBS_LOWER_THIRD_HTML.exists():
         atomic_write(OBS_LOWER_THIRD_HTML, "<!doctype html><html><body></body></html>")
-    blocksize = 800
-    with sd.InputStream(samplerate=SAMPLE_RATE, channels=CHANNELS, dtype="float32", callback=audio_callback, blocksize=blocksize):
-        await asyncio.to_thread(local_asr_run_forever)
+
+    overlay_task = asyncio.create_task(overlay.serve_forever()) if overlay else None
+    output_task = asyncio.create_task(output_stage.run())
+    try:
+        await run_sources(replay, speed)
+    finally:
+        # Drain the queued utterances first: writing them still publishes to the overlay
+        output_stage.close()
+        await output_task
+        if overlay_task:
+            overlay.stop()
+            await overlay_task
+
+
+async def run_sources(replay: Path | None, speed: float | None):
+    """Run capture (sound card or replay), DSP, ASR and the output stage until input ends."""
+    global clock
+    open_transcript_store()
+    if replay is not None:
+        clock = VirtualClock(SAMPLE_RATE, start=time.time())
+        t0 = time.perf_counter()
+        await asyncio.gather(
+            asyncio.to_thread(replay_file, replay, speed),
+            asyncio.to_thread(dsp_run_forever),
+            asyncio.to_thread(local_asr_run_forever),
+            *([asyncio.to_thread(utterance_worker_run)] if ASYNC_UTTERANCES else []),
+        )
+        audio_sec = clock.samples / SAMPLE_RATE
+        elapsed = time.perf_counter() - t0
+        print(f"[Replay] Done: {audio_sec:.1f}s of audio in {elapsed:.1f}s (RTF {elapsed / max(audio_sec, 1e-9):.2f})")
+        return
+
+    if sd is None:
+        print("[Audio] sounddevice/PortAudio is not available; use --replay FILE to run from a recording")
+        return
+    with sd.InputStream(samplerate=SAMPLE_RATE, channels=CHANNELS, dtype="float32", callback=audio_callback, blocksize=AUDIO_BLOCKSIZE):
+        await asyncio.gather(
+            asyncio.to_thread(dsp_run_forever),
+            asyncio.to_thread(local_asr_run_forever),
+            *([asyncio.to_thread(utterance_worker_run)] if ASYNC_UTTERANCES else []),
+        )
 
 if __name__ == "__main__":
-    asyncio.run(main())
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="RadioScribe: live police radio transcription")
+    parser.add_argument("--calibrate", action="store_true", help="benchmark ASR configs and save the pick to ASR_CONFIG_FILE")
+    parser.add_argument("--cpu-threads", type=int, default=ASR_CPU_THREADS, help="with --calibrate: Whisper CPU threads to measure with (default ASR_CPU_THREADS)")
+    parser.add_argument("--train-gate", action="store_true", help="fit the local-model skip gate from the training blocks")
+    parser.add_argument("--gate-recall", type=float, default=LOCAL_MODEL_GATE_RECALL, help="share of edited lines the gate must keep")
+    parser.add_argument("--rebuild-views", type=Path, metavar="DIR", help="regenerate the text/HTML logs from TRANSCRIPT_DB into DIR")
+    parser.add_argument("--since", type=parse_local_time, help="with --rebuild-views: first time to include (YYYY-MM-DD[ HH:MM:SS])")
+    parser.add_argument("--until", type=parse_local_time, help="with --rebuild-views: end of the range (exclusive)")
+    parser.add_argument("--callsign", help="with --rebuild-views: only utterances naming this callsign, e.g. 'Charles 3'")
+    parser.add_argument("--code", help="with --rebuild-views: only utterances with this code, e.g. 10-80")
+    parser.add_argument("--replay", type=Path, metavar="FILE", help="run the pipeline on a WAV/FLAC recording instead of the sound card")
+    parser.add_argument("--speed", default="1", help="replay speed: a multiple of real time (1 = live pacing) or 'max'")
+    args = parser.parse_args()
+
+    if args.calibrate:
+        run_calibration(args.cpu_threads)
+    elif args.train_gate:
+        run_gate_training(args.gate_recall)
+    elif args.rebuild_views:
+        run_rebuild_views(args.rebuild_views, args.since, args.until, args.callsign, args.code)
+    else:
+        speed = None if args.speed == "max" else float(args.speed)
+        asyncio.run(main(replay=args.replay, speed=speed))
\ No newline at end of file
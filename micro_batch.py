@@ -0,0 +1,132 @@
+import queue
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Callable
+
+
+class LRUCache:
+    """Small thread-safe LRU map with hit/miss counters."""
+
+    def __init__(self, max_size: int = 2048):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._data: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value) -> None:
+        if self.max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+
+def length_batches(lengths: list[int], max_batch: int, max_pad_ratio: float = 2.0) -> list[list[int]]:
+    """Group item indexes into batches of similar length to keep padding low.
+
+    Items are taken shortest first; a batch is closed when it is full or when the next item
+    is more than max_pad_ratio times longer than the batch's shortest item.
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    batches: list[list[int]] = []
+    cur: list[int] = []
+    for i in order:
+        if cur and (len(cur) >= max_batch or lengths[i] > max_pad_ratio * max(lengths[cur[0]], 1)):
+            batches.append(cur)
+            cur = []
+        cur.append(i)
+    if cur:
+        batches.append(cur)
+    return batches
+
+
+class MicroBatcher:
+    """Collects submit()ted items for up to max_wait_ms, then runs fn(list) once for the lot.
+
+    fn maps a list of inputs to a list of outputs in the same order. Each submit() returns a
+    Future; an exception from fn is set on every future of that batch. Futures cancelled while
+    still queued are dropped from their batch. With max_pending > 0, submit() raises queue.Full
+    once that many items are waiting, so callers can shed load instead of queueing it.
+    """
+
+    def __init__(self, fn: Callable[[list], list], max_batch: int = 16, max_wait_ms: float = 5.0,
+                 name: str = "micro-batcher", max_pending: int = 0):
+        self.fn = fn
+        self.max_batch = max(1, max_batch)
+        self.max_wait = max_wait_ms / 1000.0
+        self.max_pending = max_pending
+        self.batches = 0
+        self.items = 0
+        self._pending: list[tuple[object, Future]] = []
+        self._cond = threading.Condition()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, item) -> Future:
+        fut: Future = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("MicroBatcher is closed")
+            if self.max_pending and len(self._pending) >= self.max_pending:
+                raise queue.Full(f"{len(self._pending)} items already queued")
+            self._pending.append((item, fut))
+            self._cond.notify()
+        return fut
+
+    def close(self) -> None:
+        """Finish what is queued, then stop the worker thread."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+
+    def _next_batch(self) -> list[tuple[object, Future]]:
+        with self._cond:
+            while not self._pending and not self._closed:
+                self._cond.wait()
+            deadline = time.monotonic() + self.max_wait
+            while len(self._pending) < self.max_batch and not self._closed:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    break
+                self._cond.wait(left)
+            batch = self._pending[:self.max_batch]
+            del self._pending[:self.max_batch]
+            return batch
+
+    def _run(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            batch = [(item, fut) for item, fut in batch if fut.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            try:
+                out = self.fn([item for item, _ in batch])
+            except Exception as e:
+                for _, fut in batch:
+                    fut.set_exception(e)
+                continue
+            for (_, fut), res in zip(batch, out):
+                fut.set_result(res)
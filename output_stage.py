@@ -0,0 +1,152 @@
+import asyncio
+import threading
+import time
+from typing import Callable
+
+_STOP = object()
+
+
+class OutputStage:
+    """Runs blocking output work (file writes, HTML, overlays) as a task on an asyncio loop.
+
+    Producer threads hand over finished records with submit(); records are written one at a
+    time, in order, on a worker thread via asyncio.to_thread so the loop itself never blocks.
+    At most `maxsize` records wait: submit() blocks its thread beyond that, and the time spent
+    blocked is the back-pressure metric. set_live() is coalesced: only the newest text still
+    pending is written. Until run() is started (or after it ends) both write synchronously in
+    the caller.
+    """
+
+    def __init__(self, write_record: Callable[[object], None], write_live: Callable[[str], None],
+                 maxsize: int = 64):
+        self.write_record = write_record
+        self.write_live = write_live
+        self.maxsize = maxsize
+        self.submitted = 0
+        self.written = 0
+        self.max_depth = 0
+        self.blocked = 0
+        self.blocked_sec = 0.0
+        self.live_requested = 0
+        self.live_written = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._q: asyncio.Queue | None = None
+        # The bound lives on the producer side so a full queue blocks the producer's
+        # thread, never the loop; run() frees a slot once a record is written.
+        self._slots = threading.BoundedSemaphore(maxsize)
+        self._depth = 0
+        self._live_pending: str | None = None
+        self._live_event: asyncio.Event | None = None
+        self._closing = False
+        self._close_requested = False  # close() before run() has started: run() returns at once
+        self._lock = threading.Lock()
+
+    # --- producers (any thread but the loop's) ---
+
+    def submit(self, record) -> None:
+        with self._lock:
+            self.submitted += 1
+            loop = self._loop
+        if loop is None:
+            self.write_record(record)
+            self.written += 1
+            return
+        if not self._slots.acquire(blocking=False):
+            t0 = time.perf_counter()
+            self._slots.acquire()
+            with self._lock:
+                self.blocked += 1
+                self.blocked_sec += time.perf_counter() - t0
+        with self._lock:
+            self._depth += 1
+            self.max_depth = max(self.max_depth, self._depth)
+        loop.call_soon_threadsafe(self._q.put_nowait, record)
+
+    def set_live(self, text: str) -> None:
+        if not text.strip():
+            return  # blank means "nothing new"; it must not coalesce away a real caption
+        with self._lock:
+            self.live_requested += 1
+            loop = self._loop
+        if loop is None:
+            self.write_live(text)
+            self.live_written += 1
+            return
+        loop.call_soon_threadsafe(self._set_live, text)
+
+    def close(self) -> None:
+        """Make run() return once the records queued so far and the pending live text are written.
+
+        Never blocks, so it may also be called from the loop itself, and works whether or
+        not run() has started yet."""
+        with self._lock:
+            self._close_requested = True
+            loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._q.put_nowait, _STOP)
+
+    # --- loop side ---
+
+    def _set_live(self, text: str) -> None:
+        self._live_pending = text
+        self._live_event.set()
+
+    async def _live_loop(self) -> None:
+        while True:
+            await self._live_event.wait()
+            self._live_event.clear()
+            text, self._live_pending = self._live_pending, None
+            if text is not None:
+                try:
+                    await asyncio.to_thread(self.write_live, text)
+                except Exception as e:
+                    print(f"[Output] live caption write failed: {e}")
+                self.live_written += 1
+            if self._closing and self._live_pending is None:
+                return
+
+    def _done(self) -> None:
+        self.written += 1
+        with self._lock:
+            self._depth -= 1
+        self._slots.release()
+
+    async def run(self) -> None:
+        with self._lock:
+            if self._close_requested:
+                return
+            self._loop = asyncio.get_running_loop()
+            self._q = asyncio.Queue()
+            self._live_event = asyncio.Event()
+            self._closing = False
+        live_task = asyncio.create_task(self._live_loop())
+        try:
+            while True:
+                record = await self._q.get()
+                if record is _STOP:
+                    break
+                try:
+                    await asyncio.to_thread(self.write_record, record)
+                except Exception as e:
+                    print(f"[Output] write failed: {e}")
+                self._done()
+        finally:
+            with self._lock:
+                self._loop = None
+            self._closing = True
+            self._live_event.set()
+            await live_task
+            # anything submitted while we were shutting down
+            while not self._q.empty():
+                record = self._q.get_nowait()
+                if record is not _STOP:
+                    self.write_record(record)
+                    self._done()
+
+    def summary_lines(self) -> list[str]:
+        coalesced = self.live_requested - self.live_written
+        return [
+            f"{self.written}/{self.submitted} utterances written, queue peak {self.max_depth}/{self.maxsize}, "
+            f"producers blocked {self.blocked}x ({self.blocked_sec * 1000:.0f} ms)",
+            f"live captions: {self.live_written} written, {coalesced} coalesced",
+        ]
@@ -0,0 +1,209 @@
+"""Local HTTP + WebSocket server for the OBS overlays.
+
+Each page is served once; after that the server pushes small JSON messages over /ws:
+  {"type": "block", "seq": 12, "html": "..."}   add or replace transcript block 12
+  {"type": "live", "text": "..."}               current live caption
+  {"type": "alert", "html": "..."}              show the alert banner
+A client that connects (or reconnects) first gets a "snapshot" of the current blocks and
+live caption. The publish_* methods may be called from any thread.
+"""
+import asyncio
+import json
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from urllib.parse import urlsplit
+
+from websockets.asyncio.server import broadcast, serve
+
+ALERT_SHOW_MS = 8000
+
+_OVERLAY_CSS = """
+<style>
+  .live { font-size: 28px; line-height: 1.20; font-weight: 700; text-shadow: 0 2px 10px rgba(0,0,0,0.55); }
+  .blocks { display: flex; flex-direction: column; gap: inherit; }
+  .alertbar { display: none; margin-bottom: 10px; padding: 10px 14px; border-radius: 14px;
+              background: rgba(255,0,0,0.45); font-size: 24px; font-weight: 800; }
+</style>
+""".strip()
+
+_CLIENT_JS = """
+<script>
+(function(){
+  var MAX_BLOCKS = %(max_blocks)d, PIN = %(pin)s, ALERT_MS = %(alert_ms)d;
+  var stack = document.getElementById('stack');
+  var live = document.getElementById('live');
+  var alertBar = document.getElementById('alert');
+  var alertTimer = null;
+
+  function pinBottom(){
+    if (PIN) { try { window.scrollTo(0, document.body.scrollHeight); } catch(e){} }
+  }
+  function upsert(m){
+    if (!stack) return;
+    var el = stack.querySelector("[data-seq='" + m.seq + "']");
+    if (!el) {
+      el = document.createElement('div');
+      el.className = 'block';
+      el.setAttribute('data-seq', m.seq);
+      stack.appendChild(el);
+    }
+    el.innerHTML = m.html;
+    while (stack.children.length > MAX_BLOCKS) stack.removeChild(stack.firstChild);
+    for (var i = 0; i < stack.children.length; i++) {
+      stack.children[i].setAttribute('data-age', i < stack.children.length - 1 ? 'old' : 'new');
+    }
+    pinBottom();
+  }
+  function apply(m){
+    if (m.type === 'snapshot') {
+      if (stack) stack.innerHTML = '';
+      m.blocks.forEach(upsert);
+      if (live) live.textContent = m.live || '';
+    } else if (m.type === 'block') {
+      upsert(m);
+    } else if (m.type === 'live') {
+      if (live) live.textContent = m.text;
+    } else if (m.type === 'alert' && alertBar) {
+      alertBar.innerHTML = m.html;
+      alertBar.style.display = 'block';
+      clearTimeout(alertTimer);
+      alertTimer = setTimeout(function(){ alertBar.style.display = 'none'; }, ALERT_MS);
+    }
+  }
+  function connect(){
+    var ws = new WebSocket((location.protocol === 'https:' ? 'wss://' : 'ws://') + location.host + '/ws');
+    ws.onmessage = function(e){ apply(JSON.parse(e.data)); };
+    ws.onclose = function(){ setTimeout(connect, 1000); };
+  }
+  connect();
+})();
+</script>
+""".strip()
+
+
+def overlay_page(head: str, max_blocks: int = 0, live: bool = False, pin_bottom: bool = False) -> str:
+    """A static overlay page: `head` is the log page's <style>...</head><body> markup.
+
+    max_blocks > 0 shows the transcript stack (newest max_blocks blocks); live shows the
+    live caption line.
+    """
+    parts = ["<!doctype html>", "<html><head><meta charset='utf-8'>", head, _OVERLAY_CSS]
+    parts.append("<div class='stage'>")
+    parts.append("<div class='stack'>")
+    parts.append("<div class='alertbar' id='alert'></div>")
+    if max_blocks:
+        parts.append("<div class='blocks' id='stack'></div>")
+    if live:
+        parts.append("<div class='block'><div class='live' id='live'></div></div>")
+    parts.append("</div></div>")
+    parts.append(_CLIENT_JS % {"max_blocks": max_blocks, "pin": "true" if pin_bottom else "false",
+                               "alert_ms": ALERT_SHOW_MS})
+    parts.append("</body></html>")
+    return "\n".join(parts)
+
+
+class OverlayServer:
+    def __init__(self, host: str = "127.0.0.1", port: int = 8765, keep_blocks: int = 100):
+        self.host = host
+        self.port = port
+        self.keep_blocks = keep_blocks
+        self.pages: dict[str, str] = {}
+        self.messages_sent = 0
+        self._blocks: OrderedDict[int, str] = OrderedDict()
+        self._live = ""
+        self._clients: set = set()
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._stopped: asyncio.Event | None = None
+        self._stop_requested = False  # stop() may come before serve_forever() has started
+
+    def add_page(self, path: str, html: str) -> None:
+        self.pages[path] = html
+
+    # --- publishing (any thread) ---
+
+    def publish_block(self, seq: int, html: str) -> None:
+        self._publish({"type": "block", "seq": seq, "html": html})
+
+    def publish_live(self, text: str) -> None:
+        self._publish({"type": "live", "text": text})
+
+    def publish_alert(self, html: str) -> None:
+        self._publish({"type": "alert", "html": html})
+
+    def _publish(self, msg: dict) -> None:
+        loop = self._loop
+        if loop is None:
+            self._apply(msg)  # not serving yet: just keep the state for the first snapshot
+        else:
+            # State changes and sends happen on the loop, in order with new clients' snapshots
+            loop.call_soon_threadsafe(self._apply, msg)
+
+    def _apply(self, msg: dict) -> None:
+        with self._lock:
+            if msg["type"] == "block":
+                self._blocks[msg["seq"]] = msg["html"]
+                while len(self._blocks) > self.keep_blocks:
+                    self._blocks.popitem(last=False)
+            elif msg["type"] == "live":
+                self._live = msg["text"]
+        if self._clients:
+            broadcast(self._clients, json.dumps(msg))
+            self.messages_sent += len(self._clients)
+
+    def _snapshot(self) -> str:
+        with self._lock:
+            blocks = [{"seq": seq, "html": html} for seq, html in self._blocks.items()]
+            return json.dumps({"type": "snapshot", "blocks": blocks, "live": self._live})
+
+    # --- server (event loop) ---
+
+    def _process_request(self, connection, request):
+        path = urlsplit(request.path).path
+        if path == "/ws":
+            return None  # continue with the WebSocket handshake
+        if path == "/":
+            links = "".join(f"<li><a href='{p}'>{p}</a></li>" for p in self.pages)
+            body = f"<!doctype html><html><body><ul>{links}</ul></body></html>"
+        elif path in self.pages:
+            body = self.pages[path]
+        else:
+            return connection.respond(HTTPStatus.NOT_FOUND, "Not found\n")
+        response = connection.respond(HTTPStatus.OK, body)
+        del response.headers["Content-Type"]
+        response.headers["Content-Type"] = "text/html; charset=utf-8"
+        return response
+
+    async def _handler(self, connection) -> None:
+        # Join first: anything published meanwhile is already in the snapshot or arrives after it
+        self._clients.add(connection)
+        try:
+            await connection.send(self._snapshot())
+            await connection.wait_closed()
+        finally:
+            self._clients.discard(connection)
+
+    async def serve_forever(self) -> None:
+        """Serve until stop(). Await this task after stop() rather than cancelling it: a
+        cancel that lands while websockets is closing connections can leave it hanging."""
+        with self._lock:
+            if self._stop_requested:
+                return
+            self._stopped = asyncio.Event()
+            self._loop = asyncio.get_running_loop()
+        try:
+            async with serve(self._handler, self.host, self.port, process_request=self._process_request):
+                print(f"[Overlay] Serving {', '.join(self.pages)} at http://{self.host}:{self.port}")
+                await self._stopped.wait()
+        except OSError as e:
+            print(f"[Overlay] Server not started: {e}")
+        finally:
+            self._loop = None
+
+    def stop(self) -> None:
+        with self._lock:
+            self._stop_requested = True
+            loop = self._loop
+        if loop is not None:
+            loop.call_soon_threadsafe(self._stopped.set)
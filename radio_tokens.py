@@ -0,0 +1,192 @@
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+_END = ""  # trie key marking a complete entry (never a real character)
+_WORD = re.compile(r"\S+")
+_CODE_WORDS = ("ten", "eleven")
+
+
+def normalize_phonetic_token(tok: str) -> str:
+    t = tok.lower().strip()
+    t = t.replace(".", "").replace(",", "").replace(";", "").replace(":", "")
+    t = t.replace("x ray", "xray").replace("x-ray", "xray")
+    return t
+
+
+def _is_word_char(c: str) -> bool:
+    # Same definition as regex \w on str patterns
+    return c.isalnum() or c == "_"
+
+
+def _digit_run_end(s: str, i: int) -> int:
+    # isdecimal() is what regex \d matches
+    while i < len(s) and s[i].isdecimal():
+        i += 1
+    return i
+
+
+class Trie:
+    """Character trie over lowercase words."""
+
+    def __init__(self, words=()):
+        self.root: dict = {}
+        for w in words:
+            self.add(w)
+
+    def add(self, word: str) -> None:
+        node = self.root
+        for c in word.lower():
+            node = node.setdefault(c, {})
+        node[_END] = True
+
+    def ends(self, s: str, i: int = 0) -> list[int]:
+        """End offsets j (shortest first) where s[i:j] is an entry; s must be lowercase."""
+        out = []
+        node = self.root
+        for j in range(i, len(s)):
+            node = node.get(s[j])
+            if node is None:
+                break
+            if _END in node:
+                out.append(j + 1)
+        return out
+
+
+class Token(NamedTuple):
+    text: str             # the word as written
+    start: int            # offset in the scanned line
+    norm: str             # normalize_phonetic_token(text)
+    letter: str | None    # phonetic letter ("boy" -> "B")
+    digit: str | None     # spoken digit ("tree" -> "3")
+    unit_number: bool     # the whole word could be a callsign number ("12", "four", "ate")
+    number_lead: bool     # the word starts with a callsign number ("12,", "10-4")
+    unit: bool            # holds a callsign or a lone phonetic unit word ("Adam12", "Zebra")
+    unit_open: bool       # is one unit word still waiting for a number ("Echo" in "Echo 5")
+    units_open: bool      # ends in joined unit words that digits would complete ("AdamBoy" in "AdamBoy 12")
+    code: bool            # could hold a 10/11/CODE/900-series code (a digit, "ten", "eleven")
+
+
+class RadioScanner:
+    """One left-to-right pass that splits a line into words and tags each from tries of
+    phonetic unit words and callsign numbers.
+
+    scan() is cached per line, so speaker classification, the noise filter, code
+    annotation and the plate/lookup decoders share the work for the same text.
+    """
+
+    def __init__(self, unit_words, unit_number_words, letters: dict[str, str],
+                 digits: dict[str, str], weak_units=(), cache_size: int = 256,
+                 word_cache_size: int = 8192):
+        # unit_words must not contain one another as prefixes ("Adam" / "Adamson"), so a
+        # joined run like "CharlesQueen12" splits the one way the old regex alternations did.
+        self.units = Trie(unit_words)
+        self.numbers = Trie(unit_number_words)
+        self.number_set = frozenset(w.lower() for w in unit_number_words)
+        self.weak = frozenset(w.lower() for w in weak_units)
+        self.letters = letters
+        self.digits = digits
+        self.scan = lru_cache(maxsize=cache_size)(self._scan)
+        # Radio vocabulary is small, so most words are tagged once and then looked up
+        self._tag = lru_cache(maxsize=word_cache_size)(self._tag_word)
+
+    def _scan(self, text: str) -> tuple[Token, ...]:
+        tag = self._tag
+        return tuple(Token(m.group(0), m.start(), *tag(m.group(0))) for m in _WORD.finditer(text or ""))
+
+    def _tag_word(self, word: str) -> tuple:
+        """Every Token field after `start`, in order."""
+        low = word.lower()
+        norm = normalize_phonetic_token(word)
+        unit, unit_open, units_open = self._unit_runs(low)
+        return (
+            norm,
+            self.letters.get(norm),
+            self.digits.get(norm),
+            norm in self.number_set or (norm.isdecimal() and len(norm) <= 4),
+            self._number_at(low, 0),
+            unit,
+            unit_open,
+            units_open,
+            self._code_hint(low),
+        )
+
+    def _number_at(self, s: str, i: int) -> bool:
+        """Callsign number (1-4 digits or a number word) at s[i:], ending at a word boundary."""
+        j = _digit_run_end(s, i)
+        if j > i:
+            return j - i <= 4 and (j == len(s) or not _is_word_char(s[j]))
+        return any(j == len(s) or not _is_word_char(s[j]) for j in self.numbers.ends(s, i))
+
+    def _unit_runs(self, low: str) -> tuple[bool, bool, bool]:
+        """Look for callsigns inside one word: "Adam", "Zebra336", "5CharlesQueen12"."""
+        unit = unit_open = units_open = False
+        n = len(low)
+        i = 0
+        while i < n:
+            if not _is_word_char(low[i]):
+                i += 1
+                continue
+            lead_end = _digit_run_end(low, i)
+            k = lead_end
+            names = []
+            while True:
+                ends = self.units.ends(low, k)
+                if not ends:
+                    break
+                names.append(low[k:ends[-1]])
+                k = ends[-1]
+            end = _digit_run_end(low, k)
+            lead, tail = lead_end - i, end - k
+            if names and (end == n or not _is_word_char(low[end])):
+                if lead == 0 and len(names) == 1:
+                    if tail == 0:
+                        unit = unit or names[0] not in self.weak
+                        unit_open = unit_open or end == n
+                    elif 2 <= tail <= 4:
+                        unit = True
+                elif lead <= 2 and 2 <= len(names) <= 5:
+                    if 1 <= tail <= 4:
+                        unit = True
+                    elif tail == 0:
+                        units_open = units_open or end == n
+                i = end
+                continue
+            while i < n and _is_word_char(low[i]):
+                i += 1
+        return unit, unit_open, units_open
+
+    @staticmethod
+    def _code_hint(low: str) -> bool:
+        if any(c.isdecimal() for c in low):
+            return True
+        return any(w in low for w in _CODE_WORDS) and any(
+            r in _CODE_WORDS for r in re.findall(r"\w+", low)
+        )
+
+    def starts_with_callsign(self, tokens: tuple[Token, ...]) -> bool:
+        """True if the line opens with a callsign: "Boy 12", "Adam12", "King four"."""
+        if not tokens:
+            return False
+        first = tokens[0].text.lower()
+        for j in self.units.ends(first):
+            if j < len(first):
+                if self._number_at(first, j):
+                    return True
+            elif len(tokens) > 1 and tokens[1].number_lead:
+                return True
+        return False
+
+    def mentions_unit(self, tokens: tuple[Token, ...]) -> bool:
+        """True if any word is or starts a callsign, or is a phonetic unit word."""
+        for i, tok in enumerate(tokens):
+            if tok.unit:
+                return True
+            if (tok.unit_open or tok.units_open) and i + 1 < len(tokens):
+                nxt = tokens[i + 1]
+                if nxt.number_lead and (tok.unit_open or nxt.text[0].isdecimal()):
+                    return True
+        return False
+
+    def has_code(self, tokens: tuple[Token, ...]) -> bool:
+        return any(tok.code for tok in tokens)
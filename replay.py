@@ -0,0 +1,65 @@
+import time
+from typing import Callable
+
+import numpy as np
+
+
+class WallClock:
+    """Live capture: pipeline time is wall time."""
+
+    def now(self) -> float:
+        return time.time()
+
+    def advance(self, n: int) -> None:
+        pass
+
+
+class VirtualClock:
+    """Replay: pipeline time advances with the audio the ASR stage has consumed.
+
+    Decisions keyed on now() (silence finalization, decoder windows, log gaps) then depend
+    only on the recording, not on how fast the machine decodes it.
+    """
+
+    def __init__(self, sample_rate: int, start: float = 0.0):
+        self.sample_rate = sample_rate
+        self.start = start
+        self.samples = 0
+
+    def now(self) -> float:
+        return self.start + self.samples / self.sample_rate
+
+    def advance(self, n: int) -> None:
+        self.samples += int(n)
+
+
+def replay_blocks(
+    audio: np.ndarray,
+    blocksize: int,
+    write: Callable[[np.ndarray], None],
+    sample_rate: int,
+    speed: float | None = None,
+    tail_sec: float = 0.0,
+    ready: Callable[[], bool] | None = None,
+) -> int:
+    """Feed `audio` (plus `tail_sec` of trailing silence) to `write` in blocks of `blocksize`.
+
+    speed=1.0 paces blocks like a live sound card, speed=None runs as fast as the consumer
+    allows: each block waits for ready() so a downstream buffer is never overrun.
+    Returns the number of samples written.
+    """
+    audio = np.asarray(audio, dtype=np.float32)
+    if tail_sec > 0:
+        audio = np.concatenate([audio, np.zeros(int(tail_sec * sample_rate), dtype=np.float32)])
+
+    t0 = time.perf_counter()
+    for pos in range(0, len(audio), blocksize):
+        if speed:
+            delay = t0 + pos / sample_rate / speed - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+        elif ready is not None:
+            while not ready():
+                time.sleep(0.001)
+        write(audio[pos:pos + blocksize])
+    return len(audio)
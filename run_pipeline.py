@@ -13,9 +13,10 @@ def main():
     ap = argparse.ArgumentParser()
     ap.add_argument("--train", action="store_true", help="Prep data then train the model")
     ap.add_argument("--eval", action="store_true", help="Run evaluation after prep/train")
+    ap.add_argument("--export", action="store_true", help="Export an int8 CTranslate2 model and check parity")
     args = ap.parse_args()
 
-    print(f"Flags: train={args.train}, eval={args.eval}")
+    print(f"Flags: train={args.train}, eval={args.eval}, export={args.export}")
 
     # Always prep first
     run([sys.executable, "prep_data.py"])
@@ -30,6 +31,9 @@ def main():
             raise FileNotFoundError("evaluate_model.py not found in this folder.")
         run([sys.executable, "evaluate_model.py"])
 
+    if args.export:
+        run([sys.executable, "export_corrector.py", "--check"])
+
     print("\nPipeline complete.")
 
 if __name__ == "__main__":
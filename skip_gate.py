@@ -0,0 +1,109 @@
+import json
+import math
+import random
+import re
+from pathlib import Path
+
+_WORD = re.compile(r"[a-z']+|\d+|[^\sa-z\d]")
+
+
+def gate_features(text: str) -> set[str]:
+    """Words, digit-run shapes, bigrams and a length bucket of a line."""
+    toks = [f"#{len(t)}" if t.isdigit() else t for t in _WORD.findall((text or "").lower())]
+    feats = set(toks)
+    feats.update(f"{a} {b}" for a, b in zip(toks, toks[1:]))
+    feats.add(f"len:{min(len(toks) // 4, 8)}")
+    return feats
+
+
+class SkipGate:
+    """Naive-Bayes guess at whether the local model will change a line.
+
+    Each feature carries the smoothed log odds of "edited" vs "unchanged" seen in training;
+    a line's score is the prior plus its features' weights. Lines scoring below `threshold`
+    skip the model. fit() places the threshold so that `recall` of the edited lines still
+    score at or above it when scored by weights that never saw them (k-fold).
+    """
+
+    def __init__(self, weights: dict[str, float] | None = None, prior: float = 0.0,
+                 threshold: float = float("-inf")):
+        self.weights = weights or {}
+        self.prior = prior
+        self.threshold = threshold
+
+    def score(self, text: str) -> float:
+        w = self.weights
+        return self.prior + sum(w.get(f, 0.0) for f in gate_features(text))
+
+    def should_run(self, text: str) -> bool:
+        return self.score(text) >= self.threshold
+
+    @staticmethod
+    def _weights(pairs: list[tuple[str, bool]], alpha: float) -> tuple[dict[str, float], float]:
+        pos = sum(1 for _, edited in pairs if edited)
+        neg = len(pairs) - pos
+        counts: dict[str, list[int]] = {}
+        for text, edited in pairs:
+            for f in gate_features(text):
+                counts.setdefault(f, [0, 0])[edited] += 1
+        weights = {
+            f: math.log((c[1] + alpha) / (pos + 2 * alpha)) - math.log((c[0] + alpha) / (neg + 2 * alpha))
+            for f, c in counts.items()
+        }
+        prior = math.log((pos + alpha) / (neg + alpha))
+        return weights, prior
+
+    @classmethod
+    def fit(cls, pairs: list[tuple[str, bool]], recall: float = 0.95, folds: int = 10,
+            alpha: float = 1.0, seed: int = 1337) -> tuple["SkipGate", dict]:
+        """Train on (line, edited) pairs; returns the gate and its cross-validated recall/skip rate.
+
+        The saved weights use every pair. The threshold is tuned on out-of-fold scores (each
+        line scored by weights fit without its fold), which is how the saved gate scores lines
+        it has never seen; the report is measured on the same scores.
+        """
+        pairs = list(pairs)
+        random.Random(seed).shuffle(pairs)
+        folds = max(1, min(folds, len(pairs)))
+        scored = []
+        for k in range(folds):
+            rest = [p for i, p in enumerate(pairs) if i % folds != k] if folds > 1 else pairs
+            fold_gate = cls(*cls._weights(rest, alpha))
+            scored += [(fold_gate.score(t), edited) for t, edited in pairs[k::folds]]
+
+        gate = cls(*cls._weights(pairs, alpha))
+        pos_scores = sorted(s for s, edited in scored if edited)
+        if pos_scores:
+            gate.threshold = pos_scores[min(int(len(pos_scores) * (1.0 - recall)), len(pos_scores) - 1)]
+        return gate, cls._rates(scored, gate.threshold)
+
+    def evaluate(self, pairs: list[tuple[str, bool]]) -> dict:
+        return self._rates([(self.score(t), edited) for t, edited in pairs], self.threshold)
+
+    @staticmethod
+    def _rates(scored: list[tuple[float, bool]], threshold: float) -> dict:
+        run = [s >= threshold for s, _ in scored]
+        edited = [e for _, e in scored]
+        caught = sum(r and e for r, e in zip(run, edited))
+        return {
+            "lines": len(scored),
+            "edited": sum(edited),
+            "recall": caught / sum(edited) if any(edited) else 1.0,
+            "skip_rate": 1.0 - sum(run) / len(run) if run else 0.0,
+        }
+
+    def save(self, path: Path) -> None:
+        path = Path(path)
+        data = {"prior": self.prior, "threshold": self.threshold, "weights": self.weights}
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(json.dumps(data) + "\n", encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "SkipGate | None":
+        """The saved gate, or None if the file is missing or unreadable."""
+        try:
+            data = json.loads(Path(path).read_text(encoding="utf-8"))
+            return cls(data["weights"], data["prior"], data["threshold"])
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
@@ -0,0 +1,39 @@
+import re
+import time
+from pathlib import Path
+
+from local_corrector import DECODING_MODES, LocalCorrector
+
+CORPUS = Path(__file__).parent / "data" / "caption_log_sample.txt"
+BATCH_SIZES = (1, 4, 16)
+
+
+def main():
+    lines = re.findall(r"^\s*\[RAW\]\s*(.*?)\s*$", CORPUS.read_text(encoding="utf-8"), re.MULTILINE)
+    c = LocalCorrector(cache_size=0)   # measure generate(), not the cache
+    c.correct_batch(lines[:4])         # warm-up
+
+    for bs in BATCH_SIZES:
+        c.max_batch = bs
+        t0 = time.perf_counter()
+        for i in range(0, len(lines), bs):
+            c.correct_batch(lines[i:i + bs])
+        t = time.perf_counter() - t0
+        print(f"[batch {bs:>2}] {len(lines) / t:6.1f} lines/s | {t / len(lines) * 1000:7.1f} ms/line")
+
+    # Greedy fast path vs. always-beam, at the default batch size
+    outputs = {}
+    for mode in DECODING_MODES:
+        c = LocalCorrector(cache_size=0, decoding=mode)
+        outputs[mode] = c.correct_batch(lines)
+        s = c.decode_stats()
+        print(
+            f"[{mode:<6}] greedy unchanged {s['greedy_unchanged']}, greedy rejected {s['greedy_rejected']}, "
+            f"beam {s['beam']} | {s['avg_ms']:7.1f} ms/line"
+        )
+    same = sum(a == b for a, b in zip(*outputs.values()))
+    print(f"[tiered] same output as beam on {same}/{len(lines)} lines")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+import time
+import numpy as np
+
+from audio_dsp import OnePoleIIR, pre_emphasis, high_pass, low_pass
+
+SR = 16000
+BLOCK = 800          # same blocksize main_6.py opens the InputStream with
+SECONDS = 20
+HP_HZ = 80.0
+LP_HZ = 7500.0
+PREEMPH = 0.85
+
+
+class LoopTuner:
+    """The original per-sample RadioTuner filters (reference for speed + output)."""
+
+    def __init__(self, hp_a: float, lp_b: float):
+        self.hp_a = hp_a
+        self.lp_b = lp_b
+        self.hp_y = 0.0
+        self.hp_x_prev = 0.0
+        self.lp_y = 0.0
+        self.pre_x_prev = 0.0
+
+    def process(self, x):
+        y = np.empty_like(x)
+        prev = self.pre_x_prev
+        for i in range(len(x)):
+            xi = x[i]
+            y[i] = xi - PREEMPH * prev
+            prev = xi
+        self.pre_x_prev = float(prev)
+        x = y
+
+        y = np.empty_like(x)
+        y_prev, x_prev = self.hp_y, self.hp_x_prev
+        for i in range(len(x)):
+            xi = x[i]
+            yi = self.hp_a * (y_prev + xi - x_prev)
+            y[i] = yi
+            y_prev = yi
+            x_prev = xi
+        self.hp_y, self.hp_x_prev = float(y_prev), float(x_prev)
+        x = y
+
+        y = np.empty_like(x)
+        y_prev = self.lp_y
+        for i in range(len(x)):
+            y_prev = y_prev + self.lp_b * (x[i] - y_prev)
+            y[i] = y_prev
+        self.lp_y = float(y_prev)
+        return y
+
+
+class VectorTuner:
+    def __init__(self, hp_a: float, lp_b: float):
+        self.lp_b = lp_b
+        self.hp_iir = OnePoleIIR(hp_a)
+        self.lp_iir = OnePoleIIR(1.0 - lp_b)
+        self.hp_y = 0.0
+        self.hp_x_prev = 0.0
+        self.lp_y = 0.0
+        self.pre_x_prev = 0.0
+
+    def process(self, x):
+        x, self.pre_x_prev = pre_emphasis(x, PREEMPH, self.pre_x_prev)
+        x, self.hp_y, self.hp_x_prev = high_pass(x, self.hp_iir, self.hp_y, self.hp_x_prev)
+        x, self.lp_y = low_pass(x, self.lp_iir, self.lp_b, self.lp_y)
+        return x
+
+
+def coeffs():
+    dt = 1.0 / SR
+    rc_hp = 1.0 / (2.0 * np.pi * HP_HZ)
+    rc_lp = 1.0 / (2.0 * np.pi * LP_HZ)
+    return rc_hp / (rc_hp + dt), dt / (rc_lp + dt)
+
+
+def run(tuner, blocks):
+    out = []
+    t0 = time.perf_counter()
+    for b in blocks:
+        out.append(tuner.process(b))
+    return np.concatenate(out), time.perf_counter() - t0
+
+
+def main():
+    rng = np.random.default_rng(0)
+    audio = (rng.standard_normal(SR * SECONDS) * 0.1).astype(np.float32)
+    blocks = [audio[i:i + BLOCK] for i in range(0, len(audio), BLOCK)]
+    hp_a, lp_b = coeffs()
+
+    ref, t_loop = run(LoopTuner(hp_a, lp_b), blocks)
+    vec, t_vec = run(VectorTuner(hp_a, lp_b), blocks)
+
+    budget_ms = BLOCK / SR * 1000.0
+    for name, t in (("per-sample loop", t_loop), ("vectorized", t_vec)):
+        per_block_ms = t / len(blocks) * 1000.0
+        print(f"[{name:>15}] {len(audio) / t:>14,.0f} samples/s | "
+              f"{per_block_ms:7.3f} ms per {BLOCK}-sample block "
+              f"({per_block_ms / budget_ms * 100:.2f}% of {budget_ms:.0f} ms budget)")
+    print(f"speedup: {t_loop / t_vec:.1f}x")
+    print(f"max |ref - vec|: {np.max(np.abs(ref.astype(np.float64) - vec)):.3g}")
+
+
+if __name__ == "__main__":
+    main()
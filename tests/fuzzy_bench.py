@@ -0,0 +1,64 @@
+import re
+import time
+from functools import lru_cache
+from pathlib import Path
+
+from fuzzy_vocab import DeletionIndex, levenshtein
+
+CORPUS = Path(__file__).parent / "data" / "caption_log_sample.txt"
+ROUNDS = 50
+PHONETICS = [
+    "adam", "boy", "charles", "david", "edward", "frank", "george", "henry",
+    "ida", "john", "king", "lincoln", "mary", "nora", "ocean", "paul", "queen",
+    "robert", "sam", "tom", "union", "victor", "william", "x-ray", "yellow", "zebra",
+    "echo",
+]
+
+
+def linear(term):
+    best, best_d = None, 3
+    for w in PHONETICS:
+        d = levenshtein(term, w, max_dist=1)
+        if d < best_d:
+            best, best_d = w, d
+    return best if best_d <= 1 else None
+
+
+def run(fn, terms):
+    t0 = time.perf_counter()
+    for _ in range(ROUNDS):
+        for t in terms:
+            fn(t)
+    return time.perf_counter() - t0
+
+
+def main():
+    text = CORPUS.read_text(encoding="utf-8")
+    lines = re.findall(r"^\s*\[RAW\]\s*(.*?)\s*$", text, re.MULTILINE)
+    terms = []
+    for line in lines:
+        for tok in line.split():
+            raw = re.sub(r"[^A-Za-z-]", "", tok).lower()
+            if raw and raw not in PHONETICS and 2 <= len(raw) <= 8:
+                terms.append(raw)
+
+    index = DeletionIndex(PHONETICS, max_distance=1)
+
+    def indexed(term):
+        hit = index.lookup(term)
+        return hit[0] if hit else None
+
+    cached = lru_cache(maxsize=8192)(indexed)
+    assert all(linear(t) == indexed(t) for t in terms)
+
+    n = len(terms) * ROUNDS
+    t_lin = run(linear, terms)
+    t_idx = run(indexed, terms)
+    t_lru = run(cached, terms)
+    print(f"{len(terms)} candidate tokens from {len(lines)} lines, vocabulary {len(PHONETICS)}")
+    for name, t in (("linear scan", t_lin), ("DeletionIndex", t_idx), ("index + LRU", t_lru)):
+        print(f"[{name:>13}] {n / t:>12,.0f} tokens/s | {t / n * 1e6:7.2f} us/token | {t_lin / t:6.1f}x")
+
+
+if __name__ == "__main__":
+    main()
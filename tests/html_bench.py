@@ -0,0 +1,54 @@
+import re
+import tempfile
+import time
+from pathlib import Path
+
+import main_6
+
+CORPUS = Path(__file__).parent / "data" / "caption_log_sample.txt"
+BLOCK_COUNTS = (100, 500)
+UTTERANCES = 200
+
+
+class UncachedLogger(main_6.FullTranscriptLogger):
+    """The old behaviour: every write re-highlights every line of every block."""
+
+    def _write_html_file(self, path, blocks, is_lower_third=False):
+        for b in blocks:
+            b["html"] = None
+        self._page_sigs.clear()
+        super()._write_html_file(path, blocks, is_lower_third)
+
+
+def run(cls, lines, n_blocks, out_dir: Path) -> tuple[float, float, str]:
+    main_6.FULL_HTML_MAX_BLOCKS = n_blocks
+    logger = cls(out_dir / "log.txt", out_dir / "log.html", out_dir / "lower_third.html", gap_seconds=0.0)
+    for i in range(n_blocks):
+        logger.add_entry(lines[i % len(lines)])
+
+    wall, cpu = time.perf_counter(), time.process_time()
+    for i in range(UTTERANCES):
+        logger.add_entry(lines[i % len(lines)])
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    page = (out_dir / "log.html").read_text(encoding="utf-8")
+    return wall, cpu, re.sub(r"\d{4}-\d\d-\d\d \d\d:\d\d:\d\d", "", page)
+
+
+def main():
+    lines = re.findall(r"^\s*\[RAW\]\s*(.*?)\s*$", CORPUS.read_text(encoding="utf-8"), re.MULTILINE)
+    for n_blocks in BLOCK_COUNTS:
+        pages = []
+        for cls in (UncachedLogger, main_6.FullTranscriptLogger):
+            with tempfile.TemporaryDirectory() as tmp:
+                wall, cpu, page = run(cls, lines, n_blocks, Path(tmp))
+            pages.append(page)
+            name = "cached" if cls is main_6.FullTranscriptLogger else "full"
+            print(
+                f"[{n_blocks} blocks] {name:<6} {UTTERANCES / wall:7.1f} utterances/s | "
+                f"{cpu / UTTERANCES * 1000:6.2f} ms CPU/utterance"
+            )
+        assert pages[0] == pages[1]
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import re
+import time
+from pathlib import Path
+
+from transcript_rules import MISRECOGNITION_FIXES, RewriteEngine
+
+CORPUS = Path(__file__).parent / "data" / "caption_log_sample.txt"
+ROUNDS = 200
+
+
+def sequential(text):
+    for pattern, replacement in MISRECOGNITION_FIXES:
+        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+    return text
+
+
+def run(fn, lines):
+    t0 = time.perf_counter()
+    for _ in range(ROUNDS):
+        for line in lines:
+            fn(line)
+    return time.perf_counter() - t0
+
+
+def main():
+    lines = re.findall(r"^\s*\[RAW\]\s*(.*?)\s*$", CORPUS.read_text(encoding="utf-8"), re.MULTILINE)
+    engine = RewriteEngine(MISRECOGNITION_FIXES)
+    assert all(engine.apply(line) == sequential(line) for line in lines)
+
+    n = len(lines) * ROUNDS
+    t_seq = run(sequential, lines)
+    t_eng = run(engine.apply, lines)
+    print(f"{len(MISRECOGNITION_FIXES)} rules -> {len(engine.passes)} passes")
+    for name, t in (("re.sub per rule", t_seq), ("RewriteEngine", t_eng)):
+        print(f"[{name:>15}] {n / t:>10,.0f} lines/s | {t / n * 1e6:7.1f} us/line")
+    print(f"speedup: {t_seq / t_eng:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
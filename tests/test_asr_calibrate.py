@@ -0,0 +1,66 @@
+import sys
+from types import SimpleNamespace
+
+import numpy as np
+
+from asr_calibrate import SAMPLE_RATE, benchmark, load_asr_config, pick_config, save_asr_config, word_error_rate
+
+
+def result(model, rtf, wer=None):
+    r = {"model": model, "device": "cpu", "compute_type": "int8", "beam_size": 1, "rtf": rtf}
+    if wer is not None:
+        r["wer"] = wer
+    return r
+
+
+def test_word_error_rate():
+    assert word_error_rate("10-4 show me en route", "10-4 show me en route.") == 0.0
+    assert word_error_rate("adam 12 clear", "adam 12 copy clear") == 1 / 3
+    assert word_error_rate("", "") == 0.0
+
+
+def test_picks_most_accurate_config_within_headroom():
+    results = [
+        result("large", 1.4, 0.05),        # too slow
+        result("turbo", 0.6, 0.12),        # over 1.0 * (1 - 0.3)
+        result("distil", 0.5, 0.10),
+        result("small", 0.2, 0.25),
+        result("broken", None),
+    ]
+    assert pick_config(results, target_rtf=1.0, headroom=0.3)["model"] == "distil"
+
+
+def test_without_reference_falls_back_to_candidate_order():
+    results = [result("large", 1.4), result("turbo", 0.5), result("small", 0.2)]
+    assert pick_config(results)["model"] == "turbo"
+
+
+def test_nothing_fast_enough_picks_fastest():
+    results = [result("large", 3.0, 0.05), result("small", 1.2, 0.2)]
+    assert pick_config(results)["model"] == "small"
+    assert pick_config([result("broken", None)]) is None
+
+
+def test_config_roundtrip(tmp_path):
+    path = tmp_path / "asr_config.json"
+    assert load_asr_config(path) == {}
+    save_asr_config(path, {"model": "small.en", "device": "cpu", "beam_size": 1})
+    assert load_asr_config(path)["model"] == "small.en"
+    path.write_text("not json", encoding="utf-8")
+    assert load_asr_config(path) == {}
+
+
+def test_benchmark_measures_with_the_given_thread_count(monkeypatch):
+    built = []
+
+    class FakeWhisper:
+        def __init__(self, model_id, **kwargs):
+            built.append(kwargs)
+
+        def transcribe(self, audio, **kwargs):
+            return [SimpleNamespace(text=" ten four")], None
+
+    monkeypatch.setitem(sys.modules, "faster_whisper", SimpleNamespace(WhisperModel=FakeWhisper))
+    r = benchmark("small.en", "cpu", "int8", 1, np.zeros(SAMPLE_RATE, dtype=np.float32), "ten four", cpu_threads=6)
+    assert built == [{"device": "cpu", "compute_type": "int8", "cpu_threads": 6}]
+    assert r["cpu_threads"] == 6 and r["wer"] == 0.0 and r["rtf"] is not None
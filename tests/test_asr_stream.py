@@ -0,0 +1,50 @@
+from asr_stream import HypothesisBuffer, LatencyReport, words_text
+
+
+def words(*spec):
+    return [(float(a), float(b), t) for a, b, t in spec]
+
+
+def test_commits_only_the_prefix_two_decodes_agree_on():
+    h = HypothesisBuffer()
+    assert h.insert(words((0, 0.4, " Boy"), (0.4, 0.8, " 12"), (0.8, 1.2, " copy"))) == []
+    out = h.insert(words((0, 0.4, " Boy"), (0.4, 0.8, " 12,"), (0.8, 1.2, " coffee"), (1.2, 1.6, " on")))
+    assert words_text(out) == "Boy 12,"
+    assert h.committed_end == 0.8
+    assert words_text(h.tentative) == "coffee on"
+
+
+def test_committed_region_is_never_reemitted():
+    h = HypothesisBuffer()
+    h.insert(words((0, 0.4, " Boy"), (0.4, 0.8, " 12")))
+    h.insert(words((0, 0.4, " Boy"), (0.4, 0.8, " 12")))
+    # Later decode drifts the timestamps of the committed words slightly
+    h.insert(words((0.05, 0.45, " Boy"), (0.45, 0.85, " 12"), (0.9, 1.3, " en"), (1.3, 1.7, " route")))
+    out = h.insert(words((0.9, 1.3, " en"), (1.3, 1.7, " route")))
+    assert words_text(out) == "en route"
+
+
+def test_boundary_ngram_repeat_is_dropped():
+    h = HypothesisBuffer()
+    h.insert(words((0, 0.5, " 10-4")))
+    h.insert(words((0, 0.5, " 10-4")))
+    # decoder re-emits the committed word just after the boundary
+    h.insert(words((0.6, 1.0, " 10-4"), (1.0, 1.4, " clear")))
+    out = h.insert(words((1.0, 1.4, " clear")))
+    assert words_text(out) == "clear"
+
+
+def test_flush_commits_tentative_words():
+    h = HypothesisBuffer()
+    h.insert(words((0, 0.4, " show"), (0.4, 0.8, " me")))
+    assert words_text(h.flush()) == "show me"
+    assert h.tentative == []
+    assert h.committed_end == 0.8
+
+
+def test_latency_report_summary():
+    r = LatencyReport()
+    assert r.summary() == "no samples"
+    for v in (0.5, 1.0, 1.5, 2.0):
+        r.add(v)
+    assert r.summary().startswith("n=4 p50=1.50s")
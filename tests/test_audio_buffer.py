@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from audio_buffer import AudioRingBuffer
+
+
+def ramp(start, stop):
+    return np.arange(start, stop, dtype=np.float32)
+
+
+def test_read_across_wraparound():
+    r = AudioRingBuffer(8)
+    r.write(ramp(0, 6))
+    assert r.read(5).tolist() == [0, 1, 2, 3, 4]
+    r.write(ramp(6, 12))  # wraps past the end of storage
+    assert r.available() == 7
+    assert r.read(7).tolist() == list(range(5, 12))
+    assert r.dropped_samples == 0
+
+
+def test_view_is_contiguous_and_zero_copy_across_wraparound():
+    r = AudioRingBuffer(8)
+    r.write(ramp(0, 6))
+    r.advance(6)
+    r.write(ramp(6, 11))
+    w = r.view(4, 11)  # spans the physical wrap point
+    assert w.tolist() == list(range(4, 11))
+    assert w.flags["C_CONTIGUOUS"]
+    assert np.shares_memory(w, r._buf)
+
+
+def test_view_rejects_overwritten_or_unwritten_ranges():
+    r = AudioRingBuffer(8)
+    r.write(ramp(0, 12))
+    assert r.oldest_index == 4
+    with pytest.raises(ValueError):
+        r.view(3, 8)
+    with pytest.raises(ValueError):
+        r.view(8, 13)
+
+
+def test_overflow_counts_dropped_unread_samples():
+    r = AudioRingBuffer(8)
+    r.write(ramp(0, 6))
+    r.read(2)
+    r.write(ramp(6, 12))  # 10 unread into 8 slots: samples 2 and 3 are lost
+    assert r.dropped_samples == 2
+    assert r.read_index == 4
+    assert r.read(8).tolist() == list(range(4, 12))
+
+
+def test_oversized_write_keeps_newest_samples():
+    r = AudioRingBuffer(8)
+    r.write(ramp(0, 20))
+    assert r.dropped_samples == 12
+    assert r.write_index == 20
+    assert r.read(8).tolist() == list(range(12, 20))
+
+
+def test_clear_discards_history():
+    r = AudioRingBuffer(8)
+    r.write(ramp(0, 5))
+    r.clear()
+    assert r.available() == 0
+    assert r.oldest_index == 5
+    r.write(ramp(5, 7))
+    assert r.view(r.oldest_index, r.write_index).tolist() == [5, 6]
+
+
+def test_read_times_out_when_short():
+    r = AudioRingBuffer(8)
+    r.write(ramp(0, 3))
+    assert r.read(4, timeout=0.01) is None
+    assert r.available() == 3
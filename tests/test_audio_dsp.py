@@ -0,0 +1,81 @@
+import numpy as np
+
+from audio_dsp import EnergyVAD, OnePoleIIR, TransmissionSegmenter, high_pass
+
+SR = 16000
+
+
+def tone(seconds, amp, hz=440.0):
+    t = np.arange(int(seconds * SR)) / SR
+    return (amp * np.sin(2 * np.pi * hz * t)).astype(np.float32)
+
+
+def noise(seconds, amp, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(int(seconds * SR)) * amp).astype(np.float32)
+
+
+def test_high_pass_matches_per_sample_recurrence_across_blocks():
+    a = 0.97
+    x = noise(0.5, 0.1)
+    ref = np.empty(len(x))
+    y_prev = x_prev = 0.0
+    for i, xi in enumerate(x.astype(np.float64)):
+        y_prev = a * (y_prev + xi - x_prev)
+        x_prev = xi
+        ref[i] = y_prev
+
+    iir = OnePoleIIR(a)
+    out, y_prev, x_prev = [], 0.0, 0.0
+    for s in range(0, len(x), 800):
+        y, y_prev, x_prev = high_pass(x[s:s + 800], iir, y_prev, x_prev)
+        out.append(y)
+    assert np.max(np.abs(np.concatenate(out) - ref)) < 1e-6
+
+
+def test_vad_skips_dead_air_and_passes_speech():
+    vad = EnergyVAD(SR, threshold=0.01)
+    assert not vad.has_speech(noise(4.0, 0.002))
+    assert vad.has_speech(np.concatenate([noise(3.0, 0.002), tone(1.0, 0.1)]))
+
+
+def test_vad_noise_floor_adapts_to_loud_hiss():
+    vad = EnergyVAD(SR, threshold=0.01)
+    hiss = noise(4.0, 0.02, seed=1)
+    for _ in range(60):
+        vad.has_speech(hiss[:SR // 2])
+    assert vad.noise_floor > 0.01
+    assert not vad.has_speech(noise(4.0, 0.02, seed=2))
+    assert vad.has_speech(tone(1.0, 0.3) + noise(1.0, 0.02, seed=3))
+
+
+def feed_in_blocks(seg, x, block=3200):
+    out = []
+    for s in range(0, len(x), block):
+        out += seg.feed(x[s:s + block])
+    return out
+
+
+def test_segmenter_emits_one_range_per_transmission():
+    seg = TransmissionSegmenter(EnergyVAD(SR, threshold=0.01), SR, tail_sec=0.5, preroll_sec=0.1)
+    x = np.concatenate([
+        noise(1.0, 0.002), tone(1.5, 0.1),
+        noise(2.0, 0.002, seed=1), tone(0.8, 0.1),
+        noise(1.0, 0.002, seed=2),
+    ])
+    spans = feed_in_blocks(seg, x)
+    assert len(spans) == 2
+    (s1, e1), (s2, e2) = spans
+    assert abs(s1 - int(0.9 * SR)) <= seg.frame and abs(e1 - int(2.5 * SR)) <= seg.frame
+    assert abs(s2 - int(4.4 * SR)) <= seg.frame and abs(e2 - int(5.3 * SR)) <= seg.frame
+    assert seg.flush() == []
+
+
+def test_segmenter_caps_long_transmissions_and_drops_clicks():
+    seg = TransmissionSegmenter(EnergyVAD(SR, threshold=0.01), SR, tail_sec=0.5, max_sec=2.0)
+    click = tone(0.03, 0.5)
+    x = np.concatenate([noise(0.5, 0.002), click, noise(1.0, 0.002, seed=1), tone(5.0, 0.1)])
+    spans = feed_in_blocks(seg, x) + seg.flush()
+    assert len(spans) == 3
+    assert all(e - s <= 2 * SR for s, e in spans)
+    assert all(spans[i][1] <= spans[i + 1][0] for i in range(len(spans) - 1))
@@ -0,0 +1,136 @@
+import os
+import threading
+import time
+
+import pytest
+
+from corrector_worker import CorrectorProcess, parse_cpus, thread_env
+
+
+def test_parse_cpus():
+    assert parse_cpus("") == set()
+    assert parse_cpus("3") == {3}
+    assert parse_cpus("0, 2-4,4") == {0, 2, 3, 4}
+
+
+def test_thread_env_caps_math_libraries():
+    env = thread_env(2)
+    assert env["OMP_NUM_THREADS"] == env["MKL_NUM_THREADS"] == "2"
+    assert thread_env(0)["OMP_NUM_THREADS"] == "1"
+
+
+STUB = '''
+import os
+import time
+
+
+class Cache:
+    hits = misses = 0
+
+
+class StubCorrector:
+    """Upper-cases lines. "slow <sec>" sleeps first, "boom" raises, "die" kills the worker."""
+
+    backend = "stub"
+
+    def __init__(self, model_dir, **kwargs):
+        if model_dir == "missing":
+            raise FileNotFoundError("no model in missing")
+        if model_dir == "slow-load":
+            time.sleep(0.5)
+        self.cache = Cache()
+
+    def correct_batch(self, texts):
+        self.cache.misses += len(texts)
+        for text in texts:
+            if text == "die":
+                os._exit(3)
+            if text == "boom":
+                raise ValueError("boom")
+            if text.startswith("slow "):
+                time.sleep(float(text.split()[1]))
+        return [text.upper() for text in texts]
+
+    def decode_stats(self):
+        return {"lines": self.cache.misses}
+'''
+
+
+@pytest.fixture
+def worker(tmp_path, monkeypatch):
+    """Start CorrectorProcess hosting StubCorrector instead of the real model."""
+    (tmp_path / "stub_corrector.py").write_text(STUB, encoding="utf-8")
+    monkeypatch.setenv("PYTHONPATH", os.pathsep.join(filter(None, (str(tmp_path), os.environ.get("PYTHONPATH")))))
+    procs = []
+
+    def start(model_dir="model", **kwargs):
+        kwargs.setdefault("start_timeout", 30)
+        proc = CorrectorProcess(model_dir, corrector="stub_corrector:StubCorrector", **kwargs)
+        procs.append(proc)
+        return proc
+
+    yield start
+    for proc in procs:
+        proc.close()
+
+
+def test_process_round_trip(worker):
+    proc = worker()
+    assert proc.alive and proc.backend == "stub"
+    assert proc.correct_batch(["copy", "en route"]) == ["COPY", "EN ROUTE"]
+    assert proc.cache_misses == 2 and proc.decode_stats() == {"lines": 2}
+
+    # an exception in the corrector answers that request with its inputs; the worker lives on
+    assert proc.correct_batch(["boom"]) == ["boom"]
+    assert proc.correct_batch(["copy"]) == ["COPY"]
+
+
+def test_late_replies_fall_back_and_stale_requests_expire(worker):
+    proc = worker(timeout=0.3)
+    t0 = time.perf_counter()
+    assert proc.correct_batch(["slow 1"]) == ["slow 1"]
+    # queued behind the slow line: past its deadline before the worker reaches it
+    assert proc.correct_batch(["copy"]) == ["copy"]
+    assert time.perf_counter() - t0 < 0.9 and proc.timeouts == 2
+
+    time.sleep(1.0)
+    assert proc.correct_batch(["clear"]) == ["CLEAR"]
+    # "copy" was answered "expired" without reaching the model
+    assert proc.cache_misses == 2
+
+
+def test_dead_worker_returns_inputs(worker):
+    proc = worker()
+    assert proc.correct_batch(["die"]) == ["die"]
+    assert not proc.alive
+    assert proc.correct_batch(["copy"]) == ["copy"] and proc.rejected == 1
+
+
+def test_full_slots_shed_new_requests(worker):
+    proc = worker(max_pending=1, timeout=5)
+    result = []
+    busy = threading.Thread(target=lambda: result.extend(proc.correct_batch(["slow 0.5"])))
+    busy.start()
+    deadline = time.time() + 5
+    while not proc._pending and time.time() < deadline:
+        time.sleep(0.01)
+    assert proc.correct_batch(["copy"]) == ["copy"] and proc.rejected == 1
+    busy.join()
+    assert result == ["SLOW 0.5"]
+
+
+def test_start_failure_raises(worker):
+    with pytest.raises(RuntimeError, match="no model in missing"):
+        worker("missing")
+
+
+def test_background_start_passes_lines_through_until_ready(worker):
+    t0 = time.perf_counter()
+    proc = worker("slow-load", start_timeout=None)
+    assert time.perf_counter() - t0 < 0.4
+    assert proc.correct_batch(["copy"]) == ["copy"] and proc.rejected == 1
+    assert proc.ready.result(timeout=30)["backend"] == "stub"
+    assert proc.alive and proc.correct_batch(["copy"]) == ["COPY"]
+
+    failed = worker("missing", start_timeout=None)
+    assert isinstance(failed.ready.exception(timeout=30), RuntimeError) and not failed.alive
@@ -0,0 +1,61 @@
+import random
+import string
+
+from fuzzy_vocab import DeletionIndex, levenshtein
+
+PHONETICS = [
+    "adam", "boy", "charles", "david", "edward", "frank", "george", "henry",
+    "ida", "john", "king", "lincoln", "mary", "nora", "ocean", "paul", "queen",
+    "robert", "sam", "tom", "union", "victor", "william", "x-ray", "yellow", "zebra",
+    "echo",
+]
+
+
+def linear_lookup(term, words, max_distance):
+    """The old fuzzy_fix_phonetics search: first word at the smallest distance."""
+    best, best_d = None, max_distance + 2
+    for w in words:
+        d = levenshtein(term, w, max_dist=max_distance)
+        if d < best_d:
+            best, best_d = w, d
+    return (best, best_d) if best is not None and best_d <= max_distance else None
+
+
+def mutate(rng, word, edits):
+    for _ in range(edits):
+        i = rng.randrange(len(word) + 1)
+        op = rng.choice("ids")
+        c = rng.choice(string.ascii_lowercase + "-")
+        if op == "i":
+            word = word[:i] + c + word[i:]
+        elif op == "d" and i < len(word):
+            word = word[:i] + word[i + 1:]
+        elif i < len(word):
+            word = word[:i] + c + word[i + 1:]
+    return word
+
+
+def test_levenshtein():
+    assert levenshtein("boi", "boy") == 1
+    assert levenshtein("charls", "charles") == 1
+    assert levenshtein("ab", "ba") == 2
+    assert levenshtein("abcdef", "a", max_dist=2) == 3
+
+
+def test_index_matches_linear_scan():
+    rng = random.Random(3)
+    for k in (1, 2):
+        index = DeletionIndex(PHONETICS, max_distance=k)
+        for _ in range(20000):
+            term = mutate(rng, rng.choice(PHONETICS), rng.randint(0, 3))
+            if not term:
+                continue
+            assert index.lookup(term) == linear_lookup(term, PHONETICS, k), (term, k)
+
+
+def test_ties_go_to_the_first_word_added():
+    index = DeletionIndex(["bat", "cat"], max_distance=1)
+    assert index.lookup("at") == ("bat", 1)
+    assert DeletionIndex(["cat", "bat"]).lookup("at") == ("cat", 1)
+    assert index.lookup("dog") is None
+    assert "cat" in index and len(index) == 2
@@ -0,0 +1,42 @@
+import json
+
+from latency_trace import LatencyTracer, NullTracer
+
+
+def test_percentiles_per_stage():
+    t = LatencyTracer()
+    for ms in range(1, 101):
+        t.record("transcribe", ms / 1000)
+    t.record("dsp", 0.002)
+    s = t.summary()
+    assert s["transcribe"]["n"] == 100
+    assert s["transcribe"]["p50"] == 0.051
+    assert s["transcribe"]["p99"] == 0.1
+    assert s["dsp"]["max"] == 0.002
+    assert len(t.summary_lines()) == 2
+
+
+def test_ring_keeps_newest_samples():
+    t = LatencyTracer(max_samples=3)
+    for v in (1.0, 2.0, 3.0, 4.0):
+        t.record("writers", v)
+    assert list(t.stages["writers"]) == [2.0, 3.0, 4.0]
+
+
+def test_start_stop_and_dump(tmp_path):
+    t = LatencyTracer()
+    t.stop("post_process_1", t.start())
+    path = tmp_path / "trace.json"
+    t.dump(path)
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert data["summary"]["post_process_1"]["n"] == 1
+    assert len(data["samples"]["post_process_1"]) == 1
+
+
+def test_null_tracer_records_nothing(tmp_path):
+    t = NullTracer()
+    t.stop("dsp", t.start())
+    t.record("dsp", 1.0)
+    assert t.summary() == {} and t.summary_lines() == []
+    t.dump(tmp_path / "trace.json")
+    assert not (tmp_path / "trace.json").exists()
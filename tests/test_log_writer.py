@@ -0,0 +1,67 @@
+import threading
+
+import pytest
+
+from log_writer import GroupCommitWriter
+
+
+def test_lines_land_in_order_across_files(tmp_path):
+    w = GroupCommitWriter("group", commit_ms=50)
+    a, b = tmp_path / "a.log", tmp_path / "b.log"
+    for i in range(200):
+        w.append(a if i % 3 else b, f"{i}\n")
+    w.close()
+    assert a.read_text().split() == [str(i) for i in range(200) if i % 3]
+    assert b.read_text().split() == [str(i) for i in range(200) if not i % 3]
+    assert w.writes == 200 and w.fsyncs < 200
+    with pytest.raises(RuntimeError):
+        w.append(a, "late\n")
+
+
+def test_flush_makes_queued_lines_visible(tmp_path):
+    w = GroupCommitWriter("os", commit_ms=10_000)
+    path = tmp_path / "caption_log.txt"
+    w.append(path, "[RAW] one\n")
+    w.append(path, "[FINAL] one\n", urgent=True)
+    w.flush()
+    assert path.read_text() == "[RAW] one\n[FINAL] one\n"
+    w.close()
+
+
+def test_sync_mode_shares_fsyncs_between_threads(tmp_path):
+    w = GroupCommitWriter("sync")
+    path = tmp_path / "full.log"
+    threads = [threading.Thread(target=w.append, args=(path, f"{i}\n")) for i in range(20)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    # every append returned only after its line was written
+    assert sorted(path.read_text().split(), key=int) == [str(i) for i in range(20)]
+    assert w.fsyncs <= 20
+    w.close()
+
+
+def test_rejects_unknown_durability():
+    with pytest.raises(ValueError):
+        GroupCommitWriter("paranoid")
+
+
+def test_flush_after_close_returns(tmp_path):
+    w = GroupCommitWriter("group")
+    w.append(tmp_path / "a.log", "one\n")
+    w.close()
+    w.flush()
+    assert (tmp_path / "a.log").read_text() == "one\n"
+
+
+@pytest.mark.parametrize("durability", ["os", "sync"])
+def test_unencodable_line_is_skipped_not_fatal(tmp_path, capsys, durability):
+    w = GroupCommitWriter(durability)
+    path = tmp_path / "caption_log.txt"
+    w.append(path, "bad \ud800 surrogate\n")  # returns in "sync" mode too
+    w.append(path, "good\n")
+    w.flush()
+    assert path.read_text() == "good\n"
+    assert "[LogWriter]" in capsys.readouterr().out
+    w.close()
@@ -0,0 +1,266 @@
+import os
+import time
+from concurrent.futures import Future
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip("faster_whisper")
+pytest.importorskip("local_corrector")
+
+# Keep the import light: no corrector worker process, no overlay server, no database
+os.environ.setdefault("LOCAL_MODEL_PROCESS", "0")
+os.environ.setdefault("OVERLAY_SERVER", "0")
+os.environ.setdefault("TRANSCRIPT_DB", "")
+
+import main_6  # noqa: E402
+from replay import VirtualClock  # noqa: E402
+
+SR = main_6.SAMPLE_RATE
+
+
+class FakeModel:
+    """Stands in for WhisperModel / BatchedInferencePipeline: hears nothing, counts calls."""
+
+    def __init__(self, calls: list, kind: str):
+        self.calls, self.kind = calls, kind
+
+    def transcribe(self, audio, **kwargs):
+        self.calls.append((self.kind, len(audio)))
+        return [], None
+
+
+@pytest.fixture
+def obs_files(tmp_path, monkeypatch):
+    """Point every OBS caption, log and HTML page main_6 writes into tmp_path/live."""
+    live = tmp_path / "live"
+    live.mkdir()
+    monkeypatch.setattr(main_6, "overlay", None)
+    monkeypatch.setattr(main_6, "OBS_LIVE_FILE", live / "live_caption.txt")
+    monkeypatch.setattr(main_6, "OBS_FINAL_FILE", live / "final_caption.txt")
+    monkeypatch.setattr(main_6, "OBS_CAPTION_LOG_FILE", live / "caption_log.txt")
+    monkeypatch.setattr(main_6, "OBS_ALERTS_HTML", live / "alerts.html")
+    monkeypatch.setattr(main_6, "UNRECOGNIZED_TERMS_LOG", live / "unrecognized_terms.log")
+    monkeypatch.setattr(main_6, "INCOMING_BLOCKS_FILE", live / "incoming_blocks.txt")
+    monkeypatch.setattr(main_6, "full_logger", main_6.FullTranscriptLogger(
+        live / "full_transcript_log.txt", live / "full_transcript_log.html", live / "lower_third.html",
+        main_6.SILENCE_GAP_SECONDS,
+    ))
+    writer = main_6.OBSCaptionWriter()
+    monkeypatch.setattr(main_6, "obs_writer", writer)
+    monkeypatch.setattr(main_6, "output_stage", main_6.OutputStage(main_6.write_utterance, writer.update_live))
+    return live
+
+
+@pytest.fixture
+def hop_loop(obs_files, monkeypatch):
+    """Run _asr_hop_loop over audio already waiting on audio_q; returns the decode calls."""
+    calls = []
+    monkeypatch.setattr(main_6, "clock", VirtualClock(SR, start=0.0))
+    monkeypatch.setattr(main_6, "ASR_VAD_GATE", False)
+    monkeypatch.setattr(main_6, "BatchedInferencePipeline", lambda model: FakeModel(calls, "batched"))
+    monkeypatch.setattr(main_6, "asr_stats", dict.fromkeys(main_6.asr_stats, 0))
+
+    def run(seconds: float):
+        block = np.zeros(main_6.AUDIO_BLOCKSIZE, dtype=np.float32)
+        for _ in range(int(seconds * SR) // len(block)):
+            main_6.audio_q.put((time.perf_counter(), block))
+        main_6.audio_q.put(None)
+        main_6._asr_hop_loop(FakeModel(calls, "model"))
+        return calls
+
+    return run
+
+
+def test_hop_loop_caps_backlog_at_the_ring(hop_loop, capsys):
+    ring_sec = (main_6.ASR_CHUNK_SEC + main_6.ASR_OVERLAP_SEC) * 10 + main_6.ASR_OVERLAP_SEC
+    hop_loop(ring_sec + 20)
+    assert "ASR fell behind" in capsys.readouterr().out
+    # only what the ring kept was decoded
+    assert main_6.asr_stats["transcribed_sec"] <= ring_sec
+
+
+def test_hop_loop_batches_a_queued_backlog(hop_loop):
+    calls = hop_loop(40)
+    kinds = [kind for kind, _ in calls]
+    assert kinds[0] == "batched" and main_6.asr_stats["catchup_batches"] >= 1
+    # every hop decoded once: the batch covers ASR_CATCHUP_MAX_HOPS, single hops the rest
+    hops = int(40 / main_6.ASR_CHUNK_SEC)
+    assert kinds.count("model") == hops - main_6.ASR_CATCHUP_MAX_HOPS * kinds.count("batched")
+
+
+def test_hop_loop_keeps_speech_together_across_a_stall(hop_loop, obs_files, monkeypatch):
+    submitted = []
+    monkeypatch.setattr(main_6, "submit_utterance", lambda text, now, captured_at=None: submitted.append(text))
+
+    class Talker(FakeModel):
+        """Hears one word per window; the first decode is slow enough for 30 s to queue up."""
+
+        def transcribe(self, audio, **kwargs):
+            if not self.calls:
+                block = np.zeros(main_6.AUDIO_BLOCKSIZE, dtype=np.float32)
+                for _ in range(30 * SR // len(block)):
+                    main_6.audio_q.put((time.perf_counter(), block))
+                main_6.audio_q.put(None)
+            self.calls.append((self.kind, len(audio)))
+            mid = len(audio) / SR / 2
+            return [SimpleNamespace(end=mid + 0.2, words=[SimpleNamespace(start=mid, end=mid + 0.2, word=" go")])], None
+
+    calls = []
+    monkeypatch.setattr(main_6, "BatchedInferencePipeline", lambda model: Talker(calls, "batched"))
+    block = np.zeros(main_6.AUDIO_BLOCKSIZE, dtype=np.float32)
+    for _ in range(int(main_6.ASR_CHUNK_SEC * SR) // len(block) + 1):
+        main_6.audio_q.put((time.perf_counter(), block))
+    main_6._asr_hop_loop(Talker(calls, "model"))
+    assert len(submitted) == 1 and "batched" in [kind for kind, _ in calls]
+    assert "go" in (obs_files / "live_caption.txt").read_text(encoding="utf-8")
+
+
+def test_rules_run_once_on_the_text_that_is_finalized(obs_files, monkeypatch):
+    seen = []
+    rules = main_6.post_process_transcript
+    monkeypatch.setattr(main_6, "post_process_transcript", lambda text, *a: seen.append(text) or rules(text, *a))
+    monkeypatch.setattr(main_6, "submit_local_model", lambda text: None)
+
+    _raw, processed, future, *_ = main_6._begin_utterance("charles 3 copy en route", 0.0)
+    assert main_6.local_model_result(processed, future) == (processed, processed)
+    assert seen == ["charles 3 copy en route"]
+
+    # model output is post-processed once, and the safety check reuses that result
+    seen.clear()
+    future = Future()
+    future.set_result("Charles 3 copy, en route")
+    enhanced, final = main_6.local_model_result(processed, future)
+    assert seen == ["Charles 3 copy, en route"] and enhanced == seen[0] and final == rules(enhanced)
+
+
+class FakeOutput:
+    def __init__(self):
+        self.records = []
+
+    def submit(self, record):
+        self.records.append(record)
+
+    def set_live(self, text):
+        pass
+
+
+def _model_result(text):
+    """A finished local-model future that renames unit Boy to David."""
+    future = Future()
+    future.set_result(text.replace("Boy", "David"))
+    return future
+
+
+@pytest.mark.parametrize("model", [lambda text: None, _model_result], ids=["no-model", "model-edits-callsign"])
+def test_batched_utterances_match_one_at_a_time(obs_files, monkeypatch, model):
+    lines = ["Charles 3 copy en route to the station", "3 on scene", "Boy 12 copy", "12 clear"]
+
+    def run(batched: bool) -> list[str]:
+        out = FakeOutput()
+        monkeypatch.setattr(main_6, "output_stage", out)
+        monkeypatch.setattr(main_6, "recent_unit_by_number", {})
+        monkeypatch.setattr(main_6, "submit_local_model", model)
+        if batched:
+            for line in lines:
+                main_6.utterance_q.put((line, 0.0, None))
+            main_6.utterance_q.put(None)
+            main_6.utterance_worker_run()  # everything arrives in one drained batch
+        else:
+            for line in lines:
+                main_6.process_utterance_text(line, 0.0)
+        return [r.final for r in out.records]
+
+    serial = run(batched=False)
+    assert any("Charles 3 on scene" in final for final in serial)
+    assert run(batched=True) == serial, serial
+
+
+@pytest.fixture
+def live_outputs(obs_files, tmp_path, monkeypatch):
+    """obs_files plus a transcript store in tmp_path."""
+    from transcript_store import TranscriptStore
+
+    store = TranscriptStore(tmp_path / "transcripts.db")
+    monkeypatch.setattr(main_6, "transcript_store", store)
+    yield obs_files
+    store.close()
+
+
+UTTERANCES = [
+    # raw, final, alert, speaker, plate, seconds
+    ("charles 3 ten four en route", "[O] Charles 3 10-4 (understood) en route", False, "O", None, 0),
+    ("copy charles 3", "[D] copy Charles 3", False, "D", None, 2),
+    ("run plate seven adam boy charles", "[D] run plate 10-28 (registration)", False, "D", "Plate: 7ABC", 3),
+    ("boy 12 ten ninety seven", "[O] Boy 12 10-97 (arrived)", False, "O", None, 60),
+    ("shots fired ten thirty three charles 3", "[D] shots fired 10-33 (emergency) Charles 3", True, "D", None, 61),
+]
+
+
+def test_rebuilt_views_match_the_live_output(live_outputs, tmp_path):
+    t0 = time.mktime((2025, 3, 1, 12, 0, 0, 0, 0, -1))
+    for raw, final, alert, speaker, plate, sec in UTTERANCES:
+        t = time.perf_counter()
+        main_6.write_utterance(main_6.UtteranceRecord(
+            raw, raw, final, f"🚨 {final}" if alert else final, alert, speaker, None, plate,
+            t0 + sec, None, t, t,
+        ))
+    main_6.log_writer.flush()
+
+    names = ("caption_log.txt", "full_transcript_log.txt", "incoming_blocks.txt")
+    main_6.run_rebuild_views(tmp_path / "all")
+    main_6.log_writer.flush()
+    for name in names:
+        assert (tmp_path / "all" / name).read_text(encoding="utf-8") == (live_outputs / name).read_text(encoding="utf-8")
+    full_log = (live_outputs / "full_transcript_log.txt").read_text(encoding="utf-8")
+    assert "[2025-03-01 12:00:00] [O] Charles 3" in full_log and "[2025-03-01 12:01:00] [O] Boy 12" in full_log
+    assert "7ABC" in (tmp_path / "all" / "full_transcript_log.html").read_text(encoding="utf-8")
+
+    def finals(out_dir):
+        text = (out_dir / "caption_log.txt").read_text(encoding="utf-8")
+        return [line.split("[FINAL] ", 1)[1] for line in text.splitlines() if "[FINAL] " in line]
+
+    main_6.run_rebuild_views(tmp_path / "c3", callsign="charles 3")
+    main_6.run_rebuild_views(tmp_path / "code", code="10-97")
+    main_6.run_rebuild_views(tmp_path / "late", since=t0 + 30, until=t0 + 61)
+    main_6.log_writer.flush()
+    assert finals(tmp_path / "c3") == [u[1] for u in UTTERANCES if "Charles 3" in u[1]]
+    assert finals(tmp_path / "code") == ["[O] Boy 12 10-97 (arrived)"]
+    assert finals(tmp_path / "late") == ["[O] Boy 12 10-97 (arrived)"]
+
+
+def test_full_log_reuses_block_html_until_the_block_changes(tmp_path, monkeypatch):
+    monkeypatch.setattr(main_6, "overlay", None)
+    logger = main_6.FullTranscriptLogger(
+        tmp_path / "log.txt", tmp_path / "log.html", tmp_path / "lower_third.html", gap_seconds=10.0,
+    )
+    assert not (tmp_path / "log.html").exists()  # constructing a logger writes nothing
+    logger.add_entry("[O] Charles 3 en route", at=1000.0)
+    first = logger.blocks[0]["html"]
+    assert "en route" in first
+
+    # same block (inside the gap): its revision bumps and it is rendered again
+    logger.add_entry("[D] copy", at=1002.0)
+    assert logger.blocks[0]["rev"] == 2 and "copy" in logger.blocks[0]["html"]
+    assert "copy" in (tmp_path / "log.html").read_text(encoding="utf-8")
+
+    # a new block leaves the finished one's cached fragment alone
+    cached = logger.blocks[0]["html"]
+    logger.add_entry("[O] Boy 12 on scene", at=1100.0)
+    assert logger.blocks[0]["html"] is cached and len(logger.blocks) == 2
+
+    # unchanged (seq, rev) signatures: both pages are skipped, nothing rewritten
+    writes, skips = logger.html_writes, logger.html_skips
+    logger._write_html()
+    assert logger.html_writes == writes and logger.html_skips == skips + (2 if main_6.LOWER_THIRD_MODE else 1)
+
+
+def test_transcript_store_opens_on_first_use(tmp_path, monkeypatch):
+    db = tmp_path / "obs" / "transcripts.db"
+    monkeypatch.setattr(main_6, "TRANSCRIPT_DB", str(db))
+    monkeypatch.setattr(main_6, "transcript_store", None)
+    assert not db.exists()
+    store = main_6.open_transcript_store()
+    assert db.exists() and main_6.open_transcript_store() is store
+    store.close()
@@ -0,0 +1,89 @@
+import queue
+import threading
+import time
+
+import pytest
+
+from micro_batch import LRUCache, MicroBatcher, length_batches
+
+
+def test_lru_cache_evicts_least_recently_used():
+    c = LRUCache(2)
+    c.put("a", 1)
+    c.put("b", 2)
+    assert c.get("a") == 1
+    c.put("c", 3)
+    assert c.get("b") is None
+    assert (c.get("a"), c.get("c")) == (1, 3)
+    assert (c.hits, c.misses) == (3, 1)
+
+
+def test_length_batches_groups_similar_lengths():
+    lengths = [30, 5, 6, 31, 7, 100]
+    assert length_batches(lengths, max_batch=2) == [[1, 2], [4], [0, 3], [5]]
+    assert sorted(i for b in length_batches(lengths, max_batch=16) for i in b) == list(range(6))
+
+
+def test_micro_batcher_runs_one_call_for_concurrent_submits():
+    calls = []
+
+    def fn(items):
+        calls.append(list(items))
+        return [x * 2 for x in items]
+
+    mb = MicroBatcher(fn, max_batch=8, max_wait_ms=50)
+    futs = [mb.submit(i) for i in range(5)]
+    assert [f.result(timeout=2) for f in futs] == [0, 2, 4, 6, 8]
+    assert calls == [[0, 1, 2, 3, 4]]
+
+    # Items submitted from several threads at once still share a batch
+    results = {}
+    threads = [threading.Thread(target=lambda i=i: results.update({i: mb.submit(i).result()})) for i in range(3)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert results == {0: 0, 1: 2, 2: 4}
+    assert mb.batches == 2 and mb.items == 8
+    mb.close()
+
+
+def test_micro_batcher_splits_full_batches_and_reports_errors():
+    def fn(items):
+        if "bad" in items:
+            raise ValueError("boom")
+        time.sleep(0.01)
+        return items
+
+    mb = MicroBatcher(fn, max_batch=2, max_wait_ms=20)
+    futs = [mb.submit(x) for x in ("a", "b", "c")]
+    assert [f.result(timeout=2) for f in futs] == ["a", "b", "c"]
+    assert mb.batches == 2
+    with pytest.raises(ValueError):
+        mb.submit("bad").result(timeout=2)
+    mb.close()
+    with pytest.raises(RuntimeError):
+        mb.submit("late")
+
+
+def test_micro_batcher_sheds_load_and_skips_cancelled_items():
+    gate = threading.Event()
+    calls = []
+
+    def fn(items):
+        calls.append(list(items))
+        gate.wait(2)
+        return items
+
+    mb = MicroBatcher(fn, max_batch=1, max_wait_ms=0, max_pending=2)
+    first = mb.submit("busy")
+    while not calls:
+        time.sleep(0.001)
+    stale, fresh = mb.submit("stale"), mb.submit("fresh")
+    with pytest.raises(queue.Full):
+        mb.submit("overflow")
+    assert stale.cancel()
+    gate.set()
+    assert (first.result(timeout=2), fresh.result(timeout=2)) == ("busy", "fresh")
+    assert calls == [["busy"], ["fresh"]]
+    mb.close()
@@ -0,0 +1,91 @@
+import asyncio
+import threading
+
+from output_stage import OutputStage
+
+
+def test_without_a_loop_writes_happen_in_the_caller():
+    records, live = [], []
+    stage = OutputStage(records.append, live.append)
+    stage.submit("a")
+    stage.set_live("partial")
+    stage.set_live("   ")
+    assert records == ["a"] and live == ["partial"]
+    assert stage.written == stage.submitted == 1
+
+
+def test_records_are_written_in_order_and_live_text_is_coalesced():
+    release = threading.Event()
+    records, live = [], []
+
+    def write_live(text):
+        release.wait(5)
+        live.append(text)
+
+    stage = OutputStage(records.append, write_live, maxsize=4)
+
+    def produce():
+        for i in range(20):
+            stage.submit(i)
+            stage.set_live(f"live {i}")
+        release.set()
+        stage.close()
+
+    async def run():
+        task = asyncio.create_task(stage.run())
+        await asyncio.sleep(0)
+        await asyncio.to_thread(produce)
+        await task
+
+    asyncio.run(run())
+    assert records == list(range(20))
+    # the first live write was held until the producer finished: everything after it collapsed
+    assert live[-1] == "live 19" and len(live) < 20
+    assert stage.live_requested == 20 and stage.live_written == len(live)
+
+
+def test_full_queue_blocks_the_producer():
+    gate = threading.Event()
+    records = []
+
+    def write_record(rec):
+        gate.wait(5)
+        records.append(rec)
+
+    stage = OutputStage(write_record, lambda text: None, maxsize=2)
+
+    def produce():
+        for i in range(6):
+            stage.submit(i)
+        stage.close()
+
+    async def run():
+        task = asyncio.create_task(stage.run())
+        await asyncio.sleep(0)
+        producer = asyncio.create_task(asyncio.to_thread(produce))
+        await asyncio.sleep(0.2)
+        assert not producer.done()  # stuck behind the slow writer
+        gate.set()
+        await producer
+        await task
+
+    asyncio.run(run())
+    assert records == list(range(6))
+    assert stage.blocked >= 1 and stage.blocked_sec > 0
+    assert stage.max_depth == 2
+    assert any("blocked" in line for line in stage.summary_lines())
+
+
+def test_close_before_run_starts_returns_at_once():
+    stage = OutputStage(lambda rec: None, lambda text: None)
+
+    async def run():
+        task = asyncio.create_task(stage.run())
+        stage.close()  # the task has not taken its first step yet
+        await asyncio.wait_for(task, 1)
+
+    asyncio.run(run())
+    records = []
+    stage.write_record = records.append
+    stage.submit("late")  # still written, synchronously
+    assert records == ["late"]
@@ -0,0 +1,66 @@
+import asyncio
+import json
+import socket
+import threading
+import urllib.request
+
+from websockets.asyncio.client import connect
+
+from overlay_server import OverlayServer, overlay_page
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def test_overlay_page_only_includes_requested_parts():
+    page = overlay_page("<style></style></head><body>", max_blocks=6)
+    assert "id='stack'" in page and "id='live'" not in page and "MAX_BLOCKS = 6" in page
+    assert "location.reload" not in page
+    assert "id='live'" in overlay_page("</head><body>", live=True)
+
+
+def test_server_serves_pages_and_pushes_deltas():
+    port = _free_port()
+    server = OverlayServer("127.0.0.1", port, keep_blocks=2)
+    server.add_page("/lower_third", overlay_page("</head><body>", max_blocks=2))
+    server.publish_block(0, "<div class='ts'>old</div>")
+    server.publish_block(1, "<div class='ts'>one</div>")
+    server.publish_block(2, "<div class='ts'>two</div>")
+
+    async def scenario():
+        task = asyncio.create_task(server.serve_forever())
+        await asyncio.sleep(0.2)
+        url = f"http://127.0.0.1:{port}/lower_third"
+        with await asyncio.to_thread(urllib.request.urlopen, url) as resp:
+            assert resp.headers["Content-Type"].startswith("text/html")
+            assert "id='stack'" in resp.read().decode("utf-8")
+
+        async with connect(f"ws://127.0.0.1:{port}/ws") as ws:
+            snap = json.loads(await ws.recv())
+            assert snap["type"] == "snapshot"
+            assert [b["seq"] for b in snap["blocks"]] == [1, 2]
+
+            # Publishing from another thread (as the output stage does)
+            t = threading.Thread(target=lambda: (server.publish_block(2, "<b>2b</b>"), server.publish_live("Adam 12")))
+            t.start()
+            t.join()
+            assert json.loads(await ws.recv()) == {"type": "block", "seq": 2, "html": "<b>2b</b>"}
+            assert json.loads(await ws.recv()) == {"type": "live", "text": "Adam 12"}
+        server.stop()
+        await task
+
+    asyncio.run(scenario())
+
+
+def test_stop_before_serving_starts_returns_at_once():
+    server = OverlayServer("127.0.0.1", _free_port())
+
+    async def run():
+        task = asyncio.create_task(server.serve_forever())
+        server.stop()  # the task has not taken its first step yet
+        await asyncio.wait_for(task, 2)
+
+    asyncio.run(run())
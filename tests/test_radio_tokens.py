@@ -0,0 +1,61 @@
+import random
+import re
+
+from radio_tokens import RadioScanner, Trie
+
+UNITS = [
+    "Adam", "Boy", "Charles", "David", "Edward", "Frank", "George", "Henry",
+    "Ida", "John", "King", "Lincoln", "Mary", "Nora", "Ocean", "Paul", "Queen",
+    "Robert", "Sam", "Tom", "Union", "Victor", "William", "X-ray", "Yellow", "Zebra",
+    "Echo",
+]
+NUMBERS = ["one", "won", "two", "to", "too", "three", "four", "for", "ford", "forth",
+           "five", "six", "seven", "eight", "ate", "nine", "ten"]
+LETTERS = {u.lower(): u[0] for u in UNITS if u != "X-ray"} | {"xray": "X", "x": "X"}
+DIGITS = {"one": "1", "two": "2", "to": "2", "tree": "3", "four": "4", "oh": "0"}
+
+NUM_WORDS = r"(?:\d{1,4}|" + "|".join(NUMBERS) + ")"
+LEADING_CALLSIGN = re.compile(r"^\s*(?:" + "|".join(UNITS) + r")\s*(?:" + NUM_WORDS + r")\b", re.IGNORECASE)
+
+
+def scanner():
+    return RadioScanner(UNITS, NUMBERS, LETTERS, DIGITS, weak_units=["Echo"])
+
+
+def test_trie_reports_every_entry_ending():
+    t = Trie(["for", "ford", "forth"])
+    assert t.ends("fordham") == [3, 4]
+    assert t.ends("xfor", 1) == [4]
+    assert t.ends("fo") == []
+
+
+def test_starts_with_callsign_matches_leading_callsign_regex():
+    sc = scanner()
+    vocab = UNITS + NUMBERS + ["12", "3104", "12345", "10-4", "Adamant", "copy", "the", ",", "-"]
+    rng = random.Random(7)
+    for _ in range(5000):
+        words = [rng.choice(vocab) for _ in range(rng.randint(0, 4))]
+        line = "".join(w + rng.choice(["", " ", "  ", ", ", "."]) for w in words)
+        expected = LEADING_CALLSIGN.search(line) is not None
+        assert sc.starts_with_callsign(sc.scan(line)) == expected, line
+
+
+def test_mentions_unit():
+    sc = scanner()
+    yes = ["Boy 12 copy", "lincoln3104", "5CharlesQueen12", "show me (Zebra)", "Echo 5", "X-ray en route"]
+    no = ["1234567 890", "Adamant Tomorrow", "Echo", "echo5", "AdamBoy"]
+    for line in yes:
+        assert sc.mentions_unit(sc.scan(line)), line
+    for line in no:
+        assert not sc.mentions_unit(sc.scan(line)), line
+
+
+def test_token_tags():
+    sc = scanner()
+    boy, twelve, tree, x_ray, code = sc.scan("Boy, 12 tree X-ray ten-four")
+    assert (boy.norm, boy.letter, boy.start) == ("boy", "B", 0)
+    assert twelve.unit_number and twelve.number_lead and twelve.code
+    assert tree.digit == "3" and not tree.unit_number
+    assert x_ray.letter == "X"
+    assert code.code and not boy.code
+    assert sc.scan("Boy, 12 tree X-ray ten-four") is sc.scan("Boy, 12 tree X-ray ten-four")
@@ -0,0 +1,38 @@
+import numpy as np
+
+from replay import VirtualClock, replay_blocks
+
+SR = 16000
+
+
+def test_virtual_clock_follows_consumed_audio():
+    c = VirtualClock(SR, start=100.0)
+    assert c.now() == 100.0
+    c.advance(SR // 2)
+    c.advance(SR)
+    assert c.now() == 101.5
+
+
+def test_replay_feeds_every_sample_then_tail_silence():
+    audio = np.arange(2000, dtype=np.float32)
+    blocks = []
+    n = replay_blocks(audio, 800, blocks.append, SR, speed=None, tail_sec=0.1)
+    assert n == 2000 + SR // 10
+    assert [len(b) for b in blocks[:3]] == [800, 800, 800]
+    out = np.concatenate(blocks)
+    assert np.array_equal(out[:2000], audio)
+    assert not out[2000:].any()
+
+
+def test_max_speed_waits_for_consumer():
+    pending = []
+    consumed = []
+
+    def ready():
+        # the "consumer" drains one block each time it is polled
+        if pending:
+            consumed.append(pending.pop())
+        return not pending
+
+    replay_blocks(np.ones(4000, dtype=np.float32), 800, pending.append, SR, ready=ready)
+    assert len(consumed) == 4 and len(pending) == 1
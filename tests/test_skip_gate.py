@@ -0,0 +1,50 @@
+import random
+
+from skip_gate import SkipGate, gate_features
+
+
+def _pairs(n=600, seed=3, copy_edited=0.03):
+    rng = random.Random(seed)
+    units = ["Adam", "Boy", "Lincoln", "King"]
+    pairs = []
+    for _ in range(n):
+        unit, num = rng.choice(units), rng.randint(1, 40)
+        if rng.random() < 0.2:
+            # the kind of line the model fixes: numbers spoken as words
+            pairs.append((f"{unit} {num} show me ten ninety seven", rng.random() < 0.9))
+        else:
+            pairs.append((f"{unit} {num}, copy, en route code 3", rng.random() < copy_edited))
+    return pairs
+
+
+def test_gate_features_use_digit_shapes():
+    assert {"boy", "#2", "boy #2", "copy"} <= gate_features("Boy 12 copy")
+    assert gate_features("Boy 12 copy") == gate_features("boy 47  copy")
+
+
+def test_fit_meets_recall_target_and_skips_the_rest():
+    # copy lines are never edited here, so the target leaves all of them to skip
+    gate, report = SkipGate.fit(_pairs(copy_edited=0.0), recall=0.95)
+    assert report["recall"] >= 0.95
+    assert report["skip_rate"] > 0.5
+    assert gate.should_run("Lincoln 9 show me ten ninety seven")
+    assert not gate.should_run("King 4, copy, en route code 3")
+
+
+def test_saved_gate_keeps_its_recall_on_new_lines(tmp_path):
+    # 3% of copy lines get edited at random: nothing in their text predicts it
+    gate, report = SkipGate.fit(_pairs(), recall=0.95)
+    gate.save(tmp_path / "gate.json")
+    fresh = SkipGate.load(tmp_path / "gate.json").evaluate(_pairs(n=5000, seed=99))
+    assert report["recall"] >= 0.95 and fresh["recall"] >= 0.95
+
+
+def test_save_and_load_round_trip(tmp_path):
+    gate, _ = SkipGate.fit(_pairs(), recall=0.9)
+    path = tmp_path / "gate.json"
+    gate.save(path)
+    loaded = SkipGate.load(path)
+    assert loaded.threshold == gate.threshold
+    assert loaded.score("Adam 3 copy") == gate.score("Adam 3 copy")
+    assert SkipGate.load(tmp_path / "missing.json") is None
+    assert SkipGate().should_run("anything")
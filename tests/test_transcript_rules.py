@@ -0,0 +1,53 @@
+import random
+import re
+from pathlib import Path
+
+from transcript_rules import MISRECOGNITION_FIXES, RewriteEngine
+
+CORPUS = Path(__file__).parent / "data" / "caption_log_sample.txt"
+RAW_RE = re.compile(r"^\s*\[RAW\]\s*(.*?)\s*$", re.MULTILINE)
+
+
+def sequential(text):
+    """The original fix_misrecognitions loop."""
+    for pattern, replacement in MISRECOGNITION_FIXES:
+        text = re.sub(pattern, replacement, text, flags=re.IGNORECASE)
+    return text
+
+
+def test_engine_matches_sequential_on_logged_raw_lines():
+    engine = RewriteEngine(MISRECOGNITION_FIXES)
+    lines = RAW_RE.findall(CORPUS.read_text(encoding="utf-8"))
+    assert len(lines) >= 50
+    for line in lines:
+        assert engine.apply(line) == sequential(line), line
+
+
+def test_engine_matches_sequential_on_generated_lines():
+    engine = RewriteEngine(MISRECOGNITION_FIXES)
+    words = set()
+    for pattern, replacement in MISRECOGNITION_FIXES:
+        words.update(re.findall(r"[A-Za-z0-9']+", pattern.replace(r"\b", " ").replace(r"\s", " ")))
+        words.update(re.findall(r"[A-Za-z0-9']+", replacement))
+    words = sorted(words) + ["+1", "0.", "R.P.", "tonight.", "Charles", "ford"]
+    seps = [" ", " ", "  ", "-", ".", ", ", "", " + "]
+    rng = random.Random(0)
+    for _ in range(5000):
+        text = "".join(rng.choice(words) + rng.choice(seps) for _ in range(rng.randint(1, 7))).strip()
+        if rng.random() < 0.3:
+            text = text.upper()
+        assert engine.apply(text) == sequential(text), text
+
+
+def test_rules_that_feed_each_other_stay_ordered():
+    rules = [(r"\bfour\b", "4"), (r"\bgo 4\b", "10-4"), (r"\bfive\b", "5")]
+    engine = RewriteEngine(rules)
+    assert len(engine.passes) == 2
+    assert engine.apply("go four, five") == "10-4, 5"
+
+
+def test_independent_word_rules_share_one_pass():
+    rules = [(r"\bnorth\s*bound\b", "NB"), (r"\bsouth\s*bound\b", "SB"), (r"\b(?:will be|be)\s+97\b", "10-97")]
+    engine = RewriteEngine(rules)
+    assert len(engine.passes) == 1
+    assert engine.apply("Will be 97, southbound then North bound") == "10-97, SB then NB"
@@ -0,0 +1,47 @@
+import sqlite3
+
+from transcript_store import TranscriptStore
+
+
+def _fill(store):
+    store.add(100.0, "charles 3 ten four", "Charles 3 10-4", "[O] Charles 3 10-4 (understood)", speaker="O",
+              codes=["10-4"], callsigns=["Charles 3"], latencies={"process": 1.5})
+    store.add(200.0, "run plate", "run plate", "[D] run plate 10-28", speaker="D",
+              decoded_plate_dl="Plate: 7ABC123", codes=["10-28"], plates=["7ABC123"])
+    store.add(300.0, "shots fired", "shots fired 10-33", "[D] shots fired 10-33", speaker="D", alert=True,
+              codes=["10-33", "10-33"], callsigns=["Charles 3", "Boy 12"])
+
+
+def test_round_trip_and_filters(tmp_path):
+    store = TranscriptStore(tmp_path / "t.db")
+    _fill(store)
+    rows = store.query()
+    assert [u.ts for u in rows] == [100.0, 200.0, 300.0]
+    first = rows[0]
+    assert first.final == "[O] Charles 3 10-4 (understood)" and first.speaker == "O"
+    assert first.codes == ("10-4",) and first.latencies == {"process": 1.5} and not first.alert
+    assert rows[2].alert and rows[2].codes == ("10-33",) and set(rows[2].callsigns) == {"Charles 3", "Boy 12"}
+
+    assert [u.ts for u in store.query(since=150, until=300)] == [200.0]
+    assert [u.ts for u in store.query(callsign="charles 3")] == [100.0, 300.0]
+    assert [u.ts for u in store.query(callsign="charles 3", code="10-33")] == [300.0]
+    assert [u.plates for u in store.query(plate="7ABC123")] == [("7ABC123",)]
+    assert [u.ts for u in store.query(limit=1)] == [100.0]
+    store.close()
+
+
+def test_reopen_appends_and_readers_see_commits(tmp_path):
+    path = tmp_path / "t.db"
+    store = TranscriptStore(path)
+    _fill(store)
+    store.close()
+
+    store = TranscriptStore(path)
+    store.add(400.0, "copy", "copy", "[D] copy")
+    # a second connection (another process in practice) sees every committed row
+    reader = sqlite3.connect(path)
+    assert reader.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert reader.execute("SELECT count(*) FROM utterances").fetchone()[0] == 4
+    reader.close()
+    assert store.count() == 4
+    store.close()
@@ -0,0 +1,286 @@
+import re
+
+# Common misrecognitions to fix
+MISRECOGNITION_FIXES = [
+    (r'\bfour\b', '4'),
+    (r'\bfive\b', '5'),
+    (r'\bsix\b', '6'),
+    (r'\bseven\b', '7'),
+    (r'\beight\b', '8'),
+    (r'\bnine\b', '9'),
+    (r'\bwon\b', '1'),
+    (r'\btoo\b', '2'),
+    (r'\btree\b', '3'),
+    (r'\bcharking\b', 'Charles King'),
+    (r'\bfour fifteen\b', '415'),
+    (r'\bfour\s+fifty\s+nine\b', '459'),
+
+    # 10-4 variations (very common)
+    (r'\bgo for it\b', '10-4'),
+    (r'\bgo for for\b', '10-4'),
+    (r'\bgo 4\b', '10-4'),
+    (r'\bten-four\b', '10-4'),
+    (r'\bten four\b', '10-4'),
+    (r'\b104\b', '10-4'),
+    (r'\bcopy that\b', '10-4'),
+    
+    # Plus sign prefix fixes (+104 -> 10-4)
+    (r'\+1\s*0?\s*4\b', '10-4'),
+    (r'\+1\s*0?\s*7\b', '10-7'),
+    (r'\+1\s*0?\s*8\b', '10-8'),
+    (r'\+1\s*0?\s*9\b', '10-9'),
+    (r'\+1\s*0?\s*14\b', '10-14'),
+    (r'\+1\s*0?\s*22\b', '10-22'),
+    (r'\+1\s*0?\s*28\b', '10-28'),
+    (r'\+1\s*0?\s*29\b', '10-29'),
+    (r'\+1\s*0?\s*62\b', '10-62'),
+    (r'\+1\s*0?\s*97\b', '10-97'),
+    (r'\+1\s*0?\s*98\b', '10-98'),
+    
+    # Decimal fixes (0.4 -> 10-4, 0.14 -> 10-14)
+    (r'\b0\.1\b', '10-1'),
+    (r'\b0\.3\b', '10-3'),
+    (r'\b0\.4\b', '10-4'),
+    (r'\b0\.7\b', '10-7'),
+    (r'\b0\.14\b', '10-14'),
+    
+    # Joined numbers (108 -> 10-8, 1097 -> 10-97, etc.)
+    (r'\b108\b', '10-8'),
+    (r'\b1022\b', '10-22'),
+    (r'\b1028\b', '10-28'),
+    (r'\b1029\b', '10-29'),
+    (r'\b1031\b', '10-31'),
+    (r'\b1062\b', '10-62'),
+    (r'\b1086\b', '11-86'),
+    (r'\b1097\b', '10-97'),
+    (r'\b1098\b', '10-98'),
+    (r'\b11098\b', '11-98'),
+    (r'\b1186\b', '11-86'),
+    (r'\b1199\b', '11-99'),
+    
+    # Context-aware code detection ("put me at 97" = 10-97, "will be 49" = 10-49)
+    (r'\bput me (?:at|on)\s+97\b', '10-97'),
+    (r'\bput me (?:at|on)\s+98\b', '10-98'),
+    (r'\bshow me\s+97\b', '10-97'),
+    (r'\bshow me\s+98\b', '10-98'),
+    (r'\bshow me\s+8\b', '10-8'),
+    (r'\bshow me\s+7\b', '10-7'),
+    (r'\b(?:will be|be)\s+49\b', '10-49'),
+    (r'\b(?:will be|be)\s+97\b', '10-97'),
+    (r'\b(?:will be|be)\s+98\b', '10-98'),
+    (r"\b(?:I'?m\s+)?going\s+49\b", '10-49'),
+    (r'\b49\s+(?:to|from|south|north|east|west)\b', '10-49'),
+    
+    # Standalone codes after unit callsigns (e.g., "charles 7 49" -> 10-49)
+    (r'\b49\s+from\b', '10-49 from'),
+    
+    # "tonight" misheard as 10-8
+    (r'\btonight\b(?=\s*\.?\s*$)', '10-8'),
+    
+    # 11-86 traffic stop variations
+    (r'\b11\s*86\b', '11-86'),
+    (r'\b11-86\b', '11-86'),
+    
+    # 5150 (mental health hold) - very common
+    (r'\bfifty\s*one\s*fifty\b', '5150'),
+    (r'\b51\s*50\b', '5150'),
+    (r'\bfive\s*one\s*five\s*zero\b', '5150'),
+    
+    # 11-99 officer needs help
+    (r'\beleven\s*ninety\s*nine\b', '11-99'),
+    (r'\beleven\s*99\b', '11-99'),
+    
+    # Common spoken code patterns
+    (r'\bcode\s*three\b', 'Code 3'),
+    (r'\bcode\s*four\b', 'Code 4'),
+    (r'\bcode\s*five\b', 'Code 5'),
+    (r'\bcode\s*six\b', 'Code 6'),
+    (r'\bcode\s*seven\b', 'Code 7'),
+    
+    # PC codes spoken
+    (r'\bfour\s*fifty\s*nine\b', '459'),
+    (r'\btwo\s*eleven\b', '211'),
+    (r'\bone\s*eighty\s*seven\b', '187'),
+    (r'\bfour\s*fifteen\b', '415'),
+    
+    # Phonetic homophones (Deepgram mishears)
+    (r'\bvector\b', 'Victor'),
+    (r'\bkan\b', 'King'),
+    (r'\bcharking\b', 'Charles King'),
+    (r'\bshutty\b', 'Charlie'),
+    (r'\bcharlie\b', 'Charles'),
+    (r'\benvoy\b', 'Edward'),
+    
+    # "ford" after phonetics = 4 (e.g., "charles ford" = "Charles 4")
+    (r'\b(Adam|Boy|Charles|David|Edward|Frank|George|Henry|Ida|John|King|Lincoln|Mary|Nora|Ocean|Paul|Queen|Robert|Sam|Tom|Union|Victor|William|Zebra)\s+ford\b', r'\1 4'),
+    (r'\b(Adam|Boy|Charles|David|Edward|Frank|George|Henry|Ida|John|King|Lincoln|Mary|Nora|Ocean|Paul|Queen|Robert|Sam|Tom|Union|Victor|William|Zebra)\s+for\b(?=\s+\d)', r'\1'),
+    
+    # Common abbreviations/terms
+    (r'\bR\.?P\.?\b', 'RP'),  # Reporting Party
+    (r'\bR\.?O\.?\b', 'RO'),  # Registered Owner
+    (r'\bB\.?O\.?L\.?\b', 'BOL'),  # Be On Lookout
+    (r'\bB\.?O\.?L\.?O\.?\b', 'BOLO'),
+    (r'\bA\.?D\.?W\.?\b', 'ADW'),  # Assault Deadly Weapon
+    (r'\bD\.?U\.?I\.?\b', 'DUI'),
+    (r'\bG\.?O\.?A\.?\b', 'GOA'),  # Gone On Arrival
+    (r'\bA\.?T\.?L\.?\b', 'ATL'),  # Attempt To Locate
+    (r'\bU\.?T\.?L\.?\b', 'UTL'),  # Unable To Locate
+    (r'\bD\.?V\.?\b', 'DV'),  # Domestic Violence
+    (r'\bP\.?D\.?\b', 'PD'),  # Police Department
+    (r'\bA\.?P\.?S\.?\b', 'APS'),  # Adult Protective Services
+    
+    # Direction abbreviations
+    (r'\bnorth\s*bound\b', 'NB'),
+    (r'\bsouth\s*bound\b', 'SB'),
+    (r'\beast\s*bound\b', 'EB'),
+    (r'\bwest\s*bound\b', 'WB'),
+    
+    # Clean up trailing periods after numbers (e.g., "97." -> "10-97")
+    (r'\b(29|49|97|98)\.\s*$', r'10-\1'),
+]
+
+
+# --- Single-pass rewrite engine ------------------------------------------------------
+#
+# A "word rule" is \b...\b over a small finite language (letters, digits, ' - .,
+# \s+ / \s*, optional characters and (?:a|b) groups) whose every spelling starts and
+# ends with a word character, replaced by a plain string that does too. Runs of word
+# rules that cannot interact are matched by one alternation.
+
+_MAX_SPELLINGS = 256
+
+
+def _spellings(pattern: str) -> list[str] | None:
+    """Every string a word rule can match (lowercased, whitespace as one space), or None."""
+    if not (pattern.startswith(r"\b") and pattern.endswith(r"\b")):
+        return None
+    try:
+        out, pos = _parse_seq(pattern[2:-2], 0)
+    except ValueError:
+        return None
+    if pos != len(pattern) - 4 or out is None:
+        return None
+    spellings = sorted({re.sub(r"\s+", " ", s.lower()) for s in out})
+    if any(not s or not (s[0].isalnum() or s[0] == "_") or not (s[-1].isalnum() or s[-1] == "_") for s in spellings):
+        return None
+    return spellings
+
+
+def _parse_seq(p: str, i: int) -> tuple[list[str] | None, int]:
+    """Parse a sequence up to ')' / '|' / end; returns (spellings, next index)."""
+    out = [""]
+    while i < len(p) and p[i] not in ")|":
+        if p.startswith("(?:", i):
+            alts: list[str] = []
+            i += 3
+            while True:
+                sub, i = _parse_seq(p, i)
+                if sub is None:
+                    return None, i
+                alts += sub
+                if i >= len(p):
+                    raise ValueError("unbalanced group")
+                if p[i] == ")":
+                    i += 1
+                    break
+                i += 1  # '|'
+            item = alts
+        elif p.startswith(r"\s+", i):
+            item, i = [" "], i + 3
+        elif p.startswith(r"\s*", i):
+            item, i = ["", " "], i + 3
+        elif p[i] == "\\" and i + 1 < len(p) and p[i + 1] in ".-'":
+            item, i = [p[i + 1]], i + 2
+        elif p[i].isalnum() or p[i] in " '-":
+            item, i = [p[i]], i + 1
+        else:
+            return None, i
+        if i < len(p) and p[i] == "?":
+            item, i = item + [""], i + 1
+        out = [a + b for a in out for b in item]
+        if len(out) > _MAX_SPELLINGS:
+            return None, i
+    return out, i
+
+
+def _is_word(c: str) -> bool:
+    return c.isalnum() or c == "_"
+
+
+def _can_overlap(a: str, b: str) -> bool:
+    """True if a match of spelling `a` and one of `b` could share text.
+
+    Both spans start and end on word boundaries, so any shared text starts at a word
+    start and ends at a word end in both strings.
+    """
+    la, lb = len(a), len(b)
+
+    def word_start(s, i):
+        return i < len(s) and _is_word(s[i]) and (i == 0 or not _is_word(s[i - 1]))
+
+    def word_end(s, j):
+        return j > 0 and _is_word(s[j - 1]) and (j == len(s) or not _is_word(s[j]))
+
+    # d = offset of b's start relative to a's start
+    offsets = [d for d in range(la) if word_start(a, d)] + [-k for k in range(1, lb) if word_start(b, k)]
+    for d in offsets:
+        lo, hi = max(0, d), min(la, d + lb)
+        if lo >= hi:
+            continue
+        if a[lo:hi] == b[lo - d:hi - d] and word_end(a, hi) and word_end(b, hi - d):
+            return True
+    return False
+
+
+def _plain_replacement(r: str) -> bool:
+    return bool(r) and "\\" not in r and _is_word(r[0]) and _is_word(r[-1])
+
+
+class RewriteEngine:
+    """Applies an ordered (pattern, replacement) table with exactly the result of running
+    re.sub(pattern, replacement, text, flags) for each rule in turn, in fewer passes.
+
+    Consecutive word rules are merged into one precompiled alternation of named groups
+    with a dict lookup from the matched group name to its replacement. A rule starts a new
+    group when it could match text overlapping a match of a rule already in the group,
+    or text one of those rules produces (that is where order matters). Every other rule
+    keeps its own precompiled pass, in table order.
+    """
+
+    def __init__(self, rules: list[tuple[str, str]], flags: int = re.IGNORECASE):
+        self.passes: list[tuple[re.Pattern, object]] = []
+        group: list[tuple[str, str]] = []
+        taken: list[str] = []   # spellings matched or produced by rules in the group
+        first_chars: set[str] = set()
+
+        def close_group():
+            if group:
+                # \b(A\b)|\b(B\b) == \b(?:A|B)\b; the lookahead on the possible first characters
+                # lets the regex engine skip ahead instead of trying every branch at every position.
+                chars = "".join(re.escape(c) for c in sorted(first_chars))
+                branches = "|".join(f"(?P<r{n}>{p[2:-2]})" for n, (p, _) in enumerate(group))
+                lookup = {f"r{n}": r for n, (_, r) in enumerate(group)}
+                regex = re.compile(rf"(?=[{chars}])\b(?:{branches})\b", flags)
+                self.passes.append((regex, lambda m, lookup=lookup: lookup[m.lastgroup]))
+            group.clear()
+            taken.clear()
+            first_chars.clear()
+
+        for pattern, replacement in rules:
+            spellings = _spellings(pattern) if _plain_replacement(replacement) else None
+            if spellings is None:
+                close_group()
+                self.passes.append((re.compile(pattern, flags), replacement))
+                continue
+            if any(_can_overlap(s, t) for s in spellings for t in taken):
+                close_group()
+            group.append((pattern, replacement))
+            taken.extend(spellings)
+            first_chars.update(sp[0] for sp in spellings)
+            taken.append(re.sub(r"\s+", " ", replacement.lower()))
+        close_group()
+
+    def apply(self, text: str) -> str:
+        for regex, replacement in self.passes:
+            text = regex.sub(replacement, text)
+        return text
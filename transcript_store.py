@@ -0,0 +1,158 @@
+"""Append-only SQLite store of finished utterances.
+
+One row per utterance in `utterances`, plus one row per code / callsign / plate in side
+tables so "everything Charles 3 said last week" or "every 10-80 since March" is an index
+lookup instead of a scan of the text logs. The database runs in WAL mode: the writer
+appends while other processes (a rebuild, an ad-hoc sqlite3 shell) read a consistent
+snapshot.
+"""
+import json
+import sqlite3
+import threading
+from pathlib import Path
+from typing import NamedTuple
+
+SCHEMA_VERSION = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS utterances (
+    id INTEGER PRIMARY KEY,
+    ts REAL NOT NULL,                -- unix time the utterance was finalized
+    speaker TEXT,                    -- 'O' / 'D', NULL for untagged code blocks
+    alert INTEGER NOT NULL DEFAULT 0,
+    raw_text TEXT NOT NULL,
+    enhanced_text TEXT NOT NULL,
+    final_text TEXT NOT NULL,        -- as shown, speaker tag included
+    decoded_lookup TEXT,
+    decoded_plate_dl TEXT,
+    latency_json TEXT                -- {"stage": milliseconds, ...}
+);
+CREATE INDEX IF NOT EXISTS utterances_ts ON utterances (ts);
+
+CREATE TABLE IF NOT EXISTS utterance_codes (
+    utterance_id INTEGER NOT NULL REFERENCES utterances (id),
+    code TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS utterance_codes_code ON utterance_codes (code, utterance_id);
+
+CREATE TABLE IF NOT EXISTS utterance_callsigns (
+    utterance_id INTEGER NOT NULL REFERENCES utterances (id),
+    callsign TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS utterance_callsigns_callsign ON utterance_callsigns (callsign COLLATE NOCASE, utterance_id);
+
+CREATE TABLE IF NOT EXISTS utterance_plates (
+    utterance_id INTEGER NOT NULL REFERENCES utterances (id),
+    plate TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS utterance_plates_plate ON utterance_plates (plate, utterance_id);
+"""
+
+# (table, column) of each side table, in Utterance field order
+_TAGS = (("utterance_codes", "code"), ("utterance_callsigns", "callsign"), ("utterance_plates", "plate"))
+
+
+class Utterance(NamedTuple):
+    id: int
+    ts: float
+    speaker: str | None
+    alert: bool
+    raw: str
+    enhanced: str
+    final: str
+    decoded_lookup: str | None
+    decoded_plate_dl: str | None
+    latencies: dict[str, float]
+    codes: tuple[str, ...]
+    callsigns: tuple[str, ...]
+    plates: tuple[str, ...]
+
+
+class TranscriptStore:
+    """Thread-safe: one connection, used under a lock (writes come from the output stage)."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        # WAL + NORMAL: a commit is not fsynced, but the file can't be corrupted by a crash
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version > SCHEMA_VERSION:
+            raise RuntimeError(f"{self.path} has schema v{version}; this code knows v{SCHEMA_VERSION}")
+        with self._conn:
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def add(self, ts: float, raw: str, enhanced: str, final: str, speaker: str | None = None,
+            alert: bool = False, decoded_lookup: str | None = None, decoded_plate_dl: str | None = None,
+            latencies: dict[str, float] | None = None, codes=(), callsigns=(), plates=()) -> int:
+        """Store one utterance (a single transaction); returns its id."""
+        with self._lock, self._conn:
+            cur = self._conn.execute(
+                "INSERT INTO utterances (ts, speaker, alert, raw_text, enhanced_text, final_text,"
+                " decoded_lookup, decoded_plate_dl, latency_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (ts, speaker, int(alert), raw, enhanced, final, decoded_lookup, decoded_plate_dl,
+                 json.dumps(latencies) if latencies else None),
+            )
+            uid = cur.lastrowid
+            for (table, column), values in zip(_TAGS, (codes, callsigns, plates)):
+                self._conn.executemany(
+                    f"INSERT INTO {table} (utterance_id, {column}) VALUES (?, ?)",
+                    [(uid, v) for v in dict.fromkeys(values)],
+                )
+        return uid
+
+    def query(self, since: float | None = None, until: float | None = None, callsign: str | None = None,
+              code: str | None = None, plate: str | None = None, limit: int | None = None) -> list[Utterance]:
+        """Utterances in [since, until) matching every filter given, oldest first.
+
+        callsign matches case-insensitively ("charles 3"); code and plate match exactly
+        as stored (normalized "10-80", decoded "ABC123").
+        """
+        where, args = [], []
+        if since is not None:
+            where.append("u.ts >= ?")
+            args.append(since)
+        if until is not None:
+            where.append("u.ts < ?")
+            args.append(until)
+        for (table, column), value in zip(_TAGS, (code, callsign, plate)):
+            if value is not None:
+                collate = " COLLATE NOCASE" if column == "callsign" else ""
+                where.append(f"u.id IN (SELECT utterance_id FROM {table} WHERE {column}{collate} = ?)")
+                args.append(value)
+        tag_cols = ", ".join(
+            f"(SELECT group_concat({column}, char(31)) FROM {table} WHERE utterance_id = u.id)"
+            for table, column in _TAGS
+        )
+        sql = (
+            "SELECT u.id, u.ts, u.speaker, u.alert, u.raw_text, u.enhanced_text, u.final_text,"
+            f" u.decoded_lookup, u.decoded_plate_dl, u.latency_json, {tag_cols} FROM utterances u"
+        )
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY u.ts, u.id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        with self._lock:
+            rows = self._conn.execute(sql, args).fetchall()
+        return [
+            Utterance(
+                uid, ts, speaker, bool(alert), raw, enhanced, final, lookup, plate_dl,
+                json.loads(lat) if lat else {},
+                *(tuple(t.split("\x1f")) if t else () for t in tags),
+            )
+            for uid, ts, speaker, alert, raw, enhanced, final, lookup, plate_dl, lat, *tags in rows
+        ]
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM utterances").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()